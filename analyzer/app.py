@@ -1,65 +1,211 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Request, request, jsonify, render_template, Response, stream_with_context, url_for, g
 import pandas as pd
 import os
 import traceback
 import json
-from sklearn.preprocessing import MinMaxScaler
+import time
+import uuid
 import numpy as np
 from utils.analysis_runner import analyze_csv_pair, analyze_internal_columns
 from utils.gpt_analysis import analyze_with_gpt
 from utils.batch_analyzer import analyze_all_columns
-from utils.timeseries_detect import analyze_timeseries  # ✅ 시계열 분석 모듈 추가
+from utils.timeseries_detect import timeseries_window, load_rollups  # ✅ 시계열 분석 모듈 추가
+from utils.timeseries_rollup import ROLLUP_LEVELS, ROLLUP_STATS, rollup_key, get_rollups, store_rollups, rollup_stats, parse_time_bounds
+from utils.timeseries_parallel import analyze_timeseries_files, align_rollups, display_names
+from utils.downsample import DOWNSAMPLE_METHODS
+from utils.visual_data import enrich_response_with_visual_data
+from utils.scatter_sampling import scatter_points, SAMPLING_METHODS
+from utils.key_alignment import align_series_on_key
+from utils.dataframe_cache import configure_cache, file_content_hash, cache_stats
+from utils.columnar_store import configure_store, ingest_dataframe, open_columnar
+from utils.file_reader import read_uploaded_file, UploadReader
+from utils.job_manager import configure_jobs, submit_job, get_job
+from utils.result_store import (configure_results, new_job_id, ResultWriter, query_results, latest_job_id,
+                                analysis_key, remember_job, find_job, load_meta, mark_latest, job_result_file)
+from utils.upload_store import IncomingUpload, configure_uploads, save_upload, resolve_upload, recent_uploads
+from utils.metrics import configure_metrics, register_collector, render_prometheus, observe, increment
+from utils.sampling_profiler import SamplingProfiler, configure_profiler, store_profile, get_profile
+from utils.response_encoding import NumpyJSONProvider, COLUMNAR_MIMETYPE, wants_columnar, encode_columnar
+import heapq
 
 app = Flask(__name__, template_folder='templates')
-app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 최대 업로드 크기 제한 (10MB)
+app.json = NumpyJSONProvider(app)  # jsonify 가 NumPy 배열을 그대로 직렬화 (차트 데이터는 tolist 없이 전달)
+app.config['MAX_CONTENT_LENGTH'] = 4 * 1024 * 1024 * 1024  # 최대 업로드 크기 제한 (4GB, 대용량은 스트리밍 분석)
+app.config['STREAMING_THRESHOLD_BYTES'] = 200 * 1024 * 1024  # CSV 합계가 이 크기를 넘으면 스트리밍 분석
+app.config['IN_MEMORY_MAX_BYTES'] = 1024 * 1024 * 1024  # 파일 전체를 메모리에 올리는 경로(xlsx / 시계열 / /analyze)의 업로드 합계 상한
+app.config['PREVIEW_ROWS'] = 100_000  # 스트리밍 모드에서 시각화용으로 읽는 최대 행 수
+app.config['ANALYSIS_BACKEND'] = 'thread'  # 범주형 쌍 실행 백엔드: thread | process | serial (process 는 요청마다 작업자 풀 생성)
+app.config['LINE_MAX_POINTS'] = 2000  # 선형 차트 점 예산 (초과 시 LTTB 다운샘플링)
+app.config['TIMESERIES_WORKERS'] = None  # 다중 파일 시계열 프로세스 수 (None = min(파일 수, CPU, 4))
+app.config['TIMESERIES_TIMEOUT'] = 300  # 파일 1개 시계열 분석 제한 시간(초)
+app.config['SCATTER_MAX_POINTS'] = 2000  # 산점도 쌍별 점 예산 (초과 시 표본 추출)
+app.config['SCATTER_MAX_PAIRS'] = 200  # 산점도 일괄 요청 1회당 최대 쌍 수
+app.config['SCREENING'] = False  # 상관 분석 표본 선별 기본값 (요청의 screening=1|0 으로 변경, 대용량에서만 적용)
+app.config['CROSS_JOIN'] = 'position'  # 파일 간 비교 행 정렬 기본값: position | key (요청의 cross_join 으로 변경)
+app.config['MEASURES'] = ''  # 수치형 쌍 추가 측도 기본값: spearman,mutual_info 중 선택 (요청의 measures 로 변경)
 
 UPLOAD_FOLDER = 'analyzer/uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# ✅ 업로드된 파일을 Pandas DataFrame으로 읽기 (CSV / XLSX 지원)
-def read_uploaded_file(path):
-    ext = os.path.splitext(path)[1].lower()
-    try:
-        if ext == ".csv":
-            return pd.read_csv(path, encoding='utf-8')
+# ✅ 내용 주소 업로드 저장소 (수신과 동시에 기록 + 해시, 같은 내용은 한 번만 저장, 파일명 → 해시 목록)
+app.config['UPLOAD_CHUNK_BYTES'] = 1024 * 1024
+configure_uploads(UPLOAD_FOLDER, chunk_size=app.config['UPLOAD_CHUNK_BYTES'])
 
-        elif ext == ".xlsx":
-            header_row = auto_detect_excel_header(path)
-            print(f"📌 [엑셀] 헤더 자동 감지 결과: {header_row}행")
 
-            # 1차 스캔: 날짜 컬럼 추정
-            preview = pd.read_excel(path, engine="openpyxl", header=header_row, nrows=1)
-            date_cols = [col for col in preview.columns if any(kw in str(col).lower() for kw in ["date", "time", "날짜", "일시", "측정일"])]
+# 업로드 파일 파트는 werkzeug 기본 스풀(메모리 / 임시 파일) 대신 저장소 임시 파일에 바로 기록
+# → save_upload 는 이동만 하므로 본문이 디스크에 한 번만 쓰임 (크기 제한은 MAX_CONTENT_LENGTH)
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return IncomingUpload()
+
+
+app.request_class = UploadRequest
 
-            # 실제 읽기 (날짜 컬럼 지정)
-            return pd.read_excel(path, engine="openpyxl", header=header_row, parse_dates=date_cols)
+# ✅ 파싱된 DataFrame 캐시 (메모리 LRU + 디스크 계층)
+app.config['DATAFRAME_CACHE_BYTES'] = 512 * 1024 * 1024
+app.config['DATAFRAME_CACHE_DIR'] = os.path.join(UPLOAD_FOLDER, '.cache')
+configure_cache(max_bytes=app.config['DATAFRAME_CACHE_BYTES'], disk_dir=app.config['DATAFRAME_CACHE_DIR'])
+
+# ✅ 업로드 파일의 컬럼형(memmap) 저장소
+app.config['COLUMNAR_STORE_DIR'] = os.path.join(UPLOAD_FOLDER, '.columnar')
+configure_store(app.config['COLUMNAR_STORE_DIR'])
+
+# ✅ 비동기 분석 작업 (동시 실행 작업 수, 메모리에 남겨 둘 완료 작업 수)
+app.config['JOB_WORKERS'] = 2
+app.config['JOB_RETENTION'] = 50
+configure_jobs(max_workers=app.config['JOB_WORKERS'], max_finished=app.config['JOB_RETENTION'])
+
+# ✅ 작업별 결과 저장소 (결과 JSONL + |score| 정렬 색인 + 상위 K)
+app.config['RESULT_STORE_DIR'] = os.path.join(UPLOAD_FOLDER, 'results')
+app.config['RESULT_TOP_K'] = 50
+configure_results(app.config['RESULT_STORE_DIR'], top_k=app.config['RESULT_TOP_K'],
+                  max_stores=app.config['JOB_RETENTION'])
+
+# ✅ 계측 (/metrics 라우트별 지연 시간 히스토그램 + 요청 단위 샘플링 프로파일러)
+app.config['DEBUG_LOGGING'] = False  # True 이면 행 단위 진단 출력 (날짜 컬럼 타입 분포 등, 핫 경로 비용 있음)
+app.config['PROFILING_ENABLED'] = False  # True 이면 ?profile=1 또는 X-Profile: 1 요청에 샘플링 프로파일러 적용
+app.config['PROFILE_INTERVAL'] = 0.005  # 스택 채집 간격(초)
+configure_metrics(debug_logging=app.config['DEBUG_LOGGING'])
+configure_profiler(interval=app.config['PROFILE_INTERVAL'])
+
+
+# /metrics 렌더링 시점에 캐시 통계를 읽어 오는 수집기
+def cache_metrics():
+    parse, rollup = cache_stats(), rollup_stats()
+    return [
+        ("analyzer_dataframe_cache_events_total", "counter", "파싱 캐시 조회 결과별 횟수",
+         [({"result": name}, parse[name]) for name in ("hits", "disk_hits", "misses", "evictions")]),
+        ("analyzer_dataframe_cache_bytes", "gauge", "파싱 캐시 메모리 계층 사용량(바이트)", [({}, parse["bytes"])]),
+        ("analyzer_rollup_cache_events_total", "counter", "시계열 롤업 캐시 조회 결과별 횟수",
+         [({"result": name}, rollup[name]) for name in ("hits", "misses")]),
+    ]
+
+
+register_collector(cache_metrics)
+
+# ✅ 업로드 직후 1회 변환 (CSV/XLSX 파싱 → 컬럼별 배열 + 메타데이터)
+def ingest_upload(path):
+    if open_columnar(path) is not None:
+        return
+    df = read_uploaded_file(path)
+    if not df.empty:
+        ingest_dataframe(path, df)
+
+
+# ✅ 표본 선별 사용 여부 (폼 screening=1|true|0|false, 없으면 설정 기본값)
+def use_screening():
+    value = request.form.get("screening")
+    if value is None:
+        return app.config['SCREENING']
+    return value.lower() in ("1", "true")
 
-        else:
-            raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
 
+# ✅ 파일 간 비교 행 정렬 방식 (폼 cross_join=position|key, 없으면 설정 기본값)
+def cross_join_mode():
+    return request.form.get("cross_join") or app.config['CROSS_JOIN']
+
+
+# ✅ 수치형 쌍 추가 측도 (폼 measures=spearman,mutual_info, 없으면 설정 기본값)
+def requested_measures():
+    value = request.form.get("measures")
+    return value if value is not None else app.config['MEASURES']
+
+
+# ✅ 차트 데이터 응답: Accept 가 컬럼형 바이너리를 원하면 타입 배열 버퍼, 아니면 NumPy 인식 JSON
+def chart_response(payload):
+    if wants_columnar(request.accept_mimetypes):
+        response = Response(encode_columnar(payload, app.json.dumps), content_type=COLUMNAR_MIMETYPE)
+    else:
+        response = jsonify(payload)
+    response.vary.add("Accept")
+    return response
+
+
+# ✅ 대용량 CSV 여부 판단 (모두 CSV 이고 합계 크기가 임계값 초과 → 스트리밍 분석)
+def use_streaming(paths):
+    if not all(os.path.splitext(p)[1].lower() == ".csv" for p in paths):
+        return False
+    return sum(os.path.getsize(p) for p in paths) > app.config['STREAMING_THRESHOLD_BYTES']
+
+
+# ✅ 스트리밍이 아닌 경로의 크기 검사 (합계가 상한 초과 → 413 응답, 아니면 None)
+# MAX_CONTENT_LENGTH 는 스트리밍 분석 기준이라 DataFrame 으로 전부 읽는 경로에는 이 상한을 따로 적용
+def in_memory_limit_error(paths):
+    total = sum(os.path.getsize(p) for p in paths)
+    limit = app.config['IN_MEMORY_MAX_BYTES']
+    if total <= limit:
+        return None
+    print(f"⚠️ 메모리 분석 상한 초과: {total} bytes > {limit} bytes")
+    return jsonify({"error": f"파일 크기 합계({total // (1024 * 1024)}MB)가 메모리 분석 상한"
+                             f"({limit // (1024 * 1024)}MB)을 넘습니다. "
+                             f"대용량 CSV 는 /analyze-all 또는 /jobs 의 스트리밍 분석을 이용하세요."}), 413
+
+
+# ✅ 시각화용 앞부분 미리보기 (스트리밍 모드에서 전체 파일을 올리지 않기 위함)
+def read_preview(path):
+    try:
+        return pd.read_csv(path, encoding='utf-8', nrows=app.config['PREVIEW_ROWS'])
     except Exception as e:
-        print(f"❌ 파일 읽기 실패: {path} → {e}")
+        print(f"❌ 미리보기 읽기 실패: {path} → {e}")
         return pd.DataFrame()
 
 
-# ✅ 자동 헤더 탐지 함수 (엑셀용)
-def auto_detect_excel_header(path, max_rows=15):
-    """
-    엑셀 파일에서 '날짜', '시간', '측정일시' 등의 키워드가 포함된 행을 헤더로 자동 추정
-    """
-    try:
-        preview = pd.read_excel(path, engine="openpyxl", header=None, nrows=max_rows)
+# ✅ 요청 계측: 라우트별 지연 시간 + 응답 바이트 (스트리밍 응답은 첫 응답 객체 반환까지의 시간)
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    if app.config['PROFILING_ENABLED'] and "1" in (request.args.get("profile"), request.headers.get("X-Profile")):
+        g.profiler = SamplingProfiler(interval=app.config['PROFILE_INTERVAL']).start()
 
-        for i in range(max_rows):
-            row = preview.iloc[i]
-            text_row = row.astype(str).str.lower().fillna("")
-            if text_row.str.contains("date|날짜|시간|일시|측정일").any():
-                return i
 
-    except Exception as e:
-        print(f"⚠️ 헤더 자동 탐지 실패: {e}")
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"  # 404 경로로 라벨이 늘어나지 않도록
+    started = g.pop("request_started", None)
+    if started is not None:
+        observe("analyzer_request_seconds", time.perf_counter() - started,
+                route=route, method=request.method, status=response.status_code)
+    if not response.is_streamed and response.content_length is not None:
+        increment("analyzer_response_bytes_total", response.content_length, route=route)
+
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+        profile_id = uuid.uuid4().hex[:12]
+        store_profile(profile_id, profiler)
+        response.headers["X-Profile-Id"] = profile_id
+        response.headers["X-Profile-Url"] = url_for("profile_result", profile_id=profile_id)
+        print(f"🔬 [profile] {route} {profiler.samples}샘플 / {profiler.elapsed:.3f}s → {profile_id}")
+    return response
+
+
+@app.teardown_request
+def stop_request_profiler(exc):
+    # after_request 를 거치지 않고 끝난 요청 (처리되지 않은 예외) 의 채집 스레드 정리
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
 
-    return 0  # 실패하면 첫 번째 행을 기본 헤더로 사용
 
 # ✅ 메인 페이지 라우팅
 @app.route('/')
@@ -76,15 +222,22 @@ def analyze():
         if not file1 or not file2:
             return jsonify({"error": "file1과 file2 파일이 모두 필요합니다."}), 400
 
-        path1 = os.path.join(UPLOAD_FOLDER, file1.filename)
-        path2 = os.path.join(UPLOAD_FOLDER, file2.filename)
-        file1.save(path1)
-        file2.save(path2)
+        path1 = save_upload(file1).path
+        path2 = save_upload(file2).path
+        oversized = in_memory_limit_error([path1, path2])
+        if oversized is not None:
+            return oversized
+        ingest_upload(path1)
+        ingest_upload(path2)
 
         df1 = read_uploaded_file(path1)
         df2 = read_uploaded_file(path2)
 
-        results = analyze_csv_pair(df1, df2) + analyze_internal_columns(df1) + analyze_internal_columns(df2)
+        screening = use_screening()
+        measures = requested_measures()
+        results = (analyze_csv_pair(df1, df2, screening=screening, cross_join=cross_join_mode(), measures=measures) +
+                   analyze_internal_columns(df1, screening=screening, measures=measures) +
+                   analyze_internal_columns(df2, screening=screening, measures=measures))
         results.sort(key=lambda x: abs(x["score"]), reverse=True)
 
         response = {
@@ -93,7 +246,7 @@ def analyze():
         }
 
         print("✅ [analyze] 상관관계 결과 수:", len(results))
-        enrich_response_with_visual_data(df1, response)
+        enrich_response_with_visual_data(df1, response, max_points=app.config['LINE_MAX_POINTS'])
 
         if request.form.get("use_gpt", "false").lower() == "true":
             gpt_key = request.form.get("gpt_api_key", "")
@@ -114,13 +267,9 @@ def analyze():
 @app.route('/analyze-all', methods=['POST'])
 def analyze_all():
     try:
-        files = request.files.getlist("files")
-        paths = []
-
-        for f in files:
-            path = os.path.join(UPLOAD_FOLDER, f.filename)
-            f.save(path)
-            paths.append(path)
+        # ✅ 내용 해시 경로에 저장 (같은 이름의 동시 업로드도 서로 덮어쓰지 않음)
+        uploads = [save_upload(f) for f in request.files.getlist("files")]
+        paths = [u.path for u in uploads]
 
         if not paths:
             return jsonify({"error": "업로드된 파일이 없습니다."}), 400
@@ -128,113 +277,296 @@ def analyze_all():
         # ✅ 분석 유형 분기 처리
         analysis_type = request.form.get("analysis_type", "correlation")
 
+        # ✅ 시계열 / 스트리밍 대상이 아닌 상관관계 분석은 파일 전체를 메모리에 올림 → 크기 상한 검사
+        if analysis_type == "timeseries" or not use_streaming(paths):
+            oversized = in_memory_limit_error(paths)
+            if oversized is not None:
+                return oversized
+
+        # ✅ 업로드 시 컬럼형 저장소로 1회 변환 (대용량 CSV 스트리밍 대상은 제외)
+        if not use_streaming(paths):
+            for path in paths:
+                ingest_upload(path)
+
         # ✅ [시계열 분석] 다중 파일 대응
         if analysis_type == "timeseries":
-            results = {}
+            # 파일별로 독립 → 파일마다 별도 프로세스에서 병렬 실행 (동시 실행 수 제한, 파일 단위 실패 / 시간 초과 격리)
+            file_results = analyze_timeseries_files(
+                paths, UploadReader(),
+                max_points=app.config['LINE_MAX_POINTS'],
+                max_workers=app.config['TIMESERIES_WORKERS'],
+                timeout=app.config['TIMESERIES_TIMEOUT'],
+                sources={path: file_content_hash(path) for path in paths},
+                rollup_keys={path: rollup_key(path) for path in paths}
+            )
+            align = request.form.get("align", "")
+
+            # ✅ stream=1: 파일이 끝나는 순서대로 NDJSON 한 줄씩
+            if request.form.get("stream") in ("1", "true"):
+                def events():
+                    for filename, ts_result in file_results:
+                        yield app.json.dumps({"event": "result", "file": filename, "data": ts_result},
+                                             ensure_ascii=False, sort_keys=False) + '\n'
+                    if align in ROLLUP_LEVELS:
+                        yield app.json.dumps({"event": "aligned", "data": aligned_timeseries(paths, align)},
+                                             ensure_ascii=False, sort_keys=False) + '\n'
+                    yield json.dumps({"event": "done"}) + '\n'
+                return Response(stream_with_context(events()), mimetype='application/x-ndjson')
+
+            finished = dict(file_results)
+            results = {name: finished[name] for name in display_names(paths).values()}
+
+            # ✅ align=hour|day|week|month: 모든 파일의 기본 컬럼을 공통 시간축에 정렬
+            if align in ROLLUP_LEVELS:
+                results["_aligned"] = aligned_timeseries(paths, align)
+
+            return chart_response(results)
+
+        # ✅ [상관관계 분석] 대용량 CSV 는 스트리밍 모드 (청크 단위 충분통계량 누적)
+        # 결과는 작업별 저장소에 기록하면서 상위 K 만 힙으로 유지 (전체 정렬 없음)
+        streaming = use_streaming(paths)
+        screening, cross_join, measures = use_screening(), cross_join_mode(), requested_measures()
+
+        # 같은 파일(내용 해시 + 이름)·같은 옵션으로 이미 분석한 결과가 남아 있으면 다시 계산하지 않음
+        key = analysis_key("correlation", [[u.digest, u.filename] for u in uploads], 0.3,
+                           streaming, screening, cross_join, measures)
+        job_id = find_job(key)
+        if job_id is not None:
+            meta = load_meta(job_id)
+            mark_latest(job_id)
+            increment("analyzer_results_reused_total", route="/analyze-all")
+            print(f"♻️ [analyze-all] 같은 입력의 이전 결과 재사용: {job_id}")
+            response = {
+                "job_id": job_id,
+                "results": meta["top"],
+                "matches": meta["matches"],
+                "result_file": job_result_file(job_id),
+                "reused": True
+            }
+        else:
+            with ResultWriter() as writer:
+                for r in analyze_all_columns(paths, threshold=0.3, backend=app.config['ANALYSIS_BACKEND'],
+                                             streaming=streaming, screening=screening,
+                                             cross_join=cross_join, measures=measures):
+                    writer.add(r)
+            remember_job(key, writer.job_id)
+
+            response = {
+                "job_id": writer.job_id,
+                "results": writer.top(),
+                "matches": writer.count,
+                "result_file": writer.result_file,
+                "reused": False
+            }
 
-            for path in paths:
-                filename = os.path.basename(path)
-                df = read_uploaded_file(path)
-                ts_result = analyze_timeseries(df)
+        df_first = read_preview(paths[0]) if streaming else read_uploaded_file(paths[0])
 
-                if not ts_result or "error" in ts_result:
-                    results[filename] = {"error": ts_result.get("error", "분석 실패")}
-                    continue
+        enrich_response_with_visual_data(df_first, response, max_points=app.config['LINE_MAX_POINTS'])
+        print("✅ [analyze-all] 시각화용 필드 포함 여부:",
+              [k for k in response.keys() if k.endswith('_data') or k == 'results'])
 
-                results[filename] = ts_result
+        return chart_response(response)
 
-            return jsonify(results)
+    except Exception as e:
+        print("❌ [analyze-all] 예외 발생:")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
-        # ✅ [상관관계 분석] 기존 방식 유지
-        results = []
-        result_path = os.path.join(UPLOAD_FOLDER, 'result.jsonl')
-        with open(result_path, 'w', encoding='utf-8') as f_out:
-            for r in analyze_all_columns(paths, threshold=0.3):
-                f_out.write(json.dumps(r, ensure_ascii=False) + '\n')
-                results.append(r)
+# ✅ 파일 간 정렬 시계열 (캐시된 롤업의 기본 컬럼을 공통 시간축에 배치)
+def aligned_timeseries(paths, level):
+    named = []
+    for path, name in display_names(paths).items():
+        rollups = get_rollups(rollup_key(path))
+        if rollups is not None and rollups.columns:
+            named.append((name, default_rollup_column(rollups), rollups))
+    return align_rollups(named, level=level)
 
-        results.sort(key=lambda x: abs(x.get("score", 0)), reverse=True)
-        df_first = read_uploaded_file(paths[0])
 
-        response = {
-            "results": results[:50],
-            "matches": len(results),
-            "result_file": result_path
-        }
+# analyze_timeseries 의 기본 y 컬럼과 같은 기준 (null 이 가장 적은 = 관측 수가 가장 많은 컬럼)
+def default_rollup_column(rollups):
+    counts = rollups.levels["hour"].count.sum(axis=0)
+    return rollups.columns[int(np.argmax(counts))]
 
-        enrich_response_with_visual_data(df_first, response)
-        print("✅ [analyze-all] 시각화용 필드 포함 여부:",
-              [k for k in response.keys() if k.endswith('_data') or k == 'results'])
 
-        return jsonify(response)
+# ✅ 비동기 상관관계 분석 작업 등록 → 즉시 202 + 작업 ID 반환
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    try:
+        uploads = [save_upload(f) for f in request.files.getlist("files")]
+        paths = [u.path for u in uploads]
+
+        if not paths:
+            return jsonify({"error": "업로드된 파일이 없습니다."}), 400
+
+        streaming = use_streaming(paths)
+        if not streaming:
+            oversized = in_memory_limit_error(paths)
+            if oversized is not None:
+                return oversized
+            for path in paths:
+                ingest_upload(path)
+
+        threshold = float(request.form.get("threshold", 0.3))
+        backend = app.config['ANALYSIS_BACKEND']
+        screening = use_screening()
+        cross_join = cross_join_mode()
+        measures = requested_measures()
+        key = analysis_key("correlation", [[u.digest, u.filename] for u in uploads], threshold,
+                           streaming, screening, cross_join, measures)
+
+        job_id = new_job_id()
+
+        def generate(on_progress):
+            with ResultWriter(job_id) as writer:
+                for r in analyze_all_columns(paths, threshold=threshold, backend=backend, streaming=streaming,
+                                             on_progress=on_progress, screening=screening,
+                                             cross_join=cross_join, measures=measures):
+                    writer.add(r)
+                    yield r
+            remember_job(key, job_id)  # 끝까지 완료된 결과만 /analyze-all 재사용 대상
+
+        job = submit_job(generate, job_id=job_id)
+        print(f"🧾 [jobs] 작업 등록: {job.id} ({len(paths)}개 파일)")
+        return jsonify({
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": url_for('job_status', job_id=job.id),
+            "stream_url": url_for('job_stream', job_id=job.id)
+        }), 202
 
     except Exception as e:
-        print("❌ [analyze-all] 예외 발생:")
+        print("❌ [jobs] 예외 발생:")
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
-# ✅ 3. 시각화용 필드 자동 생성 (line, box, bubble, radar, pie 등)
-def enrich_response_with_visual_data(df, result: dict):
+
+# ✅ 작업 진행률 조회 (완료 / 전체 쌍 수 + 현재까지 상위 결과)
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+
+    response = job.snapshot()
+    results = job.results[:response["matches"]]
+    response["results"] = heapq.nlargest(app.config['RESULT_TOP_K'], results, key=lambda x: abs(x.get("score", 0)))
+    return jsonify(response)
+
+
+# ✅ 결과 스트리밍 (NDJSON: 결과가 나오는 즉시 한 줄씩, ?from=N 이면 N번째 결과부터 이어 받기)
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+
+    offset = request.args.get("from", default=0, type=int)
+
+    def events():
+        position = offset
+        progress = None
+        while True:
+            finished = job.finished
+            results, current = job.wait_for(position, progress)
+            for r in results:
+                yield json.dumps({"event": "result", "index": position, "data": r}, ensure_ascii=False) + '\n'
+                position += 1
+            if current != progress:
+                progress = current
+                yield json.dumps({"event": "progress", "completed": current[0], "total": current[1],
+                                  "status": current[2]}) + '\n'
+            # 완료 확인은 대기 전에 읽은 값 기준 → 마지막 결과까지 모두 보낸 뒤 종료
+            if finished:
+                snapshot = job.snapshot()
+                yield json.dumps({"event": "done", "status": snapshot["status"], "matches": snapshot["matches"],
+                                  "error": snapshot["error"]}, ensure_ascii=False) + '\n'
+                return
+
+    return Response(stream_with_context(events()), mimetype='application/x-ndjson')
+
+
+# ✅ 시계열 확대 구간 조회 (보이는 구간만 원본 해상도, 점 예산 초과 시에만 다운샘플링)
+@app.route('/timeseries-range', methods=['GET'])
+def timeseries_range():
     try:
-        if df.empty:
-            print("⚠️ [enrich] 비어 있는 DataFrame, 시각화 생략")
-            return
-
-        print("🔍 [enrich] 시각화 컬럼:", df.columns.tolist())
-        num_cols = df.select_dtypes(include='number').columns[:3]
-
-        # ✅ 선형 차트용 (시계열)
-        if 'Date' in df.columns and len(num_cols) > 0:
-            x_vals = df['Date'].astype(str).tolist()
-            y_vals = df[num_cols[0]].dropna().tolist()
-            if len(x_vals) == len(y_vals):
-                result["line_data"] = {
-                    "x": x_vals,
-                    "y": y_vals,
-                    "xLabel": "Date",
-                    "yLabel": num_cols[0]
-                }
-
-        # ✅ 박스플롯용
-        if len(num_cols) >= 1:
-            result["box_data"] = {
-                "labels": list(num_cols),
-                "dataList": [df[col].dropna().tolist() for col in num_cols]
-            }
+        path = resolve_upload(request.args.get("file", ""))
+        if path is None:
+            return jsonify({"error": "파일을 찾을 수 없습니다."}), 404
+
+        method = request.args.get("method", "lttb")
+        if method not in DOWNSAMPLE_METHODS:
+            return jsonify({"error": f"지원하지 않는 다운샘플링 방식: {method}"}), 400
+
+        max_points = request.args.get("max_points", default=app.config['LINE_MAX_POINTS'], type=int)
+        result = timeseries_window(
+            read_uploaded_file(path),
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+            time_column=request.args.get("time_column", ""),
+            y_column=request.args.get("column", ""),
+            max_points=max(3, min(max_points, app.config['LINE_MAX_POINTS'] * 5)),
+            method=method,
+            source=file_content_hash(path)
+        )
+        if "error" in result:
+            return jsonify(result), 400
+        return chart_response(result)
 
-        # ✅ 버블 / 레이더
-        if len(num_cols) >= 3:
-            raw_data = df[num_cols].dropna().to_numpy()
-            scaler = MinMaxScaler()
-            scaled = scaler.fit_transform(raw_data)
-            result["bubble_data"] = {
-                "x": scaled[:, 0].tolist(),
-                "y": scaled[:, 1].tolist(),
-                "size": (scaled[:, 2] * 100).tolist(),
-                "xLabel": num_cols[0],
-                "yLabel": num_cols[1]
-            }
+    except Exception as e:
+        print("❌ [timeseries-range] 예외 발생:")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
-            radar_sample = scaled[:3]
-            indicators = [{"name": col, "max": 1} for col in num_cols]
-            result["radar_data"] = {
-                "indicators": indicators,
-                "valuesList": radar_sample.tolist(),
-                "names": [f"Sample {i+1}" for i in range(len(radar_sample))]
-            }
 
-        # ✅ 도넛차트용 (범주형)
-        cat_cols = df.select_dtypes(include='object').columns
-        if len(cat_cols) > 0:
-            top_cat = cat_cols[0]
-            freq = df[top_cat].value_counts()
-            result["pie_data"] = {
-                "labels": freq.index.tolist(),
-                "values": freq.values.tolist()
-            }
+# ✅ 시계열 롤업 조회 (컬럼 / 해상도 / 통계 전환 → 파일별 롤업 캐시 조회, 미스일 때만 재계산)
+@app.route('/timeseries-rollup', methods=['GET'])
+def timeseries_rollup():
+    try:
+        path = resolve_upload(request.args.get("file", ""))
+        if path is None:
+            return jsonify({"error": "파일을 찾을 수 없습니다."}), 404
+
+        granularity = request.args.get("granularity", "day")
+        stat = request.args.get("stat", "mean")
+        if granularity not in ROLLUP_LEVELS or stat not in ROLLUP_STATS:
+            return jsonify({"error": f"지원하지 않는 조회: {granularity}/{stat}"}), 400
+        bounds = parse_time_bounds(request.args.get("start"), request.args.get("end"))
+        if isinstance(bounds, dict):
+            return jsonify(bounds), 400
+
+        time_column = request.args.get("time_column", "")
+        key = rollup_key(path, time_column)
+        rollups = get_rollups(key)
+        cached = rollups is not None
+        if not cached:
+            rollups = load_rollups(read_uploaded_file(path), time_column, source=key[0])
+            if isinstance(rollups, dict):
+                return jsonify(rollups), 400
+            store_rollups(key, rollups)
+
+        column = request.args.get("column") or rollups.columns[0]
+        column = next((c for c in rollups.columns if str(c) == column), None)
+        if column is None:
+            return jsonify({"error": "롤업에 없는 컬럼입니다.", "columns": [str(c) for c in rollups.columns]}), 404
+
+        result = rollups.series(column, granularity, stat, start=bounds[0], end=bounds[1])
+        result["cached"] = cached
+        return chart_response(result)
 
     except Exception as e:
-        print("❌ [enrich] 시각화 데이터 생성 실패:", e)
+        print("❌ [timeseries-rollup] 예외 발생:")
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ 키 정렬 결과(key = [파일1 키 컬럼, 파일2 키 컬럼])의 산점도 → 분석과 같은 키 행끼리 짝지은 두 컬럼
+def keyed_series(df1, series1, df2, series2, key):
+    if not isinstance(key, (list, tuple)) or len(key) != 2:
+        raise ValueError("key 는 [파일1 키 컬럼, 파일2 키 컬럼] 형식이어야 합니다.")
+    key1, key2 = key
+    if key1 not in df1 or key2 not in df2:
+        raise ValueError(f"키 컬럼을 찾을 수 없습니다: {key1}, {key2}")
+    return align_series_on_key(series1, df1[key1], series2, df2[key2])
 
 
 # ✅ 4. 산점도 분석용 API (col1 vs col2)
@@ -246,20 +578,16 @@ def scatter_data():
         if not col1 or not col2:
             return jsonify({"error": "col1, col2 파라미터가 필요합니다."}), 400
 
-        files = sorted(
-            [f for f in os.listdir(UPLOAD_FOLDER) if f.endswith(('.csv', '.xlsx'))],
-            key=lambda f: os.path.getmtime(os.path.join(UPLOAD_FOLDER, f)),
-            reverse=True
-        )
+        files = recent_uploads(2)
 
         if len(files) < 2:
             return jsonify({"error": "CSV 또는 XLSX 파일이 부족합니다."}), 400
 
-        df1 = read_uploaded_file(os.path.join(UPLOAD_FOLDER, files[0]))
-        df2 = read_uploaded_file(os.path.join(UPLOAD_FOLDER, files[1]))
+        df1 = read_uploaded_file(files[0])
+        df2 = read_uploaded_file(files[1])
 
-        series1 = df1[col1] if col1 in df1 else df2.get(col1)
-        series2 = df2[col2] if col2 in df2 else df1.get(col2)
+        frame1, series1 = (df1, df1[col1]) if col1 in df1 else (df2, df2.get(col1))
+        frame2, series2 = (df2, df2[col2]) if col2 in df2 else (df1, df1.get(col2))
 
         if series1 is None or series2 is None:
             return jsonify({"x": [], "y": []})
@@ -267,11 +595,21 @@ def scatter_data():
         if not pd.api.types.is_numeric_dtype(series1) or not pd.api.types.is_numeric_dtype(series2):
             return jsonify({"x": [], "y": []})
 
-        series1 = series1.dropna().tolist()
-        series2 = series2.dropna().tolist()
+        # key1 / key2: 키 정렬 결과 → 같은 키 행끼리 짝지어 결측 쌍만 제외
+        if request.args.get("key1") and request.args.get("key2"):
+            try:
+                series1, series2 = keyed_series(frame1, series1, frame2, series2,
+                                                [request.args["key1"], request.args["key2"]])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            present = (series1.notna() & series2.notna()).to_numpy()
+            return chart_response({"x": series1.to_numpy()[present], "y": series2.to_numpy()[present]})
+
+        series1 = series1.dropna().to_numpy()
+        series2 = series2.dropna().to_numpy()
         length = min(len(series1), len(series2))
 
-        return jsonify({
+        return chart_response({
             "x": series1[:length],
             "y": series2[:length]
         })
@@ -282,24 +620,117 @@ def scatter_data():
         return jsonify({"error": "서버 오류", "detail": str(e)}), 500
 
 
+# ✅ 산점도 일괄 조회: 여러 (파일, col1, col2) 쌍을 한 번에 → 파일은 요청당 1회만 읽고 쌍별 표본은 캐시
+@app.route('/scatter-data/batch', methods=['POST'])
+def scatter_data_batch():
+    """
+    요청: {"pairs": [{"file" | "file1", "file2", "col1", "col2", "key"}, ...], "max_points": 2000, "sampling": "random"}
+    파일 정보가 없는 쌍은 기존 /scatter-data 와 같이 가장 최근 업로드 2개 파일에서 컬럼을 찾음
+    key ([키 컬럼1, 키 컬럼2], cross_join=key 결과) 가 있으면 행 위치 대신 같은 키 행끼리 짝지음
+    응답: {"pairs": [{"x", "y", "total", "sampled"} | {"error"}, ...]} (요청 순서 유지)
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        pairs = body.get("pairs") or []
+        if not isinstance(pairs, list) or not pairs:
+            return jsonify({"error": "pairs 목록이 필요합니다."}), 400
+        if len(pairs) > app.config['SCATTER_MAX_PAIRS']:
+            return jsonify({"error": f"한 번에 최대 {app.config['SCATTER_MAX_PAIRS']}쌍까지 요청할 수 있습니다."}), 400
+
+        sampling = body.get("sampling", "random")
+        if sampling not in SAMPLING_METHODS:
+            return jsonify({"error": f"지원하지 않는 표본 방식: {sampling}"}), 400
+        max_points = max(1, min(int(body.get("max_points", app.config['SCATTER_MAX_POINTS'])),
+                                app.config['SCATTER_MAX_POINTS'] * 5))
+
+        frames = {}
+
+        def frame(path):
+            if path not in frames:
+                frames[path] = read_uploaded_file(path) if os.path.exists(path) else None
+            return frames[path]
+
+        recent = None
+
+        def resolve(pair):
+            nonlocal recent
+            col1, col2 = pair.get("col1"), pair.get("col2")
+            file1 = pair.get("file") or pair.get("file1")
+            file2 = pair.get("file") or pair.get("file2")
+            if file1 and file2:
+                # 분석 결과의 저장소 경로는 그 내용 그대로, 파일명만 있으면 가장 최근 업로드
+                path1, path2 = resolve_upload(file1), resolve_upload(file2)
+                if path1 is None or path2 is None:
+                    return None
+                df1, df2 = frame(path1), frame(path2)
+                if df1 is None or df2 is None or col1 not in df1 or col2 not in df2:
+                    return None
+                return path1, path2, df1[col1], df2[col2]
+
+            # 파일 정보 없음 → 가장 최근 업로드 2개 (목록은 요청당 1회만 조회)
+            if recent is None:
+                recent = recent_uploads(2)
+            if len(recent) < 2:
+                return None
+            df1, df2 = frame(recent[0]), frame(recent[1])
+            path1, series1 = (recent[0], df1[col1]) if col1 in df1 else (recent[1], df2.get(col1))
+            path2, series2 = (recent[1], df2[col2]) if col2 in df2 else (recent[0], df1.get(col2))
+            if series1 is None or series2 is None:
+                return None
+            return path1, path2, series1, series2
+
+        results = []
+        for pair in pairs:
+            try:
+                resolved = resolve(pair) if isinstance(pair, dict) else None
+                if resolved is None:
+                    results.append({"x": [], "y": [], "total": 0, "sampled": False})
+                    continue
+                path1, path2, series1, series2 = resolved
+                cache_key = (file_content_hash(path1), file_content_hash(path2), str(series1.name), str(series2.name))
+                key = pair.get("key")
+                if key:
+                    series1, series2 = keyed_series(frame(path1), series1, frame(path2), series2, key)
+                    cache_key += tuple(map(str, key))
+                results.append(scatter_points(series1, series2, max_points=max_points, method=sampling,
+                                              cache_key=cache_key))
+            except Exception as e:
+                results.append({"error": str(e)})
+
+        return chart_response({"pairs": results})
+
+    except Exception as e:
+        print("❌ [scatter-data/batch] 예외 발생:")
+        traceback.print_exc()
+        return jsonify({"error": "서버 오류", "detail": str(e)}), 500
+
+
 # ✅ 5. 저장된 분석 결과 불러오기 (result.jsonl → 시각화용)
 @app.route('/get-results', methods=['GET'])
 def get_results():
+    """
+    ?job_id=   (생략 시 가장 최근 작업)
+    &offset=&limit=   페이지 (기본 0, 50)
+    &method=&file=&column=&min_score=   필터 (색인의 정수 코드로 비교)
+    """
     try:
-        result_path = os.path.join(UPLOAD_FOLDER, 'result.jsonl')
-        if not os.path.exists(result_path):
+        job_id = request.args.get("job_id") or latest_job_id()
+        limit = min(request.args.get("limit", default=50, type=int), 1000)
+        response = query_results(
+            job_id,
+            offset=max(request.args.get("offset", default=0, type=int), 0),
+            limit=max(limit, 0),
+            method=request.args.get("method"),
+            file=request.args.get("file"),
+            column=request.args.get("column"),
+            min_score=request.args.get("min_score", type=float)
+        ) if job_id else None
+
+        if response is None:
             return jsonify({"error": "결과 파일이 존재하지 않습니다."}), 404
 
-        with open(result_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        results = [json.loads(line.strip()) for line in lines if line.strip()]
-        results.sort(key=lambda x: abs(x.get("score", 0)), reverse=True)
-
-        return jsonify({
-            "results": results[:50],
-            "matches": len(results)
-        })
+        response["job_id"] = job_id
+        return jsonify(response)
 
     except Exception as e:
         print("❌ [get-results] 예외 발생:")
@@ -307,6 +738,30 @@ def get_results():
         return jsonify({"error": "서버 오류", "detail": str(e)}), 500
 
 
+# ✅ Prometheus 수집용 지표 (요청 지연 히스토그램 / 단계별 소요 시간 / 쌍 수 / 캐시 통계)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ✅ 요청 단위 프로파일 조회 (?format=collapsed → flamegraph 용 접힌 스택 텍스트)
+@app.route('/profiles/<profile_id>', methods=['GET'])
+def profile_result(profile_id):
+    profiler = get_profile(profile_id)
+    if profiler is None:
+        return jsonify({"error": "프로파일이 존재하지 않습니다."}), 404
+
+    if request.args.get("format") == "collapsed":
+        return Response(profiler.collapsed(), content_type="text/plain; charset=utf-8")
+    return jsonify({
+        "profile_id": profile_id,
+        "samples": profiler.samples,
+        "elapsed": round(profiler.elapsed, 4),
+        "interval": profiler.interval,
+        "top": profiler.top(request.args.get("limit", default=20, type=int))
+    })
+
+
 # ✅ 서버 실행
 if __name__ == '__main__':
     app.run(port=5000, debug=True, use_reloader=False)
@@ -0,0 +1,171 @@
+"""
+분석 파이프라인 벤치마크 (analyzer 디렉터리에서 실행)
+
+    python -m benchmarks.run_benchmarks                       # 기본 크기로 실행 + 기준값과 비교
+    python -m benchmarks.run_benchmarks --sizes 1000 50000    # 행 수 지정
+    python -m benchmarks.run_benchmarks --save-baseline       # 현재 결과를 기준값으로 저장
+
+단계별 최소 소요 시간(repeat 회 중)과 tracemalloc 최대 메모리를 기록하고,
+기준값 대비 tolerance 비율 이상 느려진 단계가 있으면 종료 코드 1 로 끝난다.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from utils.analysis_runner import analyze_csv_pair, analyze_internal_columns
+from utils.batch_analyzer import analyze_all_columns, read_dataframe_safely
+from utils.timeseries_detect import analyze_timeseries
+from utils.dataframe_cache import CACHE_CONFIG, clear_cache
+from utils.visual_data import enrich_response_with_visual_data
+from .synthetic_data import DATASET_DEFAULTS, generate_dataset, write_dataset
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+NOISE_FLOOR_SECONDS = 0.05  # 이보다 작은 차이는 회귀로 보지 않음 (타이머 / 스케줄링 잡음)
+
+
+# ✅ 단계 1개 측정: repeat 회 실행 중 최소 시간 + 별도 1회 실행의 최대 메모리 (tracemalloc 부하가 시간에 섞이지 않도록 분리)
+def measure(fn, setup=None, repeat=3):
+    setup = setup or (lambda: ())
+    seconds = []
+    for _ in range(repeat):
+        clear_cache()  # 파싱 캐시 적중으로 두 번째 실행부터 빨라지는 것 방지
+        args = setup()
+        started = time.perf_counter()
+        fn(*args)
+        seconds.append(time.perf_counter() - started)
+
+    clear_cache()
+    args = setup()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(seconds), 4), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+# ✅ 데이터셋 1쌍(같은 크기·형식, 시드만 다름)에 대한 단계별 측정
+def run_cases(path1, path2, backend, repeat):
+    df1 = read_dataframe_safely(path1)
+    df2 = read_dataframe_safely(path2)
+    cases = {
+        "read": (lambda: read_dataframe_safely(path1), None),
+        "analyze_csv_pair": (lambda a, b: analyze_csv_pair(a, b), lambda: (df1.copy(), df2.copy())),
+        "analyze_internal_columns": (lambda a: analyze_internal_columns(a), lambda: (df1.copy(),)),
+        "analyze_all_columns": (lambda: list(analyze_all_columns([path1, path2], backend=backend)), None),
+        "analyze_timeseries": (lambda a: analyze_timeseries(a), lambda: (df1.copy(),)),
+        "enrich_response_with_visual_data": (lambda a: enrich_response_with_visual_data(a, {}),
+                                             lambda: (df1.copy(),)),
+    }
+    return {name: measure(fn, setup, repeat) for name, (fn, setup) in cases.items()}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        limit = previous["seconds"] * (1 + tolerance)
+        if current["seconds"] > limit and current["seconds"] - previous["seconds"] > NOISE_FLOOR_SECONDS:
+            regressions.append((key, previous["seconds"], current["seconds"]))
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"{'단계':<62}{'시간(s)':>10}{'기준(s)':>10}{'변화':>9}{'메모리(MB)':>12}")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous:
+            ratio = current["seconds"] / previous["seconds"] if previous["seconds"] else float("inf")
+            base_text, change = f"{previous['seconds']:.4f}", f"{(ratio - 1) * 100:+.0f}%"
+        else:
+            base_text, change = "-", "-"
+        print(f"{key:<62}{current['seconds']:>10.4f}{base_text:>10}{change:>9}{current['peak_mb']:>12.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="분석 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="데이터셋 행 수 목록")
+    parser.add_argument("--formats", nargs="+", default=["csv", "xlsx"], choices=["csv", "xlsx"])
+    parser.add_argument("--xlsx-max-rows", type=int, default=20_000, help="이 행 수를 넘는 크기는 xlsx 생략 (생성 자체가 느림)")
+    parser.add_argument("--numeric", type=int, default=DATASET_DEFAULTS["numeric"])
+    parser.add_argument("--categorical", type=int, default=DATASET_DEFAULTS["categorical"])
+    parser.add_argument("--cardinality", type=int, default=DATASET_DEFAULTS["cardinality"])
+    parser.add_argument("--null-rate", type=float, default=DATASET_DEFAULTS["null_rate"])
+    parser.add_argument("--backend", default="thread", choices=["thread", "process", "serial"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 감속 비율 (0.25 = 25%%)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--data-dir", help="생성 데이터 보관 디렉터리 (미지정 시 임시 디렉터리)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    CACHE_CONFIG["disk_dir"] = None  # 디스크 캐시 적중 시 파싱 시간이 측정되지 않으므로 메모리 계층만 사용
+    dataset = {"numeric": args.numeric, "categorical": args.categorical,
+               "cardinality": args.cardinality, "null_rate": args.null_rate}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        for rows in args.sizes:
+            for fmt in args.formats:
+                if fmt == "xlsx" and rows > args.xlsx_max_rows:
+                    continue
+                print(f"📦 [벤치마크] {rows}행 {fmt} 생성 중...")
+                paths = [write_dataset(generate_dataset(rows, seed=seed, **dataset), data_dir, f"bench_{rows}_{seed}", fmt)
+                         for seed in (0, 1)]
+                for name, value in run_cases(*paths, backend=args.backend, repeat=args.repeat).items():
+                    results[f"{fmt}/{rows}/{name}"] = value
+
+    print_table(results, baseline)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "backend": args.backend
+        },
+        "dataset": dataset,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for key, before, after in regressions:
+        print(f"❌ 성능 저하: {key} {before:.4f}s → {after:.4f}s")
+    if not baseline:
+        print("⚠️ 기준값 없음 → --save-baseline 으로 먼저 저장하세요")
+    elif not regressions:
+        print("✅ 기준값 대비 성능 저하 없음")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+
+# ✅ 합성 데이터셋 기본값 (행 수만 바꿔 가며 크기별 성능 비교)
+DATASET_DEFAULTS = {
+    "numeric": 6,         # 수치형 컬럼 수
+    "categorical": 3,     # 범주형 컬럼 수
+    "cardinality": 12,    # 범주형 컬럼별 범주 수
+    "null_rate": 0.05,    # 날짜 컬럼을 제외한 결측 비율
+    "time_column": "Date",
+    "freq": "h"
+}
+
+
+def generate_dataset(rows, numeric=6, categorical=3, cardinality=12, null_rate=0.05, seed=0,
+                     time_column="Date", freq="h"):
+    """
+    분석 파이프라인용 합성 DataFrame
+    - 수치형: 공통 잠재 변수 + 잡음 (컬럼마다 상관 강도가 달라 Pearson 결과가 임계값 양쪽에 분포)
+    - 범주형: 잠재 변수 구간 + 무작위 범주 혼합 (ANOVA / Cramér's V 대상)
+    - time_column 이 주어지면 freq 간격의 날짜 컬럼을 맨 앞에 추가 (시계열 / 선형 차트 경로)
+    """
+    rng = np.random.default_rng(seed)
+    latent = rng.standard_normal(rows)
+    columns = {}
+
+    if time_column:
+        columns[time_column] = pd.date_range("2024-01-01", periods=rows, freq=freq)
+
+    for i in range(numeric):
+        weight = np.linspace(0.95, 0.0, max(numeric, 2))[i]
+        values = weight * latent + np.sqrt(1 - weight ** 2) * rng.standard_normal(rows)
+        columns[f"num_{i}"] = np.round(values * 10 + 50, 3)
+
+    labels = np.array([f"cat{j}" for j in range(max(cardinality, 1))], dtype=object)
+    edges = np.quantile(latent, np.linspace(0, 1, len(labels) + 1)[1:-1])
+    for i in range(categorical):
+        codes = np.searchsorted(edges, latent)
+        shuffled = rng.random(rows) < (i + 1) / (categorical + 1)
+        codes[shuffled] = rng.integers(0, len(labels), shuffled.sum())
+        columns[f"cat_{i}"] = labels[codes]
+
+    df = pd.DataFrame(columns)
+    if null_rate > 0:
+        for col in df.columns:
+            if col == time_column:
+                continue
+            missing = rng.random(rows) < null_rate
+            df.loc[missing, col] = np.nan
+    return df
+
+
+# ✅ 파일 저장 (csv / xlsx), 저장 경로 반환
+def write_dataset(df, directory, name, fmt="csv"):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.{fmt}")
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8")
+    elif fmt == "xlsx":
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식: {fmt}")
+    return path
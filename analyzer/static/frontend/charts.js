@@ -120,7 +120,7 @@ export function drawHeatmapChart(domId, results) {
 }
 
 // ✅ 4. 꺾은선 차트 (Line)
-export function drawLineChart(domId, xVals, yVals, xLabel, yLabel, theme = 'accessibility') {
+export function drawLineChart(domId, xVals, yVals, xLabel, yLabel, theme = 'accessibility', onZoom = null) {
   // ✅ 유효성 검사
   if (!xVals?.length || !yVals?.length || xVals.length !== yVals.length) return;
 
@@ -165,12 +165,26 @@ export function drawLineChart(domId, xVals, yVals, xLabel, yLabel, theme = 'acce
       name: yLabel
     }],
     color: [color],
-    backgroundColor: 'transparent'
+    backgroundColor: 'transparent',
+    // ✅ 확대 콜백이 있으면 dataZoom 활성화 (보이는 구간을 서버에서 원본 해상도로 다시 받음)
+    ...(onZoom ? { dataZoom: [{ type: 'inside' }, { type: 'slider' }] } : {})
   });
+
+  if (onZoom) {
+    chart.on('datazoom', () => {
+      const zoom = chart.getOption().dataZoom?.[0];
+      if (!zoom) return;
+      const startIdx = Math.max(0, zoom.startValue ?? 0);
+      const endIdx = Math.min(xVals.length - 1, zoom.endValue ?? xVals.length - 1);
+      onZoom(xVals[startIdx], xVals[endIdx]);
+    });
+  }
+  return chart;
 }
 
 // ✅ 5. 박스플롯
-export function drawBoxPlot(domId, dataList, labels, theme = 'accessibility') {
+// dataList: 컬럼별 [하단 수염, Q1, 중앙값, Q3, 상단 수염] (서버 요약), outliers: [컬럼 번호, 값] 표본
+export function drawBoxPlot(domId, dataList, labels, theme = 'accessibility', outliers = []) {
   if (!dataList?.length || !labels?.length) return;
   const chart = getChart(domId);
   if (!chart) return;
@@ -183,12 +197,16 @@ export function drawBoxPlot(domId, dataList, labels, theme = 'accessibility') {
     xAxis: { type: 'category', data: labels },
     yAxis: { type: 'value', name: '값', axisLabel: { formatter: (v) => v.toLocaleString() } },
     series: [{
-
       type: 'boxplot',
       data: dataList,
       itemStyle: {
         color: (params) => colors[params.dataIndex % colors.length]
       }
+    }, {
+      type: 'scatter',
+      name: '이상치',
+      data: outliers,
+      symbolSize: 5
     }]
   });
 }
@@ -8,8 +8,31 @@ export function setupLineChartFilter(json) {
 
   if (!select || !json.line_data) return;
 
+  // ✅ 컬럼 선택 (서버 롤업 캐시에 모든 유효 수치형 컬럼이 있을 때만 표시)
+  const columnSelect = document.getElementById('lineColumnSelect');
+  const columnWrapper = document.getElementById('lineColumnWrapper');
+  const canUseRollup = Boolean(json.file) && Array.isArray(json.columns) && json.columns.length > 0;
+  if (columnSelect && columnWrapper) {
+    columnSelect.innerHTML = '';
+    (canUseRollup ? json.columns : []).forEach(col => {
+      const option = document.createElement('option');
+      option.value = col;
+      option.textContent = col;
+      option.selected = col === String(json.line_data.yLabel);
+      columnSelect.appendChild(option);
+    });
+    columnWrapper.style.display = canUseRollup && json.columns.length > 1 ? 'block' : 'none';
+  }
+
   const draw = () => {
     const mode = select.value;
+    const column = columnSelect?.value || String(json.line_data.yLabel);
+
+    // ✅ 기본 컬럼이 아니거나 주별 보기 → 응답에 없는 조합이므로 서버 롤업 조회
+    if (canUseRollup && (column !== String(json.line_data.yLabel) || mode === 'weekly')) {
+      drawFromRollup(json, mode, column, hourlyDateSelect, hourlyDateWrapper);
+      return;
+    }
 
     // ✅ 시간대별 날짜 기반 분석
     if (mode === 'hourly' && json.line_hourly_by_date && hourlyDateSelect && hourlyDateWrapper) {
@@ -38,16 +61,30 @@ export function setupLineChartFilter(json) {
       hourlyDateSelect.removeEventListener('change', renderHourly);
       hourlyDateSelect.addEventListener('change', renderHourly);
       renderHourly();
+    } else if (mode === 'raw') {
+      if (hourlyDateWrapper) hourlyDateWrapper.style.display = 'none';
+      drawRawLine(json, json.line_data);
     } else {
       // 📌 다른 모드일 경우 날짜 선택 박스 숨기기
       if (hourlyDateWrapper) hourlyDateWrapper.style.display = 'none';
 
+      // ✅ 서버에서 집계한 일별/월별 평균 사용 (line_data 는 다운샘플링된 점이라 재집계하지 않음)
+      const aggregated = mode === 'monthly' ? json.line_monthly : json.line_daily;
+      if (aggregated?.x?.length) {
+        drawLineChart('chartLine', aggregated.x, aggregated.y, aggregated.xLabel, json.line_data.yLabel, resolveTheme('line'));
+        return;
+      }
+
       const grouped = {};
       json.line_data.x.forEach((xVal, i) => {
         const date = new Date(xVal);
         let key = '';
         if (mode === 'daily') {
           key = date.toISOString().split('T')[0];
+        } else if (mode === 'weekly') {
+          // 주 시작(월요일) 기준
+          const monday = new Date(date.getTime() - ((date.getDay() + 6) % 7) * 86400000);
+          key = monday.toISOString().split('T')[0];
         } else if (mode === 'monthly') {
           key = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
         }
@@ -61,12 +98,95 @@ export function setupLineChartFilter(json) {
         return arr.reduce((a, b) => a + b, 0) / arr.length;
       });
 
-      const xLabel = mode === 'monthly' ? '월' : '날짜';
+      const xLabel = ROLLUP_LABEL[mode] || '날짜';
       drawLineChart('chartLine', labels, values, xLabel, json.line_data.yLabel, resolveTheme('line'));
     }
   };
 
   select.removeEventListener('change', draw);
   select.addEventListener('change', draw);
+  if (columnSelect) columnSelect.onchange = draw;
   draw();
 }
+
+const ROLLUP_GRANULARITY = { daily: 'day', weekly: 'week', monthly: 'month', hourly: 'hour' };
+const ROLLUP_LABEL = { daily: '날짜', weekly: '주', monthly: '월', hourly: '시간대' };
+
+// ✅ 롤업 조회 (같은 조합은 결과 객체에 보관해 재요청하지 않음)
+async function fetchRollup(json, params) {
+  json._rollupCache = json._rollupCache || {};
+  const query = new URLSearchParams({ file: json.file, ...params }).toString();
+  if (!json._rollupCache[query]) {
+    const res = await fetch(`/timeseries-rollup?${query}`);
+    json._rollupCache[query] = await res.json();
+  }
+  return json._rollupCache[query];
+}
+
+async function drawFromRollup(json, mode, column, hourlyDateSelect, hourlyDateWrapper) {
+  try {
+    if (mode === 'raw') {
+      if (hourlyDateWrapper) hourlyDateWrapper.style.display = 'none';
+      const params = new URLSearchParams({ file: json.file, column });
+      const res = await fetch(`/timeseries-range?${params}`);
+      const line = await res.json();
+      if (!line.error) drawRawLine(json, line);
+      return;
+    }
+
+    if (mode === 'hourly' && hourlyDateSelect && hourlyDateWrapper && json.line_hourly_by_date) {
+      hourlyDateWrapper.style.display = 'block';
+      if (!hourlyDateSelect.options.length) {
+        Object.keys(json.line_hourly_by_date).sort().forEach(date => {
+          const option = document.createElement('option');
+          option.value = date;
+          option.textContent = date;
+          hourlyDateSelect.appendChild(option);
+        });
+      }
+
+      const renderHourly = async () => {
+        const date = hourlyDateSelect.value;
+        const data = await fetchRollup(json, { column, granularity: 'hour', start: date, end: `${date}T23` });
+        if (data.error) return;
+        const y = Array(24).fill(null);
+        data.x.forEach((label, i) => { y[Number(label.slice(11, 13))] = data.y[i]; });
+        const x = Array.from({ length: 24 }, (_, i) => `${i}시`);
+        drawLineChart('chartLine', x, y, '시간대', column, resolveTheme('line'));
+      };
+      hourlyDateSelect.onchange = renderHourly;
+      await renderHourly();
+      return;
+    }
+
+    if (hourlyDateWrapper) hourlyDateWrapper.style.display = 'none';
+    const data = await fetchRollup(json, { column, granularity: ROLLUP_GRANULARITY[mode] || 'day' });
+    if (data.error) return;
+    drawLineChart('chartLine', data.x, data.y, ROLLUP_LABEL[mode] || '날짜', column, resolveTheme('line'));
+  } catch (err) {
+    console.error('❌ 롤업 조회 실패:', err);
+  }
+}
+
+// ✅ 원본 보기: 다운샘플링된 전체 구간 → 확대하면 보이는 구간만 서버에서 원본 해상도로 다시 조회
+function drawRawLine(json, line) {
+  const canZoom = Boolean(json.file) && line.downsampled;
+  let timer = null;
+
+  const onZoom = canZoom ? (start, end) => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const params = new URLSearchParams({ file: json.file, start, end, column: line.yLabel });
+      try {
+        const res = await fetch(`/timeseries-range?${params}`);
+        const windowed = await res.json();
+        if (windowed.error || !windowed.x?.length) return;
+        drawRawLine(json, windowed);
+      } catch (err) {
+        console.error('❌ 구간 조회 실패:', err);
+      }
+    }, 300);
+  } : null;
+
+  drawLineChart('chartLine', line.x, line.y, line.xLabel, line.yLabel, resolveTheme('line'), onZoom);
+}
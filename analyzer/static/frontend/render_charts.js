@@ -14,6 +14,7 @@ import { setupLineChartFilter } from './line_chart_filter.js';
 let selectedPalette = 'auto';
 let lastAnalysisResult = null;
 let originalBubbleData = null;
+let scatterCache = new Map(); // 결과 번호 → 산점도 좌표 (/scatter-data/batch 응답)
 
 // ✅ 외부에서 테마 설정 가능하게 export
 export function setThemePalette(palette) {
@@ -76,23 +77,32 @@ export async function renderAllCharts(json, resultBox, gptBox, cards, scatterSel
     scatterSelect.onchange = null;   // 이벤트 중복 제거
     const validScatterPairs = [];
 
-    await Promise.all(
-      json.results.map(async (r, i) => {
-        try {
-          const res = await fetch(`/scatter-data?col1=${encodeURIComponent(r.col1)}&col2=${encodeURIComponent(r.col2)}`);
-          const data = await res.json();
-          if (Array.isArray(data.x) && Array.isArray(data.y) && data.x.length > 0 && data.x.length === data.y.length) {
-            const opt = document.createElement('option');
-            opt.value = i;
-            opt.textContent = `${r.col1} ↔ ${r.col2}`;
-            scatterSelect.appendChild(opt);
-            validScatterPairs.push(i);
-          }
-        } catch (e) {
-          console.warn(`❌ 산점도 불가: ${r.col1} vs ${r.col2}`);
+    // ✅ 모든 결과 쌍의 산점도 좌표를 한 번의 요청으로 받기 (서버에서 파일 1회 파싱 + 점 예산 표본)
+    scatterCache = new Map();
+    try {
+      const pairs = json.results.map(r => ({
+        file: r.file, file1: r.file1, file2: r.file2, col1: r.col1, col2: r.col2, key: r.key
+      }));
+      const res = await fetch('/scatter-data/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ pairs })
+      });
+      const data = await res.json();
+      (data.pairs || []).forEach((d, i) => {
+        const r = json.results[i];
+        if (Array.isArray(d.x) && Array.isArray(d.y) && d.x.length > 0 && d.x.length === d.y.length) {
+          scatterCache.set(i, d);
+          const opt = document.createElement('option');
+          opt.value = i;
+          opt.textContent = `${r.col1} ↔ ${r.col2}`;
+          scatterSelect.appendChild(opt);
+          validScatterPairs.push(i);
         }
-      })
-    );
+      });
+    } catch (e) {
+      console.warn('❌ 산점도 일괄 조회 실패:', e);
+    }
 
     if (validScatterPairs.length > 0) {
       scatterSelect.addEventListener('change', () => updateScatter(json, scatterSelect.value));
@@ -111,8 +121,8 @@ export async function renderAllCharts(json, resultBox, gptBox, cards, scatterSel
   }
 
   if (Array.isArray(json.box_data?.dataList) && json.box_data.labels?.length > 0) {
-    const { dataList, labels } = json.box_data;
-    drawBoxPlot("chartBox", dataList, labels, resolveTheme('box'));
+    const { dataList, labels, outliers } = json.box_data;
+    drawBoxPlot("chartBox", dataList, labels, resolveTheme('box'), outliers || []);
   }
 
   if (Array.isArray(json.bubble_data?.x) && json.bubble_data?.y && json.bubble_data?.size) {
@@ -147,17 +157,11 @@ export async function updateScatter(json, index) {
   const r = json.results?.[index];
   if (!r) return;
 
-  try {
-    const res = await fetch(`/scatter-data?col1=${encodeURIComponent(r.col1)}&col2=${encodeURIComponent(r.col2)}`);
-    const data = await res.json();
-
-    if (data.x?.length > 0 && data.x.length === data.y?.length) {
-      drawScatterChart("chartScatter", data.x, data.y, r.col2, r.col1, resolveTheme('scatter'));
-    } else {
-      console.warn(`⚠️ 산점도 불가: ${r.col1} vs ${r.col2}`);
-    }
-  } catch (err) {
-    console.error("❌ 산점도 불러오기 실패:", err);
+  const data = scatterCache.get(Number(index));
+  if (data?.x?.length > 0 && data.x.length === data.y?.length) {
+    drawScatterChart("chartScatter", data.x, data.y, r.col2, r.col1, resolveTheme('scatter'));
+  } else {
+    console.warn(`⚠️ 산점도 불가: ${r.col1} vs ${r.col2}`);
   }
 }
 
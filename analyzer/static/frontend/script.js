@@ -82,7 +82,8 @@ document.getElementById("analyzeAllBtn")?.addEventListener("click", async () =>
     allAnalysisResults = json;
     cards.innerHTML = '';
 
-    const filenames = Object.keys(json);
+    // '_' 로 시작하는 키(예: _aligned 파일 간 정렬 결과)는 파일 카드가 아님
+    const filenames = Object.keys(json).filter(name => !name.startsWith('_'));
     if (filenames.length === 0) {
       resultBox.textContent = "❌ 분석 결과가 없습니다.";
       return;
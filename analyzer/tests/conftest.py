@@ -0,0 +1,5 @@
+import os
+import sys
+
+# utils 는 app.py 와 같은 방식(analyzer 디렉터리 기준 `utils.*`)으로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,23 @@
+import pandas as pd
+from utils import columnar_store
+from utils.column_profile import profile_column
+from utils.columnar_store import ingest_dataframe, open_columnar
+
+
+def test_nullable_integer_column_round_trips(tmp_path, monkeypatch):
+    monkeypatch.setitem(columnar_store.STORE_CONFIG, "store_dir", str(tmp_path / "store"))
+    source = tmp_path / "data.csv"
+    source.write_text("placeholder")
+
+    df = pd.DataFrame({
+        "count": pd.array([3, None, 7, 1, None, 4], dtype="Int64"),
+        "ratio": pd.array([0.5, 1.5, None, 2.0, 0.25, 1.0], dtype="Float64"),
+        "flag": pd.array([True, None, False, True, False, None], dtype="boolean"),
+        "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    })
+    assert ingest_dataframe(str(source), df) is not None
+
+    restored = open_columnar(str(source))
+    pd.testing.assert_frame_equal(restored, df)
+    assert profile_column(restored["count"]).is_numeric
+    assert restored["count"].corr(restored["value"]) == df["count"].corr(df["value"])
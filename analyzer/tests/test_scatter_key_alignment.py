@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from utils.analysis_runner import analyze_csv_pair
+from utils.key_alignment import align_series_on_key
+from utils.scatter_sampling import scatter_points
+
+
+# 두 파일의 행 순서가 달라도 같은 지역끼리 y = 2x
+def _frames():
+    regions = [f"지역{i:02d}" for i in range(20)]
+    x = np.arange(20, dtype=float)
+    df1 = pd.DataFrame({"region": regions, "x": x})
+    order = np.random.default_rng(0).permutation(20)
+    df2 = pd.DataFrame({"region": [regions[i] for i in order], "y": 2 * x[order]})
+    return df1, df2
+
+
+def test_keyed_scatter_uses_the_rows_behind_the_score():
+    df1, df2 = _frames()
+    result = next(r for r in analyze_csv_pair(df1, df2, cross_join="key") if {r["col1"], r["col2"]} == {"x", "y"})
+    assert result["key"] == ["region", "region"]
+    assert result["score"] == 1.0
+
+    series1, series2 = align_series_on_key(df1["x"], df1[result["key"][0]], df2["y"], df2[result["key"][1]])
+    points = scatter_points(series1, series2, max_points=100)
+    assert points["total"] == 20
+    np.testing.assert_array_equal(points["y"], 2 * points["x"])
+
+
+def test_position_scatter_differs_when_rows_are_shuffled():
+    df1, df2 = _frames()
+    points = scatter_points(df1["x"], df2["y"], max_points=100)
+    assert not np.array_equal(points["y"], 2 * points["x"])
@@ -1,13 +1,75 @@
 import pandas as pd
 from .correlation_detect import detect_correlation
+from .column_profile import profile_column
+from .metrics import increment
+from .screening import pair_screener
+from .key_alignment import JOIN_MODES, align_frames
+from .measures import MEASURE_METHODS, parse_measures, measure_results
+
+
+# ✅ 결측 제거 컬럼 + 프로파일을 컬럼마다 한 번만 계산
+def prepare_columns(df):
+    prepared = {}
+    for col in df.columns:
+        series = df[col].dropna()
+        prepared[col] = (series, profile_column(series))
+    increment("analyzer_columns_profiled_total", len(prepared))
+    return prepared
+
+# ✅ 쌍 비교 1회분 계측 (계산한 쌍 / 방식별 보고 쌍 / 걸러진 쌍)
+def record_pairs(pipeline, total, results, screened=0):
+    increment("analyzer_pairs_total", total, pipeline=pipeline)
+    for r in results:
+        increment("analyzer_pairs_reported_total", method=r["method"], pipeline=pipeline)
+    primary = sum(1 for r in results if r["method"] not in MEASURE_METHODS)  # 추가 측도는 같은 쌍의 두 번째 결과
+    increment("analyzer_pairs_filtered_total", total - primary, pipeline=pipeline)
+    if screened:
+        increment("analyzer_pairs_screened_total", screened, pipeline=pipeline)
+
+# ✅ 수치형 컬럼 추가 측도 (Spearman / 상호정보량) → 측도 계층에서 행렬로 한 번에 계산
+def measure_pair_results(tagged_frames, prepared_list, threshold, measures):
+    """tagged_frames: (구분 태그, DataFrame) 목록 → 태그가 같으면 internal, 다르면 cross"""
+    entries = [(tag, df[col]) for (tag, df), prepared in zip(tagged_frames, prepared_list)
+               for col, (_, profile) in prepared.items() if profile.is_numeric and profile.is_valid()]
+    return [{
+        "col1": r["col1"],
+        "col2": r["col2"],
+        "score": round(r["score"], 3),
+        "method": r["method"]
+    } for r in measure_results(entries, threshold, measures)
+        if (r["type"] == "cross") == (len(tagged_frames) > 1) and abs(r["score"]) > threshold]
 
 # ✅ 파일 간 컬럼 쌍 비교
-def analyze_csv_pair(df1, df2, threshold=0.6):
+def analyze_csv_pair(df1, df2, threshold=0.6, screening=False, cross_join="position", measures=()):
+    """
+    cross_join: "position" (행 위치 기준) | "key" (공통 키 컬럼 자동 감지 → 같은 키 행끼리 비교, 못 찾으면 행 위치)
+    measures: 수치형 쌍에 Pearson 외에 추가로 계산할 측도 ("spearman", "mutual_info")
+    """
+    measures = parse_measures(measures)
+    if cross_join not in JOIN_MODES:
+        raise ValueError(f"지원하지 않는 교차 정렬 방식: {cross_join} (가능: {', '.join(JOIN_MODES)})")
+
+    key = None
+    if cross_join == "key":
+        aligned = align_frames(df1, df2)
+        if aligned is None:
+            print("⚠️ [키 정렬] 공통 키 컬럼 없음 → 행 위치 기준 비교")
+        else:
+            df1, df2, key = aligned
+            print(f"🔑 [키 정렬] {key[0]} = {key[1]} → 공통 키 {len(df1)}행")
+
     results = []
-    for col1 in df1.columns:
-        for col2 in df2.columns:
+    prepared1 = prepare_columns(df1)
+    prepared2 = prepare_columns(df2)
+    keep = pair_screener(df1, df2, prepared1, prepared2, threshold) if screening else None
+    screened = 0
+    for col1, (series1, profile1) in prepared1.items():
+        for col2, (series2, profile2) in prepared2.items():
             try:
-                score, method = detect_correlation(df1[col1].dropna(), df2[col2].dropna())
+                if keep is not None and not keep(col1, col2):
+                    screened += 1
+                    continue
+                score, method = detect_correlation(series1, series2, profile1, profile2)
                 if score is not None and abs(score) > threshold:
                     results.append({
                         "col1": col1,
@@ -15,19 +77,34 @@ def analyze_csv_pair(df1, df2, threshold=0.6):
                         "score": round(score, 3),
                         "method": method
                     })
+                    if key is not None:
+                        results[-1]["key"] = list(key)
             except:
                 continue
+    for r in measure_pair_results([(1, df1), (2, df2)], [prepared1, prepared2], threshold, measures):
+        if key is not None:
+            r["key"] = list(key)
+        results.append(r)
+    record_pairs("pair", len(prepared1) * len(prepared2), results, screened)
     return results
 
 # ✅ 단일 파일 내부의 열 쌍 분석
-def analyze_internal_columns(df, threshold=0.6):
+def analyze_internal_columns(df, threshold=0.6, screening=False, measures=()):
+    measures = parse_measures(measures)
     results = []
+    prepared = prepare_columns(df)
+    keep = pair_screener(df, df, prepared, prepared, threshold) if screening else None
+    screened = 0
     cols = df.columns
     for i in range(len(cols)):
         for j in range(i + 1, len(cols)):
             col1, col2 = cols[i], cols[j]
             try:
-                score, method = detect_correlation(df[col1].dropna(), df[col2].dropna())
+                if keep is not None and not keep(col1, col2):
+                    screened += 1
+                    continue
+                (series1, profile1), (series2, profile2) = prepared[col1], prepared[col2]
+                score, method = detect_correlation(series1, series2, profile1, profile2)
                 if score is not None and abs(score) > threshold:
                     results.append({
                         "col1": col1,
@@ -37,4 +114,6 @@ def analyze_internal_columns(df, threshold=0.6):
                     })
             except:
                 continue
+    results.extend(measure_pair_results([(0, df)], [prepared], threshold, measures))
+    record_pairs("internal", len(cols) * (len(cols) - 1) // 2, results, screened)
     return results
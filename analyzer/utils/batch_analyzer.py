@@ -1,9 +1,23 @@
 import pandas as pd
+import numpy as np
 import traceback
 import multiprocessing
+import time
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .correlation_detect import detect_correlation, is_valid_column
+from .correlation_detect import detect_correlation, correlation_method
+from .correlation_matrix import numeric_correlation_results
+from .column_profile import profile_column, is_duplicate
+from .executor_backend import execute_chunks
+from .dataframe_cache import cached_read
+from .streaming_stats import analyze_csv_streaming
+from .columnar_store import open_columnar
+from .excel_reader import read_excel_fast
+from .metrics import increment, observe
+from .screening import screening_positions, screen_numeric, screen_tasks
+from .key_alignment import JOIN_MODES, key_indexes, detect_join_key, align_on_key, gather
+from .measures import MEASURE_METHODS, parse_measures, measure_results
+from collections import Counter
+from itertools import chain
 import os
 
 
@@ -17,32 +31,21 @@ def analyze_columns(col1, col2):
         return None, None
 
 
-# ✅ 파일을 안전하게 읽는 유틸 함수 (CSV + XLSX 자동 대응 + 단위행 제거)
+# ✅ 파일을 안전하게 읽는 유틸 함수 (CSV + XLSX 자동 대응 + 단위행 제거, 내용 해시 기준 캐시)
 def read_dataframe_safely(path):
     try:
+        df = open_columnar(path)  # 업로드 시 변환된 컬럼형 저장소가 있으면 memmap 으로 바로 열기
+        if df is not None:
+            return df
+
         ext = os.path.splitext(path)[1].lower()
         if ext == ".csv":
-            chunks = pd.read_csv(path, chunksize=10000)
-            return pd.concat(chunks, ignore_index=True)
+            return cached_read(path, lambda: read_csv_chunked(path),
+                               reader="csv", encoding="utf-8")
 
         elif ext == ".xlsx":
-            # ✅ 1. 헤더 자동 탐지
-            preview = pd.read_excel(path, engine="openpyxl", header=None, nrows=15)
-            for i in range(15):
-                row = preview.iloc[i]
-                text_row = row.astype(str).str.lower().fillna("")
-                if text_row.str.contains("date|날짜|시간|일시|측정일").any():
-                    header_row = i
-                    break
-            else:
-                header_row = 0
-
-            # ✅ 2. 날짜 컬럼 미리 감지
-            preview_named = pd.read_excel(path, engine="openpyxl", header=header_row, nrows=1)
-            date_cols = [col for col in preview_named.columns if any(kw in str(col).lower() for kw in ["date", "time", "날짜", "일시", "측정일"])]
-
-            # ✅ 3. 최종 읽기
-            return pd.read_excel(path, engine="openpyxl", header=header_row, parse_dates=date_cols)
+            return cached_read(path, lambda: read_excel_fast(path),
+                               reader="xlsx", header="auto", parse_dates="auto")
 
         else:
             raise ValueError(f"지원하지 않는 파일 형식: {ext}")
@@ -52,107 +55,282 @@ def read_dataframe_safely(path):
         return pd.DataFrame()
 
 
+def read_csv_chunked(path):
+    chunks = pd.read_csv(path, chunksize=10000)
+    return pd.concat(chunks, ignore_index=True)
 
 
-# ✅ 스레드로 실행할 단일 작업 단위
-def correlation_task(task_info):
-    task_type = task_info['type']
-    col1 = task_info['col1']
-    col2 = task_info['col2']
-    path1 = task_info['file1']
-    path2 = task_info.get('file2')
-
-    score, method = analyze_columns(col1, col2)
-    if score is not None and abs(score) >= task_info['threshold']:
-        if task_type == 'internal':
-            return {
-                "type": "internal",
-                "file": path1,
-                "col1": col1.name,
-                "col2": col2.name,
-                "score": score,
-                "method": method
-            }
-        elif task_type == 'cross':
-            return {
-                "type": "cross",
-                "file1": path1,
-                "file2": path2,
-                "col1": col1.name,
-                "col2": col2.name,
-                "score": score,
-                "method": method
-            }
-    return None  # None이면 결과 버림
-
-
-# ✅ 메인 분석 진입점 (내부 + 교차 컬럼 → 병렬 실행 + 진행률 표시)
-def analyze_all_columns(file_paths, threshold=0.3, max_workers=None):
-    if max_workers is None:
-        cpu_count = multiprocessing.cpu_count()
-        max_workers = max(2, min(cpu_count, 8))  # 과도한 쓰레드 방지
-        print(f"⚙️ 사용 가능 논리 프로세서: {cpu_count} → 설정된 작업자 수: {max_workers}")
+# ✅ 작업자에게 보낼 컬럼 배열 등록 (같은 컬럼·역할은 한 번만 적재, 범주형 코드는 프로파일 재사용)
+class ColumnArrays:
+    def __init__(self):
+        self.arrays = []
+        self._refs = {}
 
-    tasks = []
+    def ref(self, path, col, profile, role, alignment=None):
+        key = (path, col.name, role, alignment)  # 키 정렬된 컬럼은 상대 파일별로 따로 적재
+        if key not in self._refs:
+            if role == "codes":
+                self.arrays.append(profile.codes)
+            else:
+                self.arrays.append(col.to_numpy(dtype=float, na_value=np.nan))
+            self._refs[key] = len(self.arrays) - 1
+        return self._refs[key]
+
+
+# ✅ 범주형이 포함된 컬럼쌍 → 작업 dict (컬럼 데이터 대신 배열 번호만 포함)
+def build_pair_task(columns, task_type, path1, path2, entry1, entry2, key=None):
+    (col1, profile1), (col2, profile2) = entry1, entry2
+    method = correlation_method(profile1.is_numeric, profile1.is_categorical,
+                                profile2.is_numeric, profile2.is_categorical)
+    if method not in ("Cramér's V", "Eta Squared"):
+        return None
+    if method == "Cramér's V" and is_duplicate(col1, col2, profile1, profile2):
+        return None
+
+    path2 = path2 or path1
+    alignment = (path1, path2) if key else None
+    if method == "Cramér's V":
+        ref1 = columns.ref(path1, col1, profile1, "codes", alignment)
+        ref2 = columns.ref(path2, col2, profile2, "codes", alignment)
+    elif profile1.is_numeric and profile2.is_categorical:
+        ref1 = columns.ref(path1, col1, profile1, "values", alignment)
+        ref2 = columns.ref(path2, col2, profile2, "codes", alignment)
+    else:
+        ref1 = columns.ref(path2, col2, profile2, "values", alignment)
+        ref2 = columns.ref(path1, col1, profile1, "codes", alignment)
 
-    # 1. 내부 컬럼 비교 (유효 컬럼만 필터링)
+    task = {
+        "type": task_type,
+        "file1": path1,
+        "file2": path2 if task_type == "cross" else None,
+        "col1": col1.name,
+        "col2": col2.name,
+        "method": method,
+        "ref1": ref1,
+        "ref2": ref2
+    }
+    if key:
+        task["key"] = list(key)
+    return task
+
+
+# ✅ 키 정렬 교차 비교: 두 파일의 키 색인으로 행 위치 쌍을 한 번 구하고 모든 유효 컬럼을 한 번에 모음
+def align_entries(indexes1, entries1, indexes2, entries2):
+    """
+    반환: ((키 컬럼1, 키 컬럼2), 정렬된 entries1, 정렬된 entries2) / 공통 키가 없으면 None
+    정렬된 컬럼은 공통 키 행만 남으므로 다시 프로파일 (키 컬럼 자체는 비교 대상에서 제외)
+    """
+    detected = detect_join_key(indexes1, indexes2)
+    if detected is None:
+        return None
+    index1, index2 = detected
+    pos1, pos2 = align_on_key(index1, index2)
+
+    def aligned(entries, key_column, positions):
+        result = []
+        for col, _ in entries:
+            if col.name == key_column:
+                continue
+            gathered = gather(col, positions)
+            profile = profile_column(gathered)
+            if profile.is_valid():
+                result.append((gathered, profile))
+        return result
+
+    return ((index1.column, index2.column),
+            aligned(entries1, index1.column, pos1), aligned(entries2, index2.column, pos2))
+
+
+# ✅ 키 정렬된 파일 쌍의 수치형 교차 결과 (정렬 행렬에서 교차 블록만)
+def keyed_numeric_results(path1, path2, key, aligned1, aligned2, threshold, measures=()):
+    entries = ([(path1, col) for col, profile in aligned1 if profile.is_numeric] +
+               [(path2, col) for col, profile in aligned2 if profile.is_numeric])
+    for r in chain(numeric_correlation_results(entries, threshold), measure_results(entries, threshold, measures)):
+        if r["type"] == "cross":
+            r["key"] = list(key)
+            yield r
+
+
+# ✅ 1단계: 파일마다 정확히 한 번 로드 + 프로파일 + 유효 컬럼 계산 (내부/교차 비교가 함께 사용)
+def load_valid_columns(file_paths, timings):
+    loaded = []
     for path in file_paths:
+        started = time.perf_counter()
         df = read_dataframe_safely(path)
+        timings["parse"] += time.perf_counter() - started
         if df.empty:
             continue
 
-        valid_cols = [df[c] for c in df.columns if is_valid_column(df[c])]
-        print(f"🔍 [내부 비교] {path} 유효 컬럼 수: {len(valid_cols)}")
-
-        for i in range(len(valid_cols)):
-            for j in range(i + 1, len(valid_cols)):
-                col1 = valid_cols[i]
-                col2 = valid_cols[j]
-
-                tasks.append({
-                    "type": "internal",
-                    "file1": path,
-                    "col1": col1,
-                    "col2": col2,
-                    "threshold": threshold
-                })
-
-    # 2. 서로 다른 파일 간의 컬럼 비교 (유효 컬럼만 필터링)
-    for i in range(len(file_paths)):
-        for j in range(i + 1, len(file_paths)):
-            path1 = file_paths[i]
-            path2 = file_paths[j]
-
-            df1 = read_dataframe_safely(path1)
-            df2 = read_dataframe_safely(path2)
-            if df1.empty or df2.empty:
+        started = time.perf_counter()
+        entries = [(df[c], profile_column(df[c])) for c in df.columns]
+        valid_entries = [(col, profile) for col, profile in entries if profile.is_valid()]
+        timings["filter"] += time.perf_counter() - started
+        increment("analyzer_columns_profiled_total", len(entries))
+        print(f"🔍 [컬럼 필터] {path} 유효 컬럼 수: {len(valid_entries)}")
+        loaded.append((path, valid_entries))
+    return loaded
+
+
+# ✅ 메인 분석 진입점 (로드 → 필터 → 쌍 생성 → 계산 단계별 파이프라인)
+def analyze_all_columns(file_paths, threshold=0.3, max_workers=None, backend="thread", chunk_size=None, stats=None,
+                        streaming=False, stream_chunksize=100_000, on_progress=None, screening=False,
+                        cross_join="position", measures=()):
+    """
+    backend: "thread" | "process" | "serial"
+    - process: 컬럼 데이터를 memmap 공유 버퍼에 한 번 기록하고 작업자 프로세스는 배열 번호만 받음
+    stats: dict 를 넘기면 단계별 소요 시간(parse / filter / pairs / compute)과 작업 수를 기록
+    streaming: True 이면 (CSV 전용) 파일 전체를 메모리에 올리지 않고 청크 단위 충분통계량만 누적
+    on_progress: (완료한 쌍 수, 전체 쌍 수) 를 받는 콜백 (작업 API 진행률용)
+    screening: True 이면 행 수가 많을 때 고정 크기 행 표본으로 쌍별 점수 상한을 먼저 구해
+               임계값에 못 미치는 쌍은 버리고, 남은 후보만 전체 행으로 정확 계산 (보고 점수는 항상 전체 기준)
+    cross_join: "position" (행 위치 기준) | "key" (파일 쌍마다 공통 키 컬럼을 감지해 같은 키 행끼리 비교,
+                키를 찾지 못한 파일 쌍은 행 위치 기준, 스트리밍 모드는 행 위치 기준만 지원)
+    measures: 수치형 쌍에 Pearson 외에 추가로 계산할 측도 ("spearman", "mutual_info") → 결과 method 로 구분
+              (스트리밍 모드는 순위 / 구간화에 전체 컬럼이 필요하므로 Pearson 만)
+    """
+    measures = parse_measures(measures)
+    if cross_join not in JOIN_MODES:
+        raise ValueError(f"지원하지 않는 교차 정렬 방식: {cross_join} (가능: {', '.join(JOIN_MODES)})")
+    if on_progress is None:
+        on_progress = lambda completed, total: None
+
+    if streaming:
+        if all(os.path.splitext(p)[1].lower() == ".csv" for p in file_paths):
+            print(f"🌊 [스트리밍 모드] chunksize={stream_chunksize}")
+            if measures:
+                print("⚠️ 스트리밍 모드는 추가 측도 미지원 → Pearson 만 계산")
+            on_progress(0, 1)
+            yield from analyze_csv_streaming(file_paths, threshold=threshold, chunksize=stream_chunksize)
+            on_progress(1, 1)
+            return
+        print("⚠️ 스트리밍 모드는 CSV 전용 → 일반 모드로 진행")
+
+    if max_workers is None:
+        cpu_count = multiprocessing.cpu_count()
+        if backend == "process":
+            max_workers = max(1, cpu_count)
+        else:
+            max_workers = max(2, min(cpu_count, 8))  # 과도한 쓰레드 방지
+        print(f"⚙️ 사용 가능 논리 프로세서: {cpu_count} → 설정된 작업자 수: {max_workers} ({backend})")
+
+    timings = {"parse": 0.0, "filter": 0.0, "pairs": 0.0, "compute": 0.0}
+    if stats is None:
+        stats = {}
+    stats["timings"] = timings
+
+    # 1. 파일 로드 + 유효 컬럼 필터 (파일당 1회)
+    loaded = load_valid_columns(file_paths, timings)
+
+    # 2. 쌍 생성 (수치형 × 수치형은 행렬 엔진, 나머지는 작업 목록)
+    started = time.perf_counter()
+    tasks = []
+    columns = ColumnArrays()
+    numeric_entries = [(path, col) for path, entries in loaded for col, profile in entries if profile.is_numeric]
+
+    def add_task(task_type, path1, path2, entry1, entry2, key=None):
+        task = build_pair_task(columns, task_type, path1, path2, entry1, entry2, key)
+        if task is not None:
+            tasks.append(task)
+
+    # 2-1. 내부 컬럼 비교
+    for path, entries in loaded:
+        for i in range(len(entries)):
+            for j in range(i + 1, len(entries)):
+                add_task("internal", path, None, entries[i], entries[j])
+
+    # 2-2. 서로 다른 파일 간의 컬럼 비교 (이미 로드한 컬럼 재사용)
+    keyed = {}   # (path1, path2) → (키 컬럼 쌍, 정렬된 entries1, 정렬된 entries2)
+    indexes = {path: key_indexes([col for col, _ in entries]) for path, entries in loaded} \
+        if cross_join == "key" else {}
+    for i in range(len(loaded)):
+        for j in range(i + 1, len(loaded)):
+            path1, entries1 = loaded[i]
+            path2, entries2 = loaded[j]
+            alignment = align_entries(indexes[path1], entries1, indexes[path2], entries2) if indexes else None
+            if alignment is not None:
+                key, aligned1, aligned2 = alignment
+                keyed[(path1, path2)] = alignment
+                print(f"🔑 [키 정렬 비교] {path1} × {path2} ({key[0]} = {key[1]}) → 유효 {len(aligned1)} x {len(aligned2)}")
+                for entry1 in aligned1:
+                    for entry2 in aligned2:
+                        add_task("cross", path1, path2, entry1, entry2, key)
                 continue
 
-            valid_cols1 = [df1[c] for c in df1.columns if is_valid_column(df1[c])]
-            valid_cols2 = [df2[c] for c in df2.columns if is_valid_column(df2[c])]
-            print(f"🔁 [크로스 비교] {path1} × {path2} → 유효 {len(valid_cols1)} x {len(valid_cols2)}")
-
-            for col1 in valid_cols1:
-                for col2 in valid_cols2:
-                    tasks.append({
-                        "type": "cross",
-                        "file1": path1,
-                        "file2": path2,
-                        "col1": col1,
-                        "col2": col2,
-                        "threshold": threshold
-                    })
-
-    print(f"🚀 총 비교 작업 수: {len(tasks)} → 병렬 처리 시작 (max_workers={max_workers})")
-
-    # 3. 병렬 처리 + 진행률
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(correlation_task, task) for task in tasks]
-        for future in tqdm(as_completed(futures), total=len(futures), desc="🔍 분석 진행 중", ncols=90):
-            try:
-                result = future.result()
-                if result:
-                    yield result
-            except Exception as e:
-                print(f"❌ 스레드 예외 발생: {e}")
-                traceback.print_exc()
+            print(f"🔁 [크로스 비교] {path1} × {path2} → 유효 {len(entries1)} x {len(entries2)}")
+            for entry1 in entries1:
+                for entry2 in entries2:
+                    add_task("cross", path1, path2, entry1, entry2)
+
+    timings["pairs"] = time.perf_counter() - started
+    stats["numeric_columns"] = len(numeric_entries)
+    stats["tasks"] = len(tasks)
+    numeric_pairs = len(numeric_entries) * (len(numeric_entries) - 1) // 2
+    total_pairs = numeric_pairs + len(tasks)
+    on_progress(0, total_pairs)
+
+    # 2-3. (선택) 표본 선별 → 수치형은 후보 쌍 행렬, 범주형 작업은 후보만 남김
+    candidates, skipped = None, 0
+    n_rows = max((len(col) for _, entries in loaded for col, _ in entries), default=0)
+    positions = screening_positions(n_rows) if screening else None
+    if positions is not None:
+        started = time.perf_counter()
+        if len(numeric_entries) >= 2:
+            candidates = screen_numeric([col for _, col in numeric_entries], positions, threshold)
+        survivors = screen_tasks(columns.arrays, tasks, positions, threshold)
+        skipped = len(tasks) - len(survivors)
+        tasks = survivors
+        screened = skipped + (numeric_pairs - int(candidates.sum()) if candidates is not None else 0)
+        timings["screen"] = time.perf_counter() - started
+        stats["screened_out"] = screened
+        increment("analyzer_pairs_screened_total", screened, pipeline="batch")
+        print(f"🔎 [표본 선별] {len(positions)}/{n_rows}행 표본 → {screened}/{total_pairs}쌍 제외, "
+              f"정확 계산 {total_pairs - screened}쌍")
+
+    # 3. 수치형 쌍 (내부 + 교차) → 마스크 행렬곱 한 번으로 Pearson 전체 블록 계산
+    #    추가 측도는 같은 수치형 행렬에서 측도별로 한 번씩 (선별 후보는 Pearson 상한 기준이라 적용하지 않음)
+    print(f"🧮 [{' / '.join(('Pearson',) + measures)} 행렬] 수치형 컬럼 {len(numeric_entries)}개 일괄 계산")
+    started = time.perf_counter()
+    numeric_results = [r for r in chain(numeric_correlation_results(numeric_entries, threshold, candidates=candidates),
+                                        measure_results(numeric_entries, threshold, measures))
+                       if r["type"] == "internal" or (r["file1"], r["file2"]) not in keyed]
+    for (path1, path2), (key, aligned1, aligned2) in keyed.items():
+        numeric_results.extend(keyed_numeric_results(path1, path2, key, aligned1, aligned2, threshold, measures))
+    timings["compute"] += time.perf_counter() - started
+    completed = numeric_pairs + skipped
+    on_progress(completed, total_pairs)
+    reported = Counter(r["method"] for r in numeric_results)
+    yield from numeric_results
+
+    print(f"🚀 총 비교 작업 수: {len(tasks)} → 병렬 처리 시작 (backend={backend}, max_workers={max_workers})")
+
+    # 4. 범주형이 포함된 쌍만 청크 단위 병렬 처리 + 진행률
+    started = time.perf_counter()
+    with tqdm(total=len(tasks), desc="🔍 분석 진행 중", ncols=90) as progress_bar:
+        try:
+            for done, results in execute_chunks(columns.arrays, tasks, threshold,
+                                                backend=backend, max_workers=max_workers,
+                                                chunk_size=chunk_size):
+                progress_bar.update(done)
+                completed += done
+                on_progress(completed, total_pairs)
+                reported.update(r["method"] for r in results)
+                yield from results
+        except Exception as e:
+            print(f"❌ 병렬 처리 예외 발생: {e}")
+            traceback.print_exc()
+    timings["compute"] += time.perf_counter() - started
+
+    print("⏱️ [단계별 소요] " + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items()))
+    record_pair_metrics(total_pairs, reported, timings)
+
+
+# ✅ 일괄 분석 1회분 계측 (단계별 소요 시간 / 방식별 보고 쌍 수 / 걸러진 쌍 수)
+def record_pair_metrics(total_pairs, reported, timings):
+    for name, seconds in timings.items():
+        observe("analyzer_stage_seconds", seconds, stage=name, pipeline="batch")
+    increment("analyzer_pairs_total", total_pairs, pipeline="batch")
+    for method, count in reported.items():
+        increment("analyzer_pairs_reported_total", count, method=method, pipeline="batch")
+    # 추가 측도 결과는 같은 쌍의 두 번째 결과이므로 걸러진 쌍 수 계산에서 제외
+    primary = sum(count for method, count in reported.items() if method not in MEASURE_METHODS)
+    increment("analyzer_pairs_filtered_total", total_pairs - primary, pipeline="batch")
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def _five_numbers(values, q1, median, q3, whisker):
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - whisker * iqr, q3 + whisker * iqr
+    inside = values[(values >= low_fence) & (values <= high_fence)]
+    low = float(inside.min()) if len(inside) else float(q1)
+    high = float(inside.max()) if len(inside) else float(q3)
+    return [low, float(q1), float(median), float(q3), high], low_fence, high_fence
+
+
+# 이상치 표본: 정렬 후 등간격으로 최대 max_outliers 개 (양 끝 극값은 항상 포함)
+def _outlier_sample(outliers, max_outliers):
+    if len(outliers) <= max_outliers:
+        return np.sort(outliers)
+    ordered = np.sort(outliers)
+    picks = np.unique(np.linspace(0, len(ordered) - 1, max_outliers).round().astype(np.int64))
+    return ordered[picks]
+
+
+# ✅ 박스플롯 요약 (Tukey 수염 + 이상치 표본) → 응답 크기는 행 수와 무관
+def box_summary(values, whisker=1.5, max_outliers=50):
+    """
+    반환: {"box": [하단 수염, Q1, 중앙값, Q3, 상단 수염], "outliers": [...], "outlier_count", "count"}
+    분위수는 np.quantile 로 정확 계산 (값이 이미 메모리에 있으므로 근사 불필요),
+    수염 / 이상치는 원본 값에 대한 벡터 비교로 구한다.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+
+    box, low_fence, high_fence = _five_numbers(values, q1, median, q3, whisker)
+    outliers = values[(values < low_fence) | (values > high_fence)]
+
+    return {
+        "box": box,
+        "outliers": _outlier_sample(outliers, max_outliers).tolist(),
+        "outlier_count": int(len(outliers)),
+        "count": int(len(values))
+    }
+
+
+# ✅ 여러 컬럼 → 프런트 박스플롯 형식 (dataList = [min, Q1, median, Q3, max] 목록, outliers = [컬럼 번호, 값])
+def box_plot_data(df, columns, **options):
+    labels, data_list, outliers, counts, outlier_counts = [], [], [], [], []
+    for col in columns:
+        summary = box_summary(df[col].to_numpy(dtype=float, na_value=np.nan), **options)
+        if summary is None:
+            continue
+        index = len(labels)
+        labels.append(col)
+        data_list.append(summary["box"])
+        outliers.extend([index, v] for v in summary["outliers"])
+        counts.append(summary["count"])
+        outlier_counts.append(summary["outlier_count"])
+
+    return {
+        "labels": labels,
+        "dataList": data_list,
+        "outliers": outliers,
+        "counts": counts,
+        "outlierCounts": outlier_counts
+    }
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from .correlation_detect import is_categorical
+
+
+# ✅ 컬럼 1회 프로파일 (유효성 검사 / 분석 방식 결정 / 중복 검사를 O(1) 조회로 처리)
+class ColumnProfile:
+    __slots__ = ("name", "kind", "length", "null_ratio", "unique_count", "content_hash", "codes")
+
+    def __init__(self, name, kind, length, null_ratio, unique_count, content_hash, codes):
+        self.name = name
+        self.kind = kind                  # "numeric" | "categorical" | "bool" | "other"
+        self.length = length
+        self.null_ratio = null_ratio
+        self.unique_count = unique_count
+        self.content_hash = content_hash  # (길이, dtype, 해시합) → 같으면 equals 로 최종 확인
+        self.codes = codes                # 범주형 작업용 factorize 코드 (-1 = 결측), 수치형은 None
+
+    # bool 은 pandas 기준으로 수치형이면서 범주형 (detect_correlation 분기와 동일)
+    @property
+    def is_numeric(self):
+        return self.kind in ("numeric", "bool")
+
+    @property
+    def is_categorical(self):
+        return self.kind in ("categorical", "bool")
+
+    def is_valid(self, min_unique=2, max_null_ratio=0.9):
+        return self.length > 0 and self.null_ratio < max_null_ratio and self.unique_count >= min_unique
+
+    def __repr__(self):
+        return (f"ColumnProfile({self.name!r}, kind={self.kind}, null_ratio={self.null_ratio:.3f}, "
+                f"unique={self.unique_count})")
+
+
+def column_kind(col):
+    if pd.api.types.is_bool_dtype(col):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(col):
+        return "numeric"
+    if is_categorical(col):
+        return "categorical"
+    return "other"
+
+
+# ✅ 단일 컬럼 프로파일 계산 (null 비율, 고유값 수, 내용 해시, 범주형 코드)
+def profile_column(col):
+    kind = column_kind(col)
+    length = len(col)
+    null_ratio = float(col.isnull().mean()) if length else 0.0
+
+    codes = None
+    if kind in ("categorical", "bool"):
+        codes, uniques = pd.factorize(col, use_na_sentinel=True)
+        codes = np.ascontiguousarray(codes, dtype=np.int64)
+        unique_count = len(uniques)
+    else:
+        unique_count = int(col.nunique(dropna=True))
+
+    hashed = int(pd.util.hash_pandas_object(col, index=True).sum()) if length else 0
+    content_hash = (length, str(col.dtype), hashed)
+
+    return ColumnProfile(col.name, kind, length, null_ratio, unique_count, content_hash, codes)
+
+
+# ✅ DataFrame 전체 프로파일 (컬럼명 → ColumnProfile)
+def profile_frame(df):
+    return {c: profile_column(df[c]) for c in df.columns}
+
+
+# ✅ 두 컬럼이 완전히 같은지 (해시가 다르면 바로 False, 같을 때만 equals 비교)
+def is_duplicate(col1, col2, profile1, profile2):
+    return profile1.content_hash == profile2.content_hash and col1.equals(col2)
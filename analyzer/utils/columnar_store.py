@@ -0,0 +1,165 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from .dataframe_cache import file_content_hash
+
+FORMAT_VERSION = 2  # 2: nullable 수치형 / 불리언(Int64, Float64, boolean)을 값 + 결측 마스크로 저장
+
+# 값 배열 + 결측 마스크로 저장하는 pandas nullable dtype (읽을 때 같은 dtype 으로 복원)
+MASKED_DTYPES = (pd.BooleanDtype, pd.Float32Dtype, pd.Float64Dtype,
+                 pd.Int8Dtype, pd.Int16Dtype, pd.Int32Dtype, pd.Int64Dtype,
+                 pd.UInt8Dtype, pd.UInt16Dtype, pd.UInt32Dtype, pd.UInt64Dtype)
+
+# ✅ 컬럼형 저장소 위치 (app.py 에서 configure_store 로 지정, None 이면 비활성)
+STORE_CONFIG = {"store_dir": None}
+
+
+def configure_store(store_dir):
+    os.makedirs(store_dir, exist_ok=True)
+    STORE_CONFIG["store_dir"] = store_dir
+
+
+def _store_path(path):
+    if not STORE_CONFIG["store_dir"]:
+        return None
+    return os.path.join(STORE_CONFIG["store_dir"], file_content_hash(path))
+
+
+# JSON 으로 저장 가능한 값으로 변환 (numpy 스칼라 → 파이썬 값, 나머지는 그대로)
+def _json_value(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    return value
+
+
+# ✅ 컬럼 1개 → 타입 있는 배열 파일 (문자열/객체는 사전 인코딩: int32 코드 + 값 목록, nullable 은 값 + 마스크)
+def _write_column(directory, index, series):
+    name = f"col{index}.npy"
+    dtype = series.dtype
+
+    if pd.api.types.is_datetime64_any_dtype(dtype) and getattr(dtype, "tz", None) is None:
+        values = series.to_numpy(dtype="datetime64[ns]")
+        np.save(os.path.join(directory, name), values.view(np.int64))
+        return {"kind": "datetime", "dtype": "datetime64[ns]", "file": name}
+
+    if isinstance(dtype, MASKED_DTYPES):
+        # 결측 칸의 값은 의미 없음 (0 / False 로 채움) → 마스크가 True 인 칸이 pd.NA
+        mask_name = f"col{index}.mask.npy"
+        fill = False if pd.api.types.is_bool_dtype(dtype) else 0
+        np.save(os.path.join(directory, name), series.to_numpy(dtype=dtype.numpy_dtype, na_value=fill))
+        np.save(os.path.join(directory, mask_name), series.isna().to_numpy())
+        return {"kind": "masked", "dtype": dtype.name, "file": name, "mask": mask_name}
+
+    if pd.api.types.is_bool_dtype(dtype) or (pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype)):
+        np.save(os.path.join(directory, name), series.to_numpy())
+        return {"kind": "numeric", "dtype": dtype.str, "file": name}
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    dictionary = [_json_value(v) for v in uniques]
+    if any(not isinstance(v, (str, int, float, bool)) for v in dictionary):
+        raise ValueError(f"사전 인코딩 불가한 값 포함: {series.name}")
+    np.save(os.path.join(directory, name), codes.astype(np.int32))
+    return {
+        "kind": "dictionary",
+        "dtype": "object",
+        "file": name,
+        "dictionary": dictionary
+    }
+
+
+# ✅ 업로드 시 1회 변환: DataFrame → 컬럼별 배열 + 메타데이터 헤더 (내용 해시 디렉터리)
+def ingest_dataframe(path, df):
+    target = _store_path(path)
+    if target is None or _stored_version(target) == FORMAT_VERSION:
+        return target
+
+    staging = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(staging, exist_ok=True)
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            entry = _write_column(staging, i, df[col])
+            entry["name"] = _json_value(col)
+            if not isinstance(entry["name"], (str, int, float)):
+                raise ValueError(f"컬럼명을 저장할 수 없음: {col!r}")
+            columns.append(entry)
+
+        # read_csv 가 첫 컬럼을 인덱스로 잡는 경우(행 끝 쉼표 등) 인덱스도 그대로 보존
+        index = None
+        if not df.index.equals(pd.RangeIndex(len(df))):
+            index = _write_column(staging, "_index", df.index.to_series())
+            index["name"] = _json_value(df.index.name)
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "source": os.path.basename(path),
+            "rows": len(df),
+            "columns": columns,
+            "index": index
+        }
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+        print(f"🗄️ [컬럼형 저장] {os.path.basename(path)} → {len(columns)}개 컬럼, {len(df)}행")
+        return target
+    except Exception as e:
+        print(f"⚠️ 컬럼형 저장 실패: {path} → {e}")
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+
+# 저장된 형식 버전 (없거나 읽을 수 없으면 None → 다시 변환)
+def _stored_version(target):
+    try:
+        with open(os.path.join(target, "meta.json"), encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _read_column(directory, entry):
+    # mmap_mode="c": 읽기는 zero-copy, 혹시 쓰더라도 원본 파일은 변경되지 않음
+    array = np.load(os.path.join(directory, entry["file"]), mmap_mode="c")
+    if entry["kind"] == "numeric":
+        return array
+    if entry["kind"] == "datetime":
+        return array.view("datetime64[ns]")
+    if entry["kind"] == "masked":
+        mask = np.load(os.path.join(directory, entry["mask"]), mmap_mode="c")
+        return pd.api.types.pandas_dtype(entry["dtype"]).construct_array_type()(array, mask, copy=False)
+
+    dictionary = np.empty(len(entry["dictionary"]) + 1, dtype=object)
+    dictionary[:-1] = entry["dictionary"]
+    dictionary[-1] = np.nan
+    return dictionary[array]  # -1 → 마지막 칸(NaN)
+
+
+# ✅ 컬럼형 저장소에서 열기 (수치형은 np.memmap 그대로, 없으면 None)
+def open_columnar(path):
+    target = _store_path(path)
+    if target is None:
+        return None
+    meta_path = os.path.join(target, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+
+        data = {entry["name"]: _read_column(target, entry) for entry in meta["columns"]}
+        index = None
+        if meta.get("index"):
+            index = pd.Index(_read_column(target, meta["index"]), name=meta["index"]["name"])
+
+        return pd.DataFrame(data, index=index, columns=[e["name"] for e in meta["columns"]], copy=False)
+    except Exception as e:
+        print(f"⚠️ 컬럼형 저장소 열기 실패: {path} → {e}")
+        return None
@@ -1,37 +1,26 @@
 import pandas as pd
 import numpy as np
-import warnings
-from scipy.stats import chi2_contingency, f_oneway
+from .statistical import cramers_v_codes, eta_squared_codes
 
-# ✅ 범주형 vs 범주형 → Cramér's V
+# ✅ 범주형 vs 범주형 → Cramér's V (인덱스 정렬 후 정수 코드 커널로 계산)
 def cramers_v(x, y):
     try:
-        confusion = pd.crosstab(x, y)
-        chi2, _, _, _ = chi2_contingency(confusion)
-        n = confusion.sum().sum()
-        r, k = confusion.shape
-
-        if min(k, r) <= 1 or n == 0:
-            return None
-
-        return np.sqrt(chi2 / (n * (min(k, r) - 1)))
+        x, y = x.align(y, join="inner")
+        codes_x, _ = pd.factorize(x, use_na_sentinel=True)
+        codes_y, _ = pd.factorize(y, use_na_sentinel=True)
+        return cramers_v_codes(codes_x, codes_y)
     except Exception as e:
         print(f"❌ Cramér's V 실패: {e}")
         return None
 
-# ✅ 수치형 vs 범주형 → Eta Squared (ANOVA 기반)
+# ✅ 수치형 vs 범주형 → Eta Squared (ANOVA 기반, 그룹별 bincount 커널)
 def eta_squared(numeric, categorical):
     try:
-        groups = [numeric[categorical == cat].dropna() for cat in categorical.dropna().unique()]
-        groups = [g for g in groups if len(g) >= 2]
-        if len(groups) < 2:
-            return None
-
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            anova = f_oneway(*groups)
-
-        return anova.statistic / (anova.statistic + (len(numeric) - len(groups)))
+        total_length = len(numeric)
+        numeric, categorical = numeric.align(categorical, join="inner")
+        codes, _ = pd.factorize(categorical, use_na_sentinel=True)
+        values = numeric.to_numpy(dtype=float, na_value=np.nan)
+        return eta_squared_codes(values, codes, total_length=total_length)
     except Exception as e:
         print(f"❌ Eta Squared 실패: {e}")
         return None
@@ -53,31 +42,55 @@ def is_valid_column(col, min_unique=2, max_null_ratio=0.9):
     unique_count = col.nunique(dropna=True)
     return null_ratio < max_null_ratio and unique_count >= min_unique
 
-# ✅ 컬럼쌍이 의미 있는 조합인지 검사
-def is_valid_pair(col1, col2):
+# ✅ 컬럼쌍이 의미 있는 조합인지 검사 (ColumnProfile 이 있으면 재계산 없이 조회)
+def is_valid_pair(col1, col2, profile1=None, profile2=None):
+    if profile1 is not None and profile2 is not None:
+        return (
+            profile1.is_valid() and
+            profile2.is_valid() and
+            not (profile1.content_hash == profile2.content_hash and col1.equals(col2))
+        )
     return (
         is_valid_column(col1) and
         is_valid_column(col2) and
         not col1.equals(col2)
     )
 
-# ✅ 상관 분석 라우팅 함수 (필터 포함)
-def detect_correlation(col1, col2):
+# ✅ (수치형 여부, 범주형 여부) 쌍으로 분석 방식 결정
+def correlation_method(numeric1, categorical1, numeric2, categorical2):
+    if numeric1 and numeric2:
+        return "Pearson"
+    if categorical1 and categorical2:
+        return "Cramér's V"
+    if (numeric1 and categorical2) or (numeric2 and categorical1):
+        return "Eta Squared"
+    return None
+
+# ✅ 상관 분석 라우팅 함수 (필터 포함, profile1/profile2 는 선택)
+def detect_correlation(col1, col2, profile1=None, profile2=None):
     try:
-        if not is_valid_pair(col1, col2):
+        if not is_valid_pair(col1, col2, profile1, profile2):
             return None, "Invalid Pair"
 
-        if pd.api.types.is_numeric_dtype(col1) and pd.api.types.is_numeric_dtype(col2):
-            return col1.corr(col2), "Pearson"
+        if profile1 is not None and profile2 is not None:
+            numeric1, categorical1 = profile1.is_numeric, profile1.is_categorical
+            numeric2, categorical2 = profile2.is_numeric, profile2.is_categorical
+        else:
+            numeric1, categorical1 = pd.api.types.is_numeric_dtype(col1), is_categorical(col1)
+            numeric2, categorical2 = pd.api.types.is_numeric_dtype(col2), is_categorical(col2)
+
+        method = correlation_method(numeric1, categorical1, numeric2, categorical2)
 
-        if is_categorical(col1) and is_categorical(col2):
-            return cramers_v(col1, col2), "Cramér's V"
+        if method == "Pearson":
+            return col1.corr(col2), method
 
-        if pd.api.types.is_numeric_dtype(col1) and is_categorical(col2):
-            return eta_squared(col1, col2), "Eta Squared"
+        if method == "Cramér's V":
+            return cramers_v(col1, col2), method
 
-        if pd.api.types.is_numeric_dtype(col2) and is_categorical(col1):
-            return eta_squared(col2, col1), "Eta Squared"
+        if method == "Eta Squared":
+            if numeric1 and categorical2:
+                return eta_squared(col1, col2), method
+            return eta_squared(col2, col1), method
 
         return None, "Unsupported"
     except Exception as e:
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+# ✅ 수치형 컬럼들을 하나의 float 행렬로 결합 (길이가 다르면 NaN 패딩 → 행 위치 기준 정렬)
+def build_numeric_matrix(columns):
+    n_rows = max((len(col) for col in columns), default=0)
+    matrix = np.full((n_rows, len(columns)), np.nan)
+    for j, col in enumerate(columns):
+        matrix[:len(col), j] = col.to_numpy(dtype=float, na_value=np.nan)
+    return matrix
+
+
+# ✅ NaN 마스크 기반 Pearson 행렬 (컬럼쌍마다 둘 다 값이 있는 행만 사용 = Series.corr 와 동일)
+def pearson_matrix(matrix, min_periods=2):
+    present = ~np.isnan(matrix)
+    weights = present.astype(float)
+
+    # 컬럼 평균으로 중심화 → 상관계수는 그대로, 큰 값에서의 수치 오차만 줄어듦
+    counts = weights.sum(axis=0)
+    means = np.divide(np.where(present, matrix, 0.0).sum(axis=0), counts,
+                      out=np.zeros(matrix.shape[1]), where=counts > 0)
+    centered = np.where(present, matrix - means, 0.0)
+
+    n = weights.T @ weights                  # 쌍별 공통 관측 수
+    sx = centered.T @ weights                # sx[i, j] = j 가 존재하는 행에서의 x_i 합
+    sxx = (centered * centered).T @ weights
+    sxy = centered.T @ centered
+    return pearson_from_sums(n, sx, sxx, sxy, min_periods)
+
+
+# ✅ 누적 합계(n, Σx, Σx², Σxy)로 Pearson 행렬 계산 (스트리밍 누적값도 그대로 사용 가능)
+def pearson_from_sums(n, sx, sxx, sxy, min_periods=2):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx ** 2 / n
+        corr = cov / np.sqrt(var * var.T)
+
+    corr[n < min_periods] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+# ✅ 모든 파일의 수치형 컬럼을 한 번에 비교 → internal / cross 결과 dict 생성
+def numeric_correlation_results(entries, threshold, candidates=None):
+    """
+    entries: (파일 경로, pd.Series) 목록. 파일 순서 → 컬럼 순서대로 정렬되어 있어야
+    기존 작업 순서(file1 < file2, col1 < col2)와 같은 방향의 결과가 나온다.
+    candidates: (i < j) 불리언 행렬 (표본 선별 결과) → 후보 쌍에 등장하는 컬럼만 전체 행으로 계산
+    """
+    if len(entries) < 2:
+        return
+
+    if candidates is None:
+        corr = pearson_matrix(build_numeric_matrix([col for _, col in entries]))
+    else:
+        involved = np.flatnonzero(candidates.any(axis=0) | candidates.any(axis=1))
+        corr = np.full((len(entries), len(entries)), np.nan)
+        if len(involved):
+            sub = pearson_matrix(build_numeric_matrix([entries[i][1] for i in involved]))
+            corr[np.ix_(involved, involved)] = sub
+        corr[~(candidates | candidates.T)] = np.nan
+
+    yield from matrix_results(entries, corr, threshold, "Pearson")
+
+
+# ✅ 쌍별 점수 행렬 → |점수| 가 임계값 이상인 (i < j) 쌍의 internal / cross 결과 dict
+def matrix_results(entries, scores, threshold, method):
+    with np.errstate(invalid="ignore"):
+        hits = np.triu(np.abs(scores) >= threshold, k=1)
+
+    for i, j in zip(*np.nonzero(hits)):
+        path1, col1 = entries[i]
+        path2, col2 = entries[j]
+
+        # 완전히 같은 컬럼은 의미 없는 쌍 (is_valid_pair 와 동일한 기준)
+        if col1.equals(col2):
+            continue
+
+        score = float(scores[i, j])
+        if path1 == path2:
+            yield {
+                "type": "internal",
+                "file": path1,
+                "col1": col1.name,
+                "col2": col2.name,
+                "score": score,
+                "method": method
+            }
+        else:
+            yield {
+                "type": "cross",
+                "file1": path1,
+                "file2": path2,
+                "col1": col1.name,
+                "col2": col2.name,
+                "score": score,
+                "method": method
+            }
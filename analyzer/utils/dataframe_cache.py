@@ -0,0 +1,175 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from .metrics import increment, stage
+
+try:
+    import pyarrow  # noqa: F401  (feather 저장용, 없으면 pickle 로 대체)
+    DISK_FORMAT = "feather"
+except ImportError:
+    DISK_FORMAT = "pickle"
+
+# ✅ 프로세스 전역 캐시 설정 (app.py 에서 configure_cache 로 변경)
+CACHE_CONFIG = {
+    "max_bytes": 512 * 1024 * 1024,  # 메모리 계층 최대 크기 (DataFrame 실제 메모리 기준)
+    "disk_dir": None                 # 지정 시 파싱 결과를 바이너리로 저장하는 디스크 계층 사용
+}
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # key → (DataFrame, nbytes), 가장 최근 사용이 뒤쪽
+_total_bytes = 0
+_hash_memo = {}            # (절대경로, mtime_ns, size) → 내용 해시
+_key_locks = {}            # 같은 파일을 동시에 두 번 파싱하지 않도록 키별 잠금
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+
+def configure_cache(max_bytes=None, disk_dir=None):
+    if max_bytes is not None:
+        CACHE_CONFIG["max_bytes"] = max_bytes
+    if disk_dir is not None:
+        os.makedirs(disk_dir, exist_ok=True)
+        CACHE_CONFIG["disk_dir"] = disk_dir
+
+
+# ✅ 파일 내용 해시 (같은 파일·같은 수정시각이면 다시 읽지 않음)
+def file_content_hash(path):
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _hash_memo[memo_key] = digest
+    return digest
+
+
+# 내용 해시를 이미 알고 있는 파일 (업로드 저장소가 기록하면서 계산) → 다시 읽지 않도록 등록
+def remember_content_hash(path, digest):
+    stat = os.stat(path)
+    _hash_memo[(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)] = digest
+
+
+def _cache_key(path, options):
+    option_text = ",".join(f"{k}={options[k]}" for k in sorted(options))
+    return file_content_hash(path), hashlib.sha1(option_text.encode("utf-8")).hexdigest()[:12]
+
+
+def _frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+# ✅ 메모리 계층 저장 + 용량 초과 시 오래된 항목부터 제거 (LRU)
+def _remember(key, df):
+    global _total_bytes
+    nbytes = _frame_nbytes(df)
+    if nbytes > CACHE_CONFIG["max_bytes"]:
+        return
+
+    with _lock:
+        if key in _entries:
+            _total_bytes -= _entries.pop(key)[1]
+        _entries[key] = (df, nbytes)
+        _total_bytes += nbytes
+        while _total_bytes > CACHE_CONFIG["max_bytes"] and _entries:
+            _, (_, evicted) = _entries.popitem(last=False)
+            _total_bytes -= evicted
+            _stats["evictions"] += 1
+
+
+def _disk_path(key):
+    ext = ".feather" if DISK_FORMAT == "feather" else ".pkl"
+    return os.path.join(CACHE_CONFIG["disk_dir"], f"{key[0]}-{key[1]}{ext}")
+
+
+def _load_from_disk(key):
+    if not CACHE_CONFIG["disk_dir"]:
+        return None
+    path = _disk_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        if DISK_FORMAT == "feather":
+            return pd.read_feather(path)
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"⚠️ 디스크 캐시 읽기 실패: {path} → {e}")
+        return None
+
+
+def _save_to_disk(key, df):
+    if not CACHE_CONFIG["disk_dir"]:
+        return
+    path = _disk_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if DISK_FORMAT == "feather":
+            df.to_feather(tmp_path)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # feather 는 문자열 컬럼명만 허용 → 저장 불가한 프레임은 메모리 계층만 사용
+        print(f"⚠️ 디스크 캐시 저장 생략: {path} → {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# ✅ 캐시된 DataFrame 반환 (메모리 → 디스크 → loader 순서)
+def cached_read(path, loader, **options):
+    """
+    호출자는 얕은 사본을 받음 (값 버퍼는 캐시와 공유 → 읽을 때마다 데이터를 복제하지 않음)
+    컬럼 이름 변경 / 컬럼 통째 교체(df[col] = ...) / dropna 등 새 프레임을 만드는 연산은 안전하지만
+    값을 제자리에서 바꾸는 연산(inplace=True, df.loc[...] = ..., .to_numpy() 배열 수정)은 캐시를 오염시키므로 금지
+    """
+    key = _cache_key(path, options)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            key_lock = _key_locks.setdefault(key, threading.Lock())
+    if entry is not None:
+        return entry[0].copy(deep=False)
+
+    with key_lock:
+        with _lock:
+            entry = _entries.get(key)
+        if entry is not None:
+            _stats["hits"] += 1
+            return entry[0].copy(deep=False)
+
+        df = _load_from_disk(key)
+        if df is not None:
+            _stats["disk_hits"] += 1
+        else:
+            _stats["misses"] += 1
+            with stage("read_file", reader=options.get("reader", "")):
+                df = loader()
+            increment("analyzer_rows_parsed_total", len(df), reader=options.get("reader", ""))
+            _save_to_disk(key, df)
+
+        _remember(key, df)
+
+    with _lock:
+        _key_locks.pop(key, None)
+    return df.copy(deep=False)
+
+
+def clear_cache():
+    global _total_bytes
+    with _lock:
+        _entries.clear()
+        _total_bytes = 0
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_entries), bytes=_total_bytes,
+                    max_bytes=CACHE_CONFIG["max_bytes"], disk_dir=CACHE_CONFIG["disk_dir"])
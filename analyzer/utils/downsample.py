@@ -0,0 +1,67 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+# ✅ Largest-Triangle-Three-Buckets: 버킷마다 (이전 선택점, 다음 버킷 평균)과 이루는 삼각형이 가장 큰 점 선택
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 첫 / 마지막 점은 고정, 나머지 n-2 개를 n_out-2 개 버킷으로 분할
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    starts, ends = edges[:-1], edges[1:]
+
+    # 다음 버킷 평균을 한 번에 계산 (마지막 버킷의 "다음"은 마지막 점)
+    sums_x = np.add.reduceat(x[:n - 1], starts)
+    sums_y = np.add.reduceat(y[:n - 1], starts)
+    sizes = ends - starts
+    avg_x = np.append(sums_x[1:] / sizes[1:], x[n - 1])
+    avg_y = np.append(sums_y[1:] / sizes[1:], y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# ✅ 최소/최대 버킷팅: 버킷마다 최솟값 / 최댓값 위치를 보존 (스파이크가 사라지지 않음)
+def minmax_indices(y, n_out):
+    n = len(y)
+    buckets = max(1, (n_out - 2) // 2)  # 첫 / 마지막 점 포함해 n_out 이하
+    if n <= n_out or buckets >= n:
+        return np.arange(n)
+
+    ids = np.arange(n) * buckets // n
+    starts = np.flatnonzero(np.diff(ids, prepend=-1))
+    selected = [np.array([0, n - 1])]
+    for values in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        hits = np.flatnonzero(y == values[ids])
+        _, first = np.unique(ids[hits], return_index=True)
+        selected.append(hits[first])
+    return np.unique(np.concatenate(selected))
+
+
+# ✅ 점 예산(max_points)에 맞는 행 위치 반환 (NaN 은 선택 대상에서 제외)
+def downsample_indices(x, y, max_points, method="lttb"):
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"지원하지 않는 다운샘플링 방식: {method} (가능: {', '.join(DOWNSAMPLE_METHODS)})")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.flatnonzero(~np.isnan(y))
+    if len(finite) <= max_points:
+        return finite
+
+    if method == "minmax":
+        picked = minmax_indices(y[finite], max_points)
+    else:
+        picked = lttb_indices(x[finite], y[finite], max_points)
+    return finite[picked]
@@ -0,0 +1,79 @@
+import re
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+HEADER_PATTERN = re.compile("date|날짜|시간|일시|측정일")
+DATE_KEYWORDS = ("date", "time", "날짜", "일시", "측정일")
+
+
+# ✅ 셀 값 변환 (pandas openpyxl 엔진과 동일: 빈 칸 → "", 오류 셀 → NaN, 정수로 떨어지는 실수 → int)
+def _convert_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float("nan")
+    return value
+
+
+# ✅ 첫 번째 시트를 한 번만 순회해 행 목록으로 적재 (read_only 스트리밍, 셀 객체 대신 값만 읽음)
+def read_sheet_rows(path):
+    book = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = book.worksheets[0]
+        sheet.reset_dimensions()  # 잘못 기록된 시트 크기 정보 무시
+
+        rows = []
+        last_row_with_data = -1
+        for values in sheet.iter_rows(values_only=True):
+            row = [_convert_value(v) for v in values]
+            while row and row[-1] == "":
+                row.pop()
+            if row:
+                last_row_with_data = len(rows)
+            rows.append(row)
+    finally:
+        book.close()
+
+    # 뒤쪽 빈 행 제거 + 가장 넓은 행 기준으로 빈 칸 채우기
+    rows = rows[:last_row_with_data + 1]
+    if rows:
+        width = max(len(row) for row in rows)
+        for row in rows:
+            row.extend([""] * (width - len(row)))
+    return rows
+
+
+# ✅ 적재된 앞부분 행에서 '날짜', '시간', '측정일시' 등의 키워드가 있는 행을 헤더로 추정
+def detect_header_row(rows, max_rows=15):
+    for i, row in enumerate(rows[:max_rows]):
+        if any(HEADER_PATTERN.search(str(v).lower()) for v in row):
+            return i
+    return 0  # 찾지 못하면 첫 번째 행을 기본 헤더로 사용
+
+
+def _parse(rows, **options):
+    # pandas.read_excel 과 같은 파서 옵션 → 컬럼명 중복 처리 / dtype 추론 결과 동일
+    return TextParser(rows, skip_blank_lines=False, **options).read()
+
+
+# ✅ 엑셀 읽기: 통합문서 1회 로드 → 헤더 행 / 날짜 컬럼 감지 → 타입 지정 DataFrame
+def read_excel_fast(path, max_header_rows=15):
+    rows = read_sheet_rows(path)
+    if not rows:
+        return pd.DataFrame()
+
+    header_row = detect_header_row(rows, max_header_rows)
+    print(f"📌 [엑셀] 헤더 자동 감지 결과: {header_row}행")
+
+    try:
+        # 날짜 컬럼 추정은 헤더 + 첫 데이터 행만 사용 (이미 적재된 행 재사용)
+        names = _parse(rows[:header_row + 2], header=header_row, nrows=1).columns
+        date_cols = [col for col in names if any(kw in str(col).lower() for kw in DATE_KEYWORDS)]
+        return _parse(rows, header=header_row, parse_dates=date_cols)
+    except EmptyDataError:
+        return pd.DataFrame()
@@ -0,0 +1,149 @@
+import os
+import math
+import tempfile
+import multiprocessing
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from .statistical import cramers_v_codes, eta_squared_codes
+
+EXECUTOR_BACKENDS = ("thread", "process", "serial")
+
+# process 백엔드의 작업자 시작 방식: 요청 스레드가 여러 개인 서버에서 fork 하면 잠금 상태까지 복제되므로
+# 가능하면 forkserver (깨끗한 단일 스레드 서버 프로세스에서 fork), 없으면 spawn
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# forkserver 에 한 번만 미리 올려 둘 모듈 (작업자마다 pandas / scipy / 작업 모듈을 다시 import 하지 않도록)
+# 작업자에서 메인 모듈을 다시 import 해도 이 모듈들은 이미 올라와 있어 비용이 거의 없음
+PROCESS_PRELOAD = ["numpy", "pandas", "utils.executor_backend", "utils.timeseries_parallel"]
+
+# 작업자 프로세스별로 열어 둔 memmap 배열 캐시 (청크마다 다시 열지 않도록)
+_ATTACHED = {}
+
+
+# utils 패키지가 있는 디렉터리 (forkserver 서버는 부모의 sys.path 를 쓰지 않으므로 PYTHONPATH 로 전달)
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ✅ 작업자 프로세스용 multiprocessing 컨텍스트 (process 백엔드 / 시계열 파일별 작업자 공용)
+def process_context():
+    context = multiprocessing.get_context(PROCESS_START_METHOD)
+    if PROCESS_START_METHOD == "forkserver":
+        paths = [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p]
+        if _PACKAGE_ROOT not in paths:
+            os.environ["PYTHONPATH"] = os.pathsep.join([_PACKAGE_ROOT] + paths)
+        context.set_forkserver_preload(PROCESS_PRELOAD)
+    return context
+
+
+# ✅ 공유 버퍼 위치 결정 (/dev/shm 이 있으면 메모리 기반 파일시스템 사용)
+def _shared_dir():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+# ✅ 컬럼 배열들을 하나의 memmap 파일로 적재 → 작업자는 (경로, 레이아웃)만 전달받음
+def publish_arrays(arrays, directory):
+    layout = []
+    offset = 0
+    for arr in arrays:
+        layout.append((offset, len(arr), arr.dtype.str))
+        offset += arr.nbytes
+
+    path = os.path.join(directory, "columns.bin")
+    buffer = np.memmap(path, dtype=np.uint8, mode="w+", shape=(max(offset, 1),))
+    for (start, _, _), arr in zip(layout, arrays):
+        buffer[start:start + arr.nbytes] = arr.view(np.uint8)
+    buffer.flush()
+    del buffer
+    return ("memmap", path, layout)
+
+
+# ✅ 작업자 쪽: 공유 버퍼를 zero-copy 로 열어 컬럼 배열 목록으로 복원
+def resolve_arrays(source):
+    if source[0] == "local":
+        return source[1]
+
+    _, path, layout = source
+    if path not in _ATTACHED:
+        _ATTACHED.clear()
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        _ATTACHED[path] = [
+            np.frombuffer(buffer, dtype=np.dtype(dtype), count=length, offset=start)
+            for start, length, dtype in layout
+        ]
+    return _ATTACHED[path]
+
+
+# ✅ 단일 작업 점수 계산 (Cramér's V / Eta Squared, 공유 배열 위에서 바로 정수 코드 커널 실행)
+def score_task(arrays, task):
+    if task["method"] == "Cramér's V":
+        return cramers_v_codes(arrays[task["ref1"]], arrays[task["ref2"]])
+    return eta_squared_codes(arrays[task["ref1"]], arrays[task["ref2"]])
+
+
+# ✅ 작업 묶음(청크) 실행 → threshold 를 넘는 결과 dict 목록 반환
+def run_chunk(source, chunk, threshold):
+    arrays = resolve_arrays(source)
+    results = []
+    for task in chunk:
+        try:
+            score = score_task(arrays, task)
+        except Exception as e:
+            print(f"❌ 분석 실패: {task['col1']} vs {task['col2']} → {e}")
+            continue
+
+        if score is None or not abs(score) >= threshold:
+            continue
+
+        result = {"type": task["type"]}
+        if task["type"] == "internal":
+            result["file"] = task["file1"]
+        else:
+            result["file1"] = task["file1"]
+            result["file2"] = task["file2"]
+        result.update({
+            "col1": task["col1"],
+            "col2": task["col2"],
+            "score": float(score),
+            "method": task["method"]
+        })
+        if "key" in task:
+            result["key"] = task["key"]
+        results.append(result)
+    return results
+
+
+# ✅ 작업 목록을 청크 단위로 나누기 (작업자당 여러 청크 → 부하 분산)
+def chunk_tasks(tasks, max_workers, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = max(1, min(256, math.ceil(len(tasks) / (max_workers * 4))))
+    return [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+
+# ✅ 백엔드별 실행 (청크가 끝날 때마다 (처리한 작업 수, 결과 목록) 반환)
+def execute_chunks(arrays, tasks, threshold, backend="thread", max_workers=2, chunk_size=None):
+    if backend not in EXECUTOR_BACKENDS:
+        raise ValueError(f"지원하지 않는 실행 백엔드: {backend} (가능: {', '.join(EXECUTOR_BACKENDS)})")
+
+    chunks = chunk_tasks(tasks, max_workers, chunk_size)
+
+    if backend == "serial":
+        source = ("local", arrays)
+        for chunk in chunks:
+            yield len(chunk), run_chunk(source, chunk, threshold)
+        return
+
+    if backend == "thread":
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            source = ("local", arrays)
+            futures = {executor.submit(run_chunk, source, chunk, threshold): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        return
+
+    # process: 컬럼 데이터는 memmap 공유 버퍼로 한 번만 기록, 작업에는 컬럼 번호만 담김
+    with tempfile.TemporaryDirectory(prefix="analyzer-", dir=_shared_dir()) as directory:
+        source = publish_arrays(arrays, directory)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=process_context()) as executor:
+            futures = {executor.submit(run_chunk, source, chunk, threshold): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
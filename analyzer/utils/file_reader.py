@@ -0,0 +1,49 @@
+import os
+import pandas as pd
+from .excel_reader import read_excel_fast
+from .dataframe_cache import CACHE_CONFIG, cached_read, configure_cache
+from .columnar_store import STORE_CONFIG, configure_store, open_columnar
+
+
+# ✅ 업로드된 파일을 Pandas DataFrame으로 읽기 (CSV / XLSX 지원, 내용 해시 기준 캐시)
+def read_uploaded_file(path):
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        df = open_columnar(path)  # 업로드 시 변환된 컬럼형 저장소가 있으면 memmap 으로 바로 열기
+        if df is not None:
+            return df
+
+        if ext == ".csv":
+            return cached_read(path, lambda: pd.read_csv(path, encoding='utf-8'),
+                               reader="csv", encoding="utf-8")
+
+        elif ext == ".xlsx":
+            return cached_read(path, lambda: read_excel_fast(path),
+                               reader="xlsx", header="auto", parse_dates="auto")
+
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
+
+    except Exception as e:
+        print(f"❌ 파일 읽기 실패: {path} → {e}")
+        return pd.DataFrame()
+
+
+# ✅ 작업자 프로세스로 넘기는 읽기 함수 (피클 가능)
+class UploadReader:
+    """
+    forkserver / spawn 작업자는 부모의 configure_* 상태를 물려받지 않으므로
+    만든 시점의 컬럼형 저장소 / 디스크 캐시 위치를 함께 넘겨 부모와 같은 계층에서 읽는다.
+    """
+    __slots__ = ("store_dir", "cache_dir")
+
+    def __init__(self):
+        self.store_dir = STORE_CONFIG["store_dir"]
+        self.cache_dir = CACHE_CONFIG["disk_dir"]
+
+    def __call__(self, path):
+        if self.store_dir and STORE_CONFIG["store_dir"] is None:
+            configure_store(self.store_dir)
+        if self.cache_dir and CACHE_CONFIG["disk_dir"] is None:
+            configure_cache(disk_dir=self.cache_dir)
+        return read_uploaded_file(path)
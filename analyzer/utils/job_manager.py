@@ -0,0 +1,129 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ 작업 관리 설정 (app.py 에서 configure_jobs 로 지정)
+JOB_CONFIG = {"max_workers": 2, "max_finished": 50}
+
+_jobs = {}
+_lock = threading.Lock()
+_executor = None
+
+
+def configure_jobs(max_workers=None, max_finished=None):
+    global _executor
+    if max_workers is not None:
+        JOB_CONFIG["max_workers"] = max_workers
+    if max_finished is not None:
+        JOB_CONFIG["max_finished"] = max_finished
+    _executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_CONFIG["max_workers"], thread_name_prefix="analysis-job")
+    return _executor
+
+
+# ✅ 분석 작업 상태 (결과는 나오는 즉시 누적 → 상태 조회 / 스트리밍이 같은 목록을 읽음)
+class AnalysisJob:
+    __slots__ = ("id", "status", "completed", "total", "results", "error",
+                 "created_at", "finished_at", "condition")
+
+    def __init__(self, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.status = "queued"       # queued | running | done | failed
+        self.completed = 0           # 처리 완료한 컬럼쌍 수
+        self.total = None            # 전체 컬럼쌍 수 (쌍 생성 전에는 None)
+        self.results = []
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.condition = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def start(self):
+        with self.condition:
+            self.status = "running"
+            self.condition.notify_all()
+
+    def update_progress(self, completed, total):
+        with self.condition:
+            self.completed = completed
+            self.total = total
+            self.condition.notify_all()
+
+    def add_result(self, result):
+        with self.condition:
+            self.results.append(result)
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.status = "failed" if error else "done"
+            self.error = error
+            self.finished_at = time.time()
+            self.condition.notify_all()
+
+    # offset 이후 결과가 생기거나 진행 / 상태가 바뀔 때까지 대기 → (새 결과 목록, (완료 수, 전체 수, 상태))
+    def wait_for(self, offset, progress, timeout=15.0):
+        with self.condition:
+            self.condition.wait_for(
+                lambda: len(self.results) > offset or self.finished or
+                        (self.completed, self.total, self.status) != progress,
+                timeout=timeout
+            )
+            return self.results[offset:], (self.completed, self.total, self.status)
+
+    def snapshot(self):
+        with self.condition:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "completed": self.completed,
+                "total": self.total,
+                "matches": len(self.results),
+                "error": self.error,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at
+            }
+
+
+def _run(job, generate):
+    job.start()
+    try:
+        for result in generate(job.update_progress):
+            job.add_result(result)
+    except Exception as e:
+        print(f"❌ 분석 작업 실패 ({job.id}): {e}")
+        job.finish(error=str(e))
+        return
+    job.finish()
+    print(f"✅ 분석 작업 완료 ({job.id}): {len(job.results)}개 결과")
+
+
+# 완료된 작업이 max_finished 를 넘으면 오래된 것부터 정리
+def _prune():
+    finished = sorted((j for j in _jobs.values() if j.finished), key=lambda j: j.finished_at)
+    for job in finished[:max(0, len(finished) - JOB_CONFIG["max_finished"])]:
+        del _jobs[job.id]
+
+
+# ✅ 작업 등록: generate(on_progress) 는 결과 dict 를 yield 하는 제너레이터 함수
+def submit_job(generate, job_id=None):
+    job = AnalysisJob(job_id)
+    with _lock:
+        _prune()
+        _jobs[job.id] = job
+    _get_executor().submit(_run, job, generate)
+    return job
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
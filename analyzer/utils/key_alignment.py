@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from .correlation_detect import is_categorical
+
+JOIN_MODES = ("position", "key")
+
+# ✅ 키 컬럼 자동 감지 기준 (파일마다 값이 거의 고유한 범주형 컬럼 + 두 파일 간 값이 충분히 겹침)
+KEY_CONFIG = {
+    "min_unique_ratio": 0.9,   # 결측 제외 고유값 비율 (지역명 / 코드처럼 행마다 다른 값)
+    "min_overlap": 0.5,        # 공통 키 수 / 두 파일 중 작은 쪽 키 수
+    "min_matches": 2           # 공통 키가 이보다 적으면 정렬 의미 없음
+}
+
+
+def configure_keys(min_unique_ratio=None, min_overlap=None, min_matches=None):
+    if min_unique_ratio is not None:
+        KEY_CONFIG["min_unique_ratio"] = min_unique_ratio
+    if min_overlap is not None:
+        KEY_CONFIG["min_overlap"] = min_overlap
+    if min_matches is not None:
+        KEY_CONFIG["min_matches"] = min_matches
+
+
+# 키 값 정규화 (문자열 + 앞뒤 공백 제거, 결측 제외) → 원래 행 위치는 유지
+def _normalized_keys(series):
+    present = series.notna().to_numpy()
+    keys = series[present].astype(str).str.strip()
+    return keys.to_numpy(dtype=object), np.flatnonzero(present)
+
+
+# ✅ 파일 1개의 키 해시 색인 (정규화된 키 → 첫 등장 행 위치, 중복 키는 첫 행만 사용)
+class KeyIndex:
+    __slots__ = ("column", "keys", "positions")
+
+    def __init__(self, column, keys, positions):
+        self.column = column
+        self.keys = keys              # pd.Index (해시 테이블 조회)
+        self.positions = positions    # keys[i] 의 원본 행 위치
+
+    @classmethod
+    def build(cls, series):
+        keys, positions = _normalized_keys(series)
+        first = ~pd.Index(keys).duplicated(keep="first")
+        return cls(series.name, pd.Index(keys[first]), positions[first])
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def key_candidates(columns):
+    """columns: pd.Series 목록 → 키로 쓸 수 있는 (고유값 비율이 높은 범주형) 컬럼만"""
+    candidates = []
+    for col in columns:
+        if pd.api.types.is_bool_dtype(col) or not is_categorical(col):
+            continue
+        present = int(col.notna().sum())
+        if present < KEY_CONFIG["min_matches"]:
+            continue
+        if col.nunique(dropna=True) / present >= KEY_CONFIG["min_unique_ratio"]:
+            candidates.append(col)
+    return candidates
+
+
+# 파일 1개의 키 후보 색인 목록 (파일마다 한 번만 만들어 여러 파일 쌍에서 재사용)
+def key_indexes(columns):
+    return [KeyIndex.build(col) for col in key_candidates(columns)]
+
+
+# ✅ 두 파일의 키 색인 목록 → 가장 잘 맞는 (KeyIndex, KeyIndex) 또는 None
+def detect_join_key(indexes1, indexes2):
+    """
+    후보 컬럼 쌍마다 공통 키 비율을 비교해 가장 잘 맞는 쌍 선택
+    (비율 → 공통 키 수 → 컬럼명 일치 순으로 우선)
+    """
+    best, best_rank = None, None
+    for index1 in indexes1:
+        for index2 in indexes2:
+            matches = int(index1.keys.isin(index2.keys).sum())
+            smaller = min(len(index1), len(index2))
+            if matches < KEY_CONFIG["min_matches"] or matches / smaller < KEY_CONFIG["min_overlap"]:
+                continue
+            rank = (matches / smaller, matches, index1.column == index2.column)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = (index1, index2), rank
+    return best
+
+
+# ✅ 두 키 색인 → 같은 키를 가진 행 위치 쌍 (파일 1 의 키 순서, 해시 조회 1회)
+def align_on_key(index1, index2):
+    found = index2.keys.get_indexer(index1.keys)
+    matched = found >= 0
+    return index1.positions[matched], index2.positions[found[matched]]
+
+
+# 정렬된 행 위치로 한 번에 모으기 (dtype 유지, 0..n-1 인덱스 → 이후 비교는 같은 키끼리)
+def gather(series, positions):
+    return series.iloc[positions].reset_index(drop=True)
+
+
+# ✅ 결과의 key (키 컬럼 쌍) → 두 값 컬럼을 같은 키 행끼리 정렬 (산점도가 점수를 낸 행과 같은 행을 쓰도록)
+def align_series_on_key(series1, keys1, series2, keys2):
+    pos1, pos2 = align_on_key(KeyIndex.build(keys1), KeyIndex.build(keys2))
+    return gather(series1, pos1), gather(series2, pos2)
+
+
+# ✅ DataFrame 쌍 → 키 기준으로 정렬된 DataFrame 쌍 (키 컬럼 제외) / 키를 찾지 못하면 None
+def align_frames(df1, df2):
+    key = detect_join_key(key_indexes([df1[c] for c in df1.columns]), key_indexes([df2[c] for c in df2.columns]))
+    if key is None:
+        return None
+    index1, index2 = key
+    pos1, pos2 = align_on_key(index1, index2)
+    aligned1 = df1.drop(columns=[index1.column]).iloc[pos1].reset_index(drop=True)
+    aligned2 = df2.drop(columns=[index2.column]).iloc[pos2].reset_index(drop=True)
+    return aligned1, aligned2, (index1.column, index2.column)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from .correlation_matrix import build_numeric_matrix, pearson_matrix, matrix_results
+from .metrics import stage
+
+# ✅ 수치형 쌍 추가 측도 (Pearson 외에 요청한 것만 계산) → 결과 dict 의 method 값
+MEASURES = {
+    "spearman": "Spearman",               # 순위 기반 단조 관계
+    "mutual_info": "Mutual Information"   # 구간화 상호정보량 기반 비선형 관계
+}
+MEASURE_METHODS = frozenset(MEASURES.values())
+
+MEASURE_CONFIG = {
+    "mi_bins": 16,      # 상호정보량 분위수 구간 수 (고유값이 이보다 적으면 값 자체를 구간으로 사용)
+    "min_periods": 2
+}
+
+
+def configure_measures(mi_bins=None):
+    if mi_bins is not None:
+        MEASURE_CONFIG["mi_bins"] = mi_bins
+
+
+# ✅ 측도 목록 검증 ("spearman,mutual_info" 문자열 또는 목록 → 튜플, 모르는 이름은 ValueError)
+def parse_measures(measures):
+    if not measures:
+        return ()
+    if isinstance(measures, str):
+        measures = [m.strip() for m in measures.split(",") if m.strip()]
+    unknown = [m for m in measures if m not in MEASURES]
+    if unknown:
+        raise ValueError(f"지원하지 않는 측도: {', '.join(unknown)} (가능: {', '.join(MEASURES)})")
+    return tuple(dict.fromkeys(measures))
+
+
+# ✅ 컬럼별 순위 (평균 순위, 결측 유지) → 컬럼마다 한 번만 정렬하고 모든 쌍에서 재사용
+def rank_matrix(matrix):
+    return pd.DataFrame(matrix).rank(method="average").to_numpy()
+
+
+# ✅ Spearman 행렬 = 순위 행렬의 Pearson 행렬
+def spearman_matrix(matrix):
+    """
+    결측이 없으면 Series.corr(method="spearman") 과 같은 값.
+    결측 위치가 컬럼마다 다르면 순위는 컬럼 전체 기준이라 쌍별로 다시 순위를 매기는 방식과 약간 다를 수 있음
+    """
+    return pearson_matrix(rank_matrix(matrix), MEASURE_CONFIG["min_periods"])
+
+
+# ✅ 컬럼별 구간 코드 (-1 = 결측) + 구간 수 → 컬럼마다 한 번만 이산화
+def discretize_matrix(matrix, bins):
+    codes = np.full(matrix.shape, -1, dtype=np.int64)
+    sizes = np.zeros(matrix.shape[1], dtype=np.int64)
+    for j in range(matrix.shape[1]):
+        values = matrix[:, j]
+        present = ~np.isnan(values)
+        if not present.any():
+            continue
+        observed = values[present]
+        uniques = np.unique(observed)
+        if len(uniques) > bins:
+            edges = np.quantile(observed, np.linspace(0, 1, bins + 1)[1:-1])
+            observed = np.searchsorted(edges, observed, side="right")
+            uniques = np.unique(observed)  # 동점이 많으면 빈 구간이 생기므로 관측된 구간만 다시 번호
+        codes[present, j] = np.searchsorted(uniques, observed)
+        sizes[j] = len(uniques)
+    return codes, sizes
+
+
+# 구간 코드 쌍 → 결합 히스토그램(bincount) → Miller-Madow 보정 상호정보량(nat)
+def _mutual_info(x, y, size_y, complete=False):
+    if not complete:
+        mask = (x >= 0) & (y >= 0)
+        x, y = x[mask], y[mask]
+    n = len(x)
+    if n < MEASURE_CONFIG["min_periods"]:
+        return np.nan
+    joint = np.bincount(x * size_y + y).astype(float)
+    joint = np.pad(joint, (0, (-len(joint)) % size_y)).reshape(-1, size_y)
+    px, py = joint.sum(axis=1), joint.sum(axis=0)
+    rows, cols = np.nonzero(joint)
+    counts = joint[rows, cols]
+    mi = float(np.sum(counts / n * np.log(counts * n / (px[rows] * py[cols]))))
+    # 구간화 추정량의 양의 편향 보정 (사용된 칸 수 기준)
+    mi -= (len(counts) - np.count_nonzero(px) - np.count_nonzero(py) + 1) / (2 * n)
+    return max(mi, 0.0)
+
+
+# ✅ 상호정보량 행렬 → 정보 상관계수 sqrt(1 - exp(-2·MI)) (0~1, 정규분포이면 |Pearson r| 과 같은 척도)
+def mutual_info_matrix(matrix):
+    codes, sizes = discretize_matrix(matrix, MEASURE_CONFIG["mi_bins"])
+    codes = np.asfortranarray(codes)   # 컬럼 단위 연속 메모리
+    complete = (codes >= 0).all(axis=0)  # 결측 없는 컬럼끼리는 마스크 생략
+    n_cols = matrix.shape[1]
+    scores = np.full((n_cols, n_cols), np.nan)
+    for i in range(n_cols):
+        for j in range(i + 1, n_cols):
+            if sizes[i] < 2 or sizes[j] < 2:
+                continue
+            mi = _mutual_info(codes[:, i], codes[:, j], sizes[j], complete[i] and complete[j])
+            scores[i, j] = scores[j, i] = np.sqrt(1 - np.exp(-2 * mi))
+    return scores
+
+
+MEASURE_MATRICES = {
+    "spearman": spearman_matrix,
+    "mutual_info": mutual_info_matrix
+}
+
+
+# ✅ 수치형 컬럼 전체 → 요청한 측도별 internal / cross 결과 dict (숫자 행렬은 한 번만 만들어 측도끼리 공유)
+def measure_results(entries, threshold, measures):
+    """entries: numeric_correlation_results 와 같은 (파일 경로, pd.Series) 목록"""
+    if len(entries) < 2 or not measures:
+        return
+    matrix = build_numeric_matrix([col for _, col in entries])
+    for name in measures:
+        with stage("measure", measure=name):
+            scores = MEASURE_MATRICES[name](matrix)
+        yield from matrix_results(entries, scores, threshold, MEASURES[name])
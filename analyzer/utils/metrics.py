@@ -0,0 +1,155 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# ✅ 계측 설정 (app.py 에서 configure_metrics 로 변경)
+METRICS_CONFIG = {
+    # 지연 시간 히스토그램 구간 상한(초)
+    "buckets": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+    "debug_logging": False   # True 이면 날짜 컬럼 상태 점검 등 행 단위 진단 출력 (핫 경로 비용 있음)
+}
+
+# 지표 이름 → (종류, 설명)  /metrics 의 HELP / TYPE 줄
+METRIC_DEFINITIONS = {
+    "analyzer_request_seconds": ("histogram", "라우트별 요청 처리 시간(초)"),
+    "analyzer_response_bytes_total": ("counter", "라우트별 직렬화된 응답 바이트 수 (스트리밍 응답 제외)"),
+    "analyzer_stage_seconds": ("histogram", "분석 단계별 소요 시간(초)"),
+    "analyzer_rows_parsed_total": ("counter", "파일 파싱으로 읽은 행 수"),
+    "analyzer_columns_profiled_total": ("counter", "프로파일링한 컬럼 수"),
+    "analyzer_pairs_total": ("counter", "계산한 컬럼 쌍 수"),
+    "analyzer_pairs_reported_total": ("counter", "임계값을 넘어 보고된 컬럼 쌍 수 (방식별)"),
+    "analyzer_pairs_filtered_total": ("counter", "임계값 미달 / 계산 불가로 걸러진 컬럼 쌍 수"),
+    "analyzer_pairs_screened_total": ("counter", "표본 선별 단계에서 전체 계산 없이 제외된 컬럼 쌍 수"),
+    "analyzer_datetime_parse_total": ("counter", "날짜 컬럼 파싱 횟수 (포맷 / 감지 경로별)"),
+    "analyzer_uploads_total": ("counter", "업로드 파일 수 (새로 저장 / 같은 내용 재사용)"),
+    "analyzer_results_reused_total": ("counter", "같은 입력의 이전 분석 결과를 재사용한 요청 수"),
+}
+
+_lock = threading.Lock()
+_counters = {}      # (이름, 라벨 튜플) → 값
+_histograms = {}    # (이름, 라벨 튜플) → [구간별 개수 목록, 합계, 개수]
+_collectors = []    # 렌더링 시점에 (이름, 종류, 설명, [(라벨 dict, 값)]) 목록을 돌려주는 함수
+
+
+def configure_metrics(buckets=None, debug_logging=None):
+    if buckets is not None:
+        METRICS_CONFIG["buckets"] = tuple(sorted(buckets))
+    if debug_logging is not None:
+        METRICS_CONFIG["debug_logging"] = debug_logging
+
+
+def debug_logging():
+    return METRICS_CONFIG["debug_logging"]
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def increment(name, value=1, **labels):
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    key = (name, _label_key(labels))
+    buckets = METRICS_CONFIG["buckets"]
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * len(buckets), 0.0, 0]
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+
+# ✅ 단계 타이머: with stage("parse", reader="csv"): ... → analyzer_stage_seconds 히스토그램에 기록
+@contextmanager
+def stage(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("analyzer_stage_seconds", time.perf_counter() - started, stage=name, **labels)
+
+
+# 캐시 통계처럼 다른 모듈이 이미 들고 있는 값은 렌더링 시점에 읽어 오도록 등록
+def register_collector(collector):
+    with _lock:
+        _collectors.append(collector)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        if abs(value) == float("inf"):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+# ✅ Prometheus 텍스트 형식(0.0.4) 렌더링
+def render_prometheus():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(entry[0]), entry[1], entry[2]) for key, entry in _histograms.items()}
+        collectors = list(_collectors)
+    buckets = METRICS_CONFIG["buckets"]
+
+    grouped = {}
+    for (name, labels), value in counters.items():
+        grouped.setdefault(name, []).append((labels, value))
+    for (name, labels), value in histograms.items():
+        grouped.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(grouped):
+        kind, help_text = METRIC_DEFINITIONS.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(grouped[name]):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(float(total))}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    for collector in collectors:
+        try:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_number(value)}")
+        except Exception as e:
+            print(f"⚠️ [metrics] 수집기 실패: {e}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
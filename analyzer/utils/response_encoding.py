@@ -0,0 +1,119 @@
+import math
+import struct
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # 선택 의존성: NumPy 배열을 파이썬 float 로 바꾸지 않고 바로 직렬화 (없으면 표준 json)
+except ImportError:
+    orjson = None
+
+JSON_MIMETYPE = "application/json"
+COLUMNAR_MIMETYPE = "application/vnd.analyzer.columnar"
+
+# ✅ 컬럼형 바이너리 응답 형식
+# [매직 4B "ACB1"][헤더 길이 uint32 LE][헤더 JSON (UTF-8, 8바이트 경계까지 공백)][버퍼들 (각각 8바이트 경계)]
+# 헤더 = {"data": 응답 본문 (수치 배열 자리는 {"$buffer": 번호}), "buffers": [{dtype, shape, offset, length}]}
+# offset 은 버퍼 영역 시작 기준 → 클라이언트는 Float64Array(body, start + offset, length / 8) 처럼 복사 없이 사용
+COLUMNAR_MAGIC = b"ACB1"
+ALIGNMENT = 8
+
+
+def _padding(size):
+    return b"\0" * (-size % ALIGNMENT)
+
+
+# ✅ JSON 으로 바꿀 수 없는 값 처리 (NumPy 배열 / 스칼라, NaN·inf 는 null) → 나머지는 Flask 기본 규칙
+def to_builtin(obj):
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            values = obj.astype(object)
+            values[~np.isfinite(obj)] = None
+            return values.tolist()
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    return DefaultJSONProvider.default(obj)
+
+
+# ✅ NumPy 인식 JSON 공급자 (app.json) → jsonify 가 배열을 그대로 받음
+class NumpyJSONProvider(DefaultJSONProvider):
+    """
+    orjson 이 있으면 수치 배열을 C 수준에서 바로 직렬화 (파이썬 float 박싱 없음, NaN → null)
+    orjson 이 없거나 다루지 못하는 값(숫자가 아닌 dict 키 조합 등)이면 표준 json + to_builtin
+    """
+    default = staticmethod(to_builtin)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs.keys() - {"ensure_ascii", "sort_keys", "separators", "indent"}:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=to_builtin, option=option).decode("utf-8")
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+
+# ✅ Accept 헤더 기준 응답 형식 결정 (*/* 나 JSON 이 같은 우선순위면 JSON)
+def wants_columnar(accept_mimetypes):
+    return accept_mimetypes.best_match([JSON_MIMETYPE, COLUMNAR_MIMETYPE]) == COLUMNAR_MIMETYPE
+
+
+# ✅ 응답 본문 → 컬럼형 바이너리 (수치 배열은 리틀 엔디언 원본 버퍼 그대로, 나머지는 헤더 JSON)
+def encode_columnar(payload, dumps):
+    buffers = []
+
+    def extract(obj):
+        if isinstance(obj, np.ndarray) and obj.dtype.kind in "fiub":
+            dtype = np.uint8 if obj.dtype.kind == "b" else obj.dtype.newbyteorder("<")
+            buffers.append(np.ascontiguousarray(obj, dtype=dtype))
+            return {"$buffer": len(buffers) - 1}
+        if isinstance(obj, dict):
+            return {key: extract(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [extract(value) for value in obj]
+        return obj
+
+    data = extract(payload)
+    layout, offset = [], 0
+    for array in buffers:
+        layout.append({"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset, "length": array.nbytes})
+        offset += array.nbytes + len(_padding(array.nbytes))
+
+    header = dumps({"data": data, "buffers": layout}).encode("utf-8")
+    header += b" " * (-(len(COLUMNAR_MAGIC) + 4 + len(header)) % ALIGNMENT)
+
+    parts = [COLUMNAR_MAGIC, struct.pack("<I", len(header)), header]
+    for array in buffers:
+        parts.append(array.tobytes())
+        parts.append(_padding(array.nbytes))
+    return b"".join(parts)
+
+
+# ✅ 컬럼형 바이너리 → 응답 본문 (배열은 버퍼를 가리키는 ndarray, 파이썬 클라이언트 / 검증용)
+def decode_columnar(body, loads):
+    if body[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+        raise ValueError("컬럼형 응답 형식이 아닙니다.")
+    start = len(COLUMNAR_MAGIC) + 4
+    (header_length,) = struct.unpack("<I", body[len(COLUMNAR_MAGIC):start])
+    header = loads(body[start:start + header_length])
+    base = start + header_length
+    arrays = [np.frombuffer(body, dtype=np.dtype(b["dtype"]), count=b["length"] // np.dtype(b["dtype"]).itemsize,
+                            offset=base + b["offset"]).reshape(b["shape"])
+              for b in header["buffers"]]
+
+    def restore(obj):
+        if isinstance(obj, dict):
+            if obj.keys() == {"$buffer"}:
+                return arrays[obj["$buffer"]]
+            return {key: restore(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [restore(value) for value in obj]
+        return obj
+
+    return restore(header["data"])
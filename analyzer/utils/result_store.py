@@ -0,0 +1,237 @@
+import os
+import json
+import uuid
+import heapq
+import shutil
+import hashlib
+import numpy as np
+
+# ✅ 작업별 결과 저장소 설정 (app.py 에서 configure_results 로 지정)
+RESULT_CONFIG = {"store_dir": None, "top_k": 50, "max_stores": 50}
+
+# 결과 1건당 고정 크기 색인 레코드 (|score| 내림차순으로 정렬해 저장)
+INDEX_DTYPE = np.dtype([
+    ("score", np.float64),     # |score|
+    ("offset", np.int64),      # results.jsonl 내 바이트 위치
+    ("length", np.int32),
+    ("method", np.int16),      # meta["methods"] 번호
+    ("file1", np.int32),       # meta["files"] 번호 (internal 이면 file1 == file2)
+    ("file2", np.int32),
+    ("col1", np.int32),        # meta["columns"] 번호
+    ("col2", np.int32)
+])
+
+
+def configure_results(store_dir, top_k=None, max_stores=None):
+    os.makedirs(store_dir, exist_ok=True)
+    RESULT_CONFIG["store_dir"] = store_dir
+    if top_k is not None:
+        RESULT_CONFIG["top_k"] = top_k
+    if max_stores is not None:
+        RESULT_CONFIG["max_stores"] = max_stores
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def _store_path(job_id):
+    # job_id 는 uuid hex 만 허용 (경로 조작 방지)
+    if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+        return None
+    return os.path.join(RESULT_CONFIG["store_dir"], job_id)
+
+
+# 오래된 결과 저장소 정리 (완료된 저장소가 max_stores 를 넘으면 오래된 것부터 삭제)
+def _prune_stores():
+    root = RESULT_CONFIG["store_dir"]
+    stores = [os.path.join(root, d) for d in os.listdir(root) if os.path.exists(os.path.join(root, d, "meta.json"))]
+    stores.sort(key=os.path.getmtime)
+    for path in stores[:max(0, len(stores) - RESULT_CONFIG["max_stores"])]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class _Dictionary:
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# ✅ 결과 기록기: 생성 시점에 JSONL 추가 + 상위 K 힙 유지 + 색인 레코드 누적
+class ResultWriter:
+    __slots__ = ("job_id", "directory", "handle", "offset", "records", "heap", "methods", "files", "columns", "count")
+
+    def __init__(self, job_id=None):
+        self.job_id = job_id or new_job_id()
+        self.directory = _store_path(self.job_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self.handle = open(os.path.join(self.directory, "results.jsonl"), "wb")
+        self.offset = 0
+        self.records = []
+        self.heap = []            # (|score|, 순번, 결과) 최소 힙 → 항상 상위 K 개만 보관
+        self.methods = _Dictionary()
+        self.files = _Dictionary()
+        self.columns = _Dictionary()
+        self.count = 0
+
+    @property
+    def result_file(self):
+        return os.path.join(self.directory, "results.jsonl")
+
+    def add(self, result):
+        line = (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8")
+        self.handle.write(line)
+
+        score = abs(result.get("score", 0))
+        file1 = result.get("file", result.get("file1"))
+        file2 = result.get("file", result.get("file2"))
+        self.records.append((
+            score, self.offset, len(line),
+            self.methods.code(result.get("method")),
+            self.files.code(os.path.basename(file1)), self.files.code(os.path.basename(file2)),
+            self.columns.code(str(result.get("col1"))), self.columns.code(str(result.get("col2")))
+        ))
+        self.offset += len(line)
+
+        entry = (score, self.count, result)
+        if len(self.heap) < RESULT_CONFIG["top_k"]:
+            heapq.heappush(self.heap, entry)
+        elif score > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+        self.count += 1
+
+    def top(self, k=None):
+        # 동점은 먼저 나온 결과 우선 (기존 안정 정렬과 같은 순서)
+        ordered = sorted(self.heap, key=lambda e: (-e[0], e[1]))
+        return [e[2] for e in ordered[:k]]
+
+    # 색인을 |score| 내림차순으로 저장 + 메타데이터(사전, 상위 K) 기록 → 조회 시 정렬 불필요
+    def close(self):
+        self.handle.close()
+        index = np.array(self.records, dtype=INDEX_DTYPE)
+        order = np.lexsort((np.arange(len(index)), -index["score"]))
+        np.save(os.path.join(self.directory, "index.npy"), index[order])
+
+        meta = {
+            "job_id": self.job_id,
+            "matches": self.count,
+            "methods": self.methods.values,
+            "files": self.files.values,
+            "columns": self.columns.values,
+            "top": self.top()
+        }
+        with open(os.path.join(self.directory, "meta.tmp"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(os.path.join(self.directory, "meta.tmp"), os.path.join(self.directory, "meta.json"))
+        mark_latest(self.job_id)
+        _prune_stores()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.handle.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+        return False
+
+
+def job_result_file(job_id):
+    return os.path.join(_store_path(job_id), "results.jsonl")
+
+
+def mark_latest(job_id):
+    with open(os.path.join(RESULT_CONFIG["store_dir"], "latest"), "w") as f:
+        f.write(job_id)
+
+
+# ✅ 같은 입력(파일 내용 해시 + 분석 옵션)의 이전 결과 재사용 → 키 해시 파일에 job_id 기록
+def analysis_key(*parts):
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _key_path(key):
+    return os.path.join(RESULT_CONFIG["store_dir"], "keys", key)
+
+
+def remember_job(key, job_id):
+    os.makedirs(os.path.dirname(_key_path(key)), exist_ok=True)
+    with open(_key_path(key), "w") as f:
+        f.write(job_id)
+
+
+# 기록된 작업의 저장소가 정리(_prune_stores)되었으면 None
+def find_job(key):
+    path = _key_path(key)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        job_id = f.read().strip()
+    return job_id if load_meta(job_id) is not None else None
+
+
+def latest_job_id():
+    path = os.path.join(RESULT_CONFIG["store_dir"], "latest")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip()
+
+
+def load_meta(job_id):
+    directory = _store_path(job_id)
+    if directory is None or not os.path.exists(os.path.join(directory, "meta.json")):
+        return None
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ✅ 색인 기반 조회: 필터는 정수 코드 비교, 페이지에 해당하는 줄만 파일에서 직접 읽음
+def query_results(job_id, offset=0, limit=50, method=None, file=None, column=None, min_score=None):
+    meta = load_meta(job_id)
+    if meta is None:
+        return None
+
+    # 필터 없는 첫 페이지는 저장된 상위 K 로 바로 응답
+    if not any([method, file, column, min_score]) and offset + limit <= len(meta["top"]):
+        return {"results": meta["top"][offset:offset + limit], "matches": meta["matches"], "total": meta["matches"]}
+
+    directory = _store_path(job_id)
+    index = np.load(os.path.join(directory, "index.npy"), mmap_mode="r")
+    mask = np.ones(len(index), dtype=bool)
+
+    def code_of(values, value):
+        return values.index(value) if value in values else -1
+
+    if method:
+        mask &= index["method"] == code_of(meta["methods"], method)
+    if file:
+        code = code_of(meta["files"], os.path.basename(file))
+        mask &= (index["file1"] == code) | (index["file2"] == code)
+    if column:
+        code = code_of(meta["columns"], column)
+        mask &= (index["col1"] == code) | (index["col2"] == code)
+    if min_score is not None:
+        mask &= index["score"] >= min_score
+
+    selected = np.flatnonzero(mask)
+    page = index[selected[offset:offset + limit]]
+
+    results = []
+    with open(os.path.join(directory, "results.jsonl"), "rb") as f:
+        for record in page:
+            f.seek(int(record["offset"]))
+            results.append(json.loads(f.read(int(record["length"]))))
+
+    return {"results": results, "matches": meta["matches"], "total": int(len(selected))}
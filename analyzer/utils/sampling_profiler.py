@@ -0,0 +1,89 @@
+import sys
+import time
+import threading
+from collections import Counter, OrderedDict
+
+# ✅ 요청 단위 샘플링 프로파일러 설정 (최근 결과만 메모리에 보관)
+PROFILER_CONFIG = {"interval": 0.005, "max_profiles": 20, "max_depth": 64}
+
+_lock = threading.Lock()
+_profiles = OrderedDict()   # 프로파일 ID → SamplingProfiler, 가장 최근이 뒤쪽
+
+
+def configure_profiler(interval=None, max_profiles=None):
+    if interval is not None:
+        PROFILER_CONFIG["interval"] = interval
+    if max_profiles is not None:
+        PROFILER_CONFIG["max_profiles"] = max_profiles
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+
+
+# ✅ 대상 스레드의 호출 스택을 interval 초마다 채집 (계측 코드 삽입 없음 → 부하는 샘플링 스레드 1개)
+class SamplingProfiler:
+    __slots__ = ("thread_id", "interval", "stacks", "samples", "started_at", "elapsed", "_stop", "_thread")
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval or PROFILER_CONFIG["interval"]
+        self.stacks = Counter()   # "바깥;...;안쪽" 접힌 스택 → 샘플 수
+        self.samples = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        max_depth = PROFILER_CONFIG["max_depth"]
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < max_depth:
+                names.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+        return self
+
+    # 함수별 자체(self) / 누적(total) 샘플 상위 n 개
+    def top(self, n=20):
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+        return [{"function": name, "self": count, "total": total[name]} for name, count in own.most_common(n)]
+
+    # flamegraph.pl / speedscope 에서 바로 열 수 있는 접힌 스택 텍스트
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+def store_profile(profile_id, profiler):
+    with _lock:
+        _profiles[profile_id] = profiler
+        while len(_profiles) > PROFILER_CONFIG["max_profiles"]:
+            _profiles.popitem(last=False)
+
+
+def get_profile(profile_id):
+    with _lock:
+        return _profiles.get(profile_id)
@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+SAMPLING_METHODS = ("random", "stratified")
+
+# ✅ 쌍 단위 산점도 캐시 (키: 파일 해시 / 컬럼 / 점 예산 / 표본 방식 → 표본 좌표)
+SCATTER_CONFIG = {"max_entries": 512, "seed": 0}
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+def configure_scatter(max_entries=None, seed=None):
+    if max_entries is not None:
+        SCATTER_CONFIG["max_entries"] = max_entries
+    if seed is not None:
+        SCATTER_CONFIG["seed"] = seed
+
+
+# ✅ 행 위치 기준 정렬 (두 값이 모두 있는 행만, 파일이 다르면 짧은 쪽 길이까지 = Pearson 행렬과 같은 기준)
+def aligned_pairs(series1, series2):
+    length = min(len(series1), len(series2))
+    x = series1.to_numpy(dtype=float, na_value=np.nan)[:length]
+    y = series2.to_numpy(dtype=float, na_value=np.nan)[:length]
+    present = ~(np.isnan(x) | np.isnan(y))
+    return x[present], y[present]
+
+
+# ✅ 점 예산 이하로 표본 추출 (random: 무작위 비복원, stratified: x 정렬 순서에서 등간격 → 꼬리 구간 보존)
+def sample_positions(x, max_points, method="random", seed=0):
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    if method == "stratified":
+        order = np.argsort(x, kind="stable")
+        return np.sort(order[np.linspace(0, n - 1, max_points).round().astype(np.int64)])
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n, size=max_points, replace=False))
+
+
+def scatter_points(series1, series2, max_points=2000, method="random", cache_key=None):
+    """
+    반환: {"x", "y", "total" (정렬된 유효 쌍 수), "sampled"} / 수치형이 아니면 빈 좌표
+    cache_key 가 주어지면 같은 쌍·같은 예산 요청은 다시 계산하지 않음
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"지원하지 않는 표본 방식: {method} (가능: {', '.join(SAMPLING_METHODS)})")
+
+    key = None if cache_key is None else (cache_key, max_points, method)
+    if key is not None:
+        with _lock:
+            cached = _entries.get(key)
+            if cached is not None:
+                _entries.move_to_end(key)
+                return cached
+
+    if not pd.api.types.is_numeric_dtype(series1) or not pd.api.types.is_numeric_dtype(series2):
+        result = {"x": [], "y": [], "total": 0, "sampled": False}
+    else:
+        x, y = aligned_pairs(series1, series2)
+        positions = sample_positions(x, max_points, method, seed=SCATTER_CONFIG["seed"])
+        result = {
+            "x": x[positions],
+            "y": y[positions],
+            "total": int(len(x)),
+            "sampled": len(positions) < len(x)
+        }
+
+    if key is not None:
+        with _lock:
+            _entries[key] = result
+            while len(_entries) > SCATTER_CONFIG["max_entries"]:
+                _entries.popitem(last=False)
+    return result
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from .correlation_matrix import build_numeric_matrix, pearson_matrix
+from .statistical import contingency_codes, chi2_table, anova_codes
+from .correlation_detect import correlation_method
+
+# ✅ 2단계 선별 설정 (표본에서 점수 상한을 구해 임계값에 못 미치는 쌍은 전체 계산 생략)
+SCREENING_CONFIG = {
+    "sample_size": 20_000,    # 고정 크기 행 표본 (모든 컬럼이 같은 행 위치를 공유)
+    "min_rows": 200_000,      # 이 행 수 이하이면 선별 없이 바로 전체 계산
+    "confidence": 0.999,      # 상한 신뢰수준 (높을수록 보수적 = 후보가 많이 남음)
+    "min_sample": 30,         # 표본 유효 관측이 이보다 적은 쌍은 선별하지 않고 후보로 유지
+    "seed": 0
+}
+
+
+def configure_screening(sample_size=None, min_rows=None, confidence=None, seed=None):
+    if sample_size is not None:
+        SCREENING_CONFIG["sample_size"] = sample_size
+    if min_rows is not None:
+        SCREENING_CONFIG["min_rows"] = min_rows
+    if confidence is not None:
+        SCREENING_CONFIG["confidence"] = confidence
+    if seed is not None:
+        SCREENING_CONFIG["seed"] = seed
+
+
+# ✅ 표본 행 위치 (정렬된 비복원 추출) / 행 수가 min_rows 이하이면 None = 선별 안 함
+def screening_positions(n_rows):
+    if n_rows <= max(SCREENING_CONFIG["min_rows"], SCREENING_CONFIG["sample_size"]):
+        return None
+    rng = np.random.default_rng(SCREENING_CONFIG["seed"])
+    return np.sort(rng.choice(n_rows, size=SCREENING_CONFIG["sample_size"], replace=False))
+
+
+def _z(two_sided=False):
+    alpha = 1 - SCREENING_CONFIG["confidence"]
+    return float(norm.ppf(1 - alpha / 2 if two_sided else 1 - alpha))
+
+
+# 길이 length 인 배열에서 쓸 수 있는 표본 위치 + 전체/표본 행 비율 (짧은 파일과의 교차 쌍은 앞부분만 비교)
+def _positions_within(positions, length):
+    within = positions[:np.searchsorted(positions, length)]
+    scale = length / len(within) if len(within) else np.inf
+    return within, scale
+
+
+# ✅ Pearson |r| 상한: Fisher z 변환 신뢰구간 (표본 크기에 대한 식이므로 전체 행 수와 무관)
+def pearson_upper(r, n):
+    r = np.clip(np.asarray(r, dtype=float), -1 + 1e-12, 1 - 1e-12)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = _z(two_sided=True) / np.sqrt(n - 3)
+        z = np.arctanh(r)
+        upper = np.maximum(np.abs(np.tanh(z - margin)), np.abs(np.tanh(z + margin)))
+    # 관측이 적거나 상관계수가 정의되지 않는 쌍은 상한 1 (= 반드시 정확 계산)
+    return np.where((n >= SCREENING_CONFIG["min_sample"]) & ~np.isnan(upper), upper, 1.0)
+
+
+# 비중심 카이제곱 근사: 표본 χ² → 비중심도 λ 의 상한 (분산 ≈ 2(df + 2λ), λ 자리에 χ² 를 넣어 보수적으로)
+def _noncentrality_upper(chi2, df):
+    return max(chi2 - df, 0.0) + _z() * np.sqrt(2 * (df + 2 * chi2))
+
+
+# ✅ Cramér's V 상한 (표본 분할표 → 전체 행 수로 확장한 χ² 상한)
+def cramers_v_upper(codes_x, codes_y, scale, full_categories):
+    """
+    scale: 전체 행 수 / 표본 행 수, full_categories: 전체 데이터의 (행 범주 수, 열 범주 수)
+    φ² = λ / n 은 표본 크기와 무관 → V² ≈ (λ·scale + df_전체) / (n·scale·m)
+    m 은 표본 범주 기준(작을수록 V 가 커짐), 자유도 편향 항은 전체 범주 기준 → 둘 다 보수적
+    """
+    table = contingency_codes(codes_x, codes_y)
+    if table is None:
+        return 1.0  # 표본에서 계산 불가 (범주 1개 등) → 판단하지 않고 정확 계산
+    rows, cols, counts, r, k = table
+    chi2, n = chi2_table(rows, cols, counts, r, k)
+    if n < SCREENING_CONFIG["min_sample"]:
+        return 1.0
+
+    df_full = (max(full_categories[0], r) - 1) * (max(full_categories[1], k) - 1)
+    lam = _noncentrality_upper(chi2, (r - 1) * (k - 1)) * scale
+    return float(np.sqrt(min(1.0, (lam + df_full) / (n * scale * (min(r, k) - 1)))))
+
+
+# ✅ Eta Squared 점수 상한 (점수 = F / (F + 전체 길이 - 그룹 수) → F 에 대해 증가 함수)
+def eta_squared_upper(values, codes, scale, total_length):
+    anova = anova_codes(values, codes)
+    if anova is None:
+        return 1.0
+    f_stat, groups, n = anova
+    if n < SCREENING_CONFIG["min_sample"] or not np.isfinite(f_stat):
+        return 1.0
+
+    # (g-1)·F ≈ 비중심 χ²(g-1, λ), 전체 데이터의 λ 는 행 수에 비례
+    df = groups - 1
+    lam = _noncentrality_upper(df * f_stat, df) * scale
+    f_upper = 1 + lam / df
+    return float(f_upper / (f_upper + (total_length - groups)))
+
+
+# ✅ 수치형 컬럼 전체 → 정확 계산이 필요한 쌍 (i < j) 불리언 행렬
+def screen_numeric(columns, positions, threshold):
+    # 모든 컬럼이 같은 표본 위치를 쓰므로 표본 행렬의 i 번째 행 = 원본 positions[i] 행 (짧은 컬럼은 NaN 패딩)
+    sample = build_numeric_matrix([col.iloc[_positions_within(positions, len(col))[0]] for col in columns])
+    weights = (~np.isnan(sample)).astype(float)
+    upper = pearson_upper(pearson_matrix(sample), weights.T @ weights)
+    return np.triu(upper >= threshold, k=1)
+
+
+# ✅ 범주형이 포함된 작업 → 상한이 임계값 이상인 작업만 남김
+def screen_tasks(arrays, tasks, positions, threshold):
+    category_counts = {}   # 배열 번호 → 전체 범주 수 (코드 최댓값 + 1, 배열당 한 번만 계산)
+
+    def categories(ref):
+        if ref not in category_counts:
+            codes = arrays[ref]
+            category_counts[ref] = int(codes.max()) + 1 if len(codes) else 0
+        return category_counts[ref]
+
+    survivors = []
+    for task in tasks:
+        x, y = arrays[task["ref1"]], arrays[task["ref2"]]
+        within, scale = _positions_within(positions, min(len(x), len(y)))
+        if not len(within):
+            survivors.append(task)
+            continue
+
+        if task["method"] == "Cramér's V":
+            upper = cramers_v_upper(x[within], y[within], scale,
+                                    (categories(task["ref1"]), categories(task["ref2"])))
+        else:
+            upper = eta_squared_upper(x[within], y[within], scale, len(x))
+
+        if upper >= threshold:
+            survivors.append(task)
+    return survivors
+
+
+# ✅ Series 쌍 상한 (analysis_runner 용, 표본 Series 는 결측 제거 후 인덱스 기준 정렬 = detect_correlation 과 동일)
+def series_upper(method, series1, series2, profile1, profile2, scale):
+    if method == "Pearson":
+        x, y = series1.align(series2, join="inner")
+        x, y = x.to_numpy(dtype=float, na_value=np.nan), y.to_numpy(dtype=float, na_value=np.nan)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) < SCREENING_CONFIG["min_sample"]:
+            return 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.corrcoef(x, y)[0, 1]
+        return float(pearson_upper(r, len(x)))
+
+    if method == "Cramér's V":
+        x, y = series1.align(series2, join="inner")
+        return cramers_v_upper(pd.factorize(x)[0], pd.factorize(y)[0], scale,
+                               (profile1.unique_count, profile2.unique_count))
+
+    # Eta Squared: detect_correlation 과 같은 방향 (수치형, 범주형)
+    if profile1.is_numeric and profile2.is_categorical:
+        numeric, categorical, total_length = series1, series2, profile1.length
+    else:
+        numeric, categorical, total_length = series2, series1, profile2.length
+    numeric, categorical = numeric.align(categorical, join="inner")
+    return eta_squared_upper(numeric.to_numpy(dtype=float, na_value=np.nan), pd.factorize(categorical)[0],
+                             scale, total_length)
+
+
+# ✅ DataFrame 쌍 → 컬럼 쌍 선별 함수 (keep(col1, col2) 가 False 면 전체 계산 생략) / 행 수가 적으면 None
+def pair_screener(df1, df2, prepared1, prepared2, threshold):
+    positions = screening_positions(max(len(df1), len(df2)))
+    if positions is None:
+        return None
+
+    sample1 = df1.iloc[_positions_within(positions, len(df1))[0]]
+    sample2 = sample1 if df2 is df1 else df2.iloc[_positions_within(positions, len(df2))[0]]
+    _, scale = _positions_within(positions, min(len(df1), len(df2)))
+
+    def keep(col1, col2):
+        (_, profile1), (_, profile2) = prepared1[col1], prepared2[col2]
+        method = correlation_method(profile1.is_numeric, profile1.is_categorical,
+                                    profile2.is_numeric, profile2.is_categorical)
+        if method is None or not (profile1.is_valid() and profile2.is_valid()):
+            return True  # 분석 대상이 아닌 쌍은 detect_correlation 이 바로 걸러냄
+        upper = series_upper(method, sample1[col1].dropna(), sample2[col2].dropna(), profile1, profile2, scale)
+        return upper >= threshold
+
+    return keep
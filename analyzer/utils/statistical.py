@@ -22,3 +22,150 @@ def eta_squared(numeric, categorical):
         return anova.statistic / (anova.statistic + (len(numeric) - len(groups)))
     except Exception:
         return 0.0  # 에러 시 0.0 반환
+
+# 📌 정수 코드 기반 커널 (factorize 코드, -1 = 결측 / 두 배열은 같은 행 위치끼리 비교)
+# - 분할표는 결합 코드의 bincount, ANOVA 는 그룹별 bincount 가중합 → 한 번의 O(n) 패스
+
+# 관측된 코드만 0..k-1 로 다시 번호 매기기 (빈 행/열 제거 = crosstab 과 동일)
+def _compact_codes(codes):
+    present = np.bincount(codes) > 0
+    remap = np.cumsum(present) - 1
+    return remap[codes], int(present.sum())
+
+
+# 📌 범주형 vs 범주형: Cramér's V (chi2_contingency 와 같은 결과, 2x2 는 Yates 보정 포함)
+def cramers_v_codes(codes_x, codes_y, dense_limit=4_000_000):
+    table = contingency_codes(codes_x, codes_y, dense_limit)
+    if table is None:
+        return None
+    return cramers_v_table(*table)
+
+
+# 📌 두 코드 배열 → 희소 분할표 (행 코드, 열 코드, 빈도, r, k) / 유효 관측이 없거나 한쪽 범주가 1개면 None
+def contingency_codes(codes_x, codes_y, dense_limit=4_000_000):
+    n = min(len(codes_x), len(codes_y))
+    x, y = codes_x[:n], codes_y[:n]
+    mask = (x >= 0) & (y >= 0)
+    x, y = x[mask], y[mask]
+    if len(x) == 0:
+        return None
+
+    x, r = _compact_codes(x)
+    y, k = _compact_codes(y)
+    if min(k, r) <= 1:
+        return None
+
+    combined = x.astype(np.int64) * k + y
+    if r * k <= dense_limit:
+        counts = np.bincount(combined, minlength=r * k)
+        cells = np.flatnonzero(counts)
+        counts = counts[cells]
+    else:
+        cells, counts = np.unique(combined, return_counts=True)
+    rows, cols = np.divmod(cells, k)
+    return rows, cols, counts, r, k
+
+
+# 📌 0 이 아닌 칸 목록 (행 코드, 열 코드, 빈도)으로 Cramér's V 계산 (스트리밍 누적 분할표용)
+def cramers_v_cells(rows, cols, counts):
+    if len(counts) == 0:
+        return None
+    row_values, rows = np.unique(rows, return_inverse=True)
+    col_values, cols = np.unique(cols, return_inverse=True)
+    r, k = len(row_values), len(col_values)
+    if min(k, r) <= 1:
+        return None
+    return cramers_v_table(rows, cols, counts, r, k)
+
+
+# 📌 희소 분할표 → Cramér's V (rows / cols 는 0..r-1, 0..k-1 로 압축된 코드)
+def cramers_v_table(rows, cols, counts, r, k):
+    chi2, n = chi2_table(rows, cols, counts, r, k)
+    return float(np.sqrt(chi2 / (n * (min(k, r) - 1))))
+
+
+# 📌 희소 분할표 → (χ², 관측 수)
+def chi2_table(rows, cols, counts, r, k):
+    counts = np.asarray(counts, dtype=float)
+    n = counts.sum()
+    row_sums = np.bincount(rows, weights=counts, minlength=r)
+    col_sums = np.bincount(cols, weights=counts, minlength=k)
+
+    if r == 2 and k == 2:
+        # 자유도 1 → scipy 기본값과 같은 Yates 연속성 보정
+        observed = np.zeros((2, 2))
+        observed[rows, cols] = counts
+        expected = np.outer(row_sums, col_sums) / n
+        diff = expected - observed
+        corrected = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        chi2 = ((corrected - expected) ** 2 / expected).sum()
+    else:
+        # χ² = n · Σ O² / (행합 · 열합) − n → 0 이 아닌 칸만 있으면 계산 가능 (희소 분할표)
+        chi2 = n * (counts ** 2 / (row_sums[rows] * col_sums[cols])).sum() - n
+        chi2 = max(chi2, 0.0)
+
+    return chi2, n
+
+
+# 📌 수치형 vs 범주형: Eta Squared (f_oneway 기반 결과와 동일, 2개 미만 관측 그룹은 제외)
+def eta_squared_codes(values, codes, total_length=None):
+    # total_length: 기존 공식의 len(numeric) 항 (결측 포함 전체 길이, 기본값 = values 길이)
+    if total_length is None:
+        total_length = len(values)
+    anova = anova_codes(values, codes)
+    if anova is None:
+        return None
+    f_stat, groups, _ = anova
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(f_stat / (f_stat + (total_length - groups)))
+
+
+# 📌 일원분산분석 F 통계량 → (F, 그룹 수, 관측 수) / 2개 이상 관측된 그룹이 2개 미만이면 None
+def anova_codes(values, codes):
+    n = min(len(values), len(codes))
+    v, c = values[:n], codes[:n]
+    mask = (c >= 0) & ~np.isnan(v)
+    v, c = v[mask], c[mask]
+    if len(v) == 0:
+        return None
+
+    group_sizes = np.bincount(c)
+    keep = group_sizes >= 2
+    groups = int(keep.sum())
+    if groups < 2:
+        return None
+
+    selected = keep[c]
+    v, c = v[selected], c[selected]
+    sizes = group_sizes[keep].astype(float)
+    c, _ = _compact_codes(c)
+
+    total = len(v)
+    means = np.bincount(c, weights=v) / sizes
+    grand_mean = v.mean()
+    ss_between = (sizes * (means - grand_mean) ** 2).sum()
+    ss_within = ((v - means[c]) ** 2).sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat = (ss_between / (groups - 1)) / (ss_within / (total - groups))
+    return f_stat, groups, total
+
+
+# 📌 그룹별 (개수, 합, 제곱합) 누적값으로 Eta Squared 계산 (스트리밍 ANOVA 용)
+def eta_squared_groups(counts, sums, sumsq, total_length):
+    counts = np.asarray(counts, dtype=float)
+    keep = counts >= 2
+    groups = int(keep.sum())
+    if groups < 2:
+        return None
+
+    counts, sums, sumsq = counts[keep], np.asarray(sums)[keep], np.asarray(sumsq)[keep]
+    total = counts.sum()
+    means = sums / counts
+    grand_mean = sums.sum() / total
+    ss_between = (counts * (means - grand_mean) ** 2).sum()
+    ss_within = max((sumsq - counts * means ** 2).sum(), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat = (ss_between / (groups - 1)) / (ss_within / (total - groups))
+        return float(f_stat / (f_stat + (total_length - groups)))
@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+from itertools import zip_longest
+from .correlation_detect import correlation_method
+from .correlation_matrix import pearson_from_sums
+from .statistical import cramers_v_cells, eta_squared_groups
+
+
+# ✅ 스트리밍 컬럼 상태 (청크를 지나며 유효성 / 중복 판별용 값만 누적)
+class StreamColumn:
+    __slots__ = ("path", "name", "kind", "rows", "nulls", "first_value", "varied",
+                 "dictionary", "overflow", "shift", "hash_sum")
+
+    def __init__(self, path, name, kind):
+        self.path = path
+        self.name = name
+        self.kind = kind            # "numeric" | "categorical" | "bool" | "other"
+        self.rows = 0
+        self.nulls = 0
+        self.first_value = None     # 수치형 고유값 2개 이상 여부만 추적
+        self.varied = False
+        self.dictionary = {}        # 범주형 값 → 전역 코드
+        self.overflow = False       # 고유값이 max_categories 를 넘으면 범주형 누적 중단
+        self.shift = None           # 첫 청크 평균 (합계 누적 시 수치 오차 방지용 이동값)
+        self.hash_sum = 0
+
+    @property
+    def is_numeric(self):
+        return self.kind in ("numeric", "bool")
+
+    @property
+    def is_categorical(self):
+        return self.kind in ("categorical", "bool")
+
+    @property
+    def unique_count(self):
+        if self.is_categorical:
+            return len(self.dictionary)
+        return 2 if self.varied else (1 if self.first_value is not None else 0)
+
+    # is_valid_column 과 같은 기준 (null 비율 < 0.9, 고유값 2개 이상)
+    def is_valid(self, min_unique=2, max_null_ratio=0.9):
+        if self.rows == 0:
+            return False
+        return self.nulls / self.rows < max_null_ratio and (self.overflow or self.unique_count >= min_unique)
+
+
+def _stream_kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    if pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return "categorical"
+    return "other"
+
+
+# ✅ 청크 값 → 전역 코드 (고유값만 파이썬에서 매핑, 행 단위 작업은 numpy)
+def _encode_chunk(state, series, max_categories):
+    local_codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapping = np.empty(len(uniques), dtype=np.int64)
+    for i, value in enumerate(uniques):
+        code = state.dictionary.get(value)
+        if code is None:
+            code = len(state.dictionary)
+            state.dictionary[value] = code
+        mapping[i] = code
+    if len(state.dictionary) > max_categories:
+        state.overflow = True
+    codes = np.full(len(series), -1, dtype=np.int64)
+    present = local_codes >= 0
+    codes[present] = mapping[local_codes[present]]
+    return codes
+
+
+# ✅ 범주형 쌍의 누적 분할표 (0 이 아닌 칸만 보관 → 메모리는 칸 수에 비례)
+class ContingencyCounter:
+    __slots__ = ("keys", "counts")
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def add(self, codes_x, codes_y):
+        mask = (codes_x >= 0) & (codes_y >= 0)
+        if not mask.any():
+            return
+        combined = (codes_x[mask] << 32) | codes_y[mask]
+        keys = np.concatenate([self.keys, combined])
+        weights = np.concatenate([self.counts, np.ones(mask.sum(), dtype=np.int64)])
+        self.keys, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=weights).astype(np.int64)
+
+    def score(self):
+        return cramers_v_cells(self.keys >> 32, self.keys & 0xFFFFFFFF, self.counts)
+
+
+# ✅ 수치형 × 범주형 쌍의 그룹별 (개수, 합, 제곱합) 누적 → 스트리밍 ANOVA
+class GroupMoments:
+    __slots__ = ("counts", "sums", "sumsq")
+
+    def __init__(self):
+        self.counts = np.zeros(0)
+        self.sums = np.zeros(0)
+        self.sumsq = np.zeros(0)
+
+    def add(self, values, codes):
+        mask = (codes >= 0) & ~np.isnan(values)
+        if not mask.any():
+            return
+        v, c = values[mask], codes[mask]
+        size = max(len(self.counts), int(c.max()) + 1)
+        self.counts = np.bincount(c, minlength=size) + np.pad(self.counts, (0, size - len(self.counts)))
+        self.sums = np.bincount(c, weights=v, minlength=size) + np.pad(self.sums, (0, size - len(self.sums)))
+        self.sumsq = np.bincount(c, weights=v * v, minlength=size) + np.pad(self.sumsq, (0, size - len(self.sumsq)))
+
+    def score(self, total_length):
+        return eta_squared_groups(self.counts, self.sums, self.sumsq, total_length)
+
+
+def _result(state1, state2, score, method):
+    if state1.path == state2.path:
+        result = {"type": "internal", "file": state1.path}
+    else:
+        result = {"type": "cross", "file1": state1.path, "file2": state2.path}
+    result.update({"col1": state1.name, "col2": state2.name, "score": float(score), "method": method})
+    return result
+
+
+# ✅ CSV 스트리밍 분석: 모든 파일을 청크 단위로 한 번만 읽으며 충분통계량만 누적
+def analyze_csv_streaming(file_paths, threshold=0.3, chunksize=100_000, max_categories=10_000):
+    """
+    - Pearson: 쌍별 공통 관측 수 / Σx / Σx² / Σxy 를 마스크 행렬곱으로 누적
+    - Cramér's V: 범주형 쌍별 누적 분할표 (0 이 아닌 칸만)
+    - Eta Squared: 범주별 개수 / 합 / 제곱합
+    최대 메모리는 파일 크기가 아니라 청크 크기 + 범주 수에 비례한다.
+    고유값이 max_categories 를 넘는 범주형 컬럼(ID, 타임스탬프 문자열 등)은 범주형 비교에서 제외한다.
+    """
+    readers = [pd.read_csv(path, chunksize=chunksize) for path in file_paths]
+    states = None        # 파일별 StreamColumn 목록 (첫 청크에서 결정)
+    columns = []         # 전역 순서 (파일 → 컬럼)
+    numeric_index = []   # columns 중 수치형 위치
+    pearson = None
+    contingency = {}
+    moments = {}
+
+    for step, chunks in enumerate(zip_longest(*readers)):
+        if states is None:
+            states = []
+            for path, chunk in zip(file_paths, chunks):
+                file_states = [StreamColumn(path, c, _stream_kind(chunk[c])) for c in chunk.columns]
+                states.append(file_states)
+                columns.extend(file_states)
+            numeric_index = [i for i, s in enumerate(columns) if s.is_numeric]
+            p = len(numeric_index)
+            pearson = {"n": np.zeros((p, p)), "sx": np.zeros((p, p)),
+                       "sxx": np.zeros((p, p)), "sxy": np.zeros((p, p))}
+
+        step_rows = max(len(chunk) for chunk in chunks if chunk is not None)
+        numeric_values = {}
+        category_codes = {}
+
+        # 1. 컬럼별 값 추출 + 유효성 / 해시 누적
+        for file_states, chunk in zip(states, chunks):
+            if chunk is None:
+                continue
+            for state in file_states:
+                series = chunk[state.name]
+                state.rows += len(series)
+                state.nulls += int(series.isnull().sum())
+                state.hash_sum += int(pd.util.hash_pandas_object(series, index=True).sum())
+
+                if state.is_numeric:
+                    values = np.full(step_rows, np.nan)
+                    values[:len(series)] = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                    finite = values[~np.isnan(values)]
+                    if len(finite):
+                        if state.shift is None:
+                            state.shift = float(finite.mean())
+                            state.first_value = finite[0]
+                        if not state.varied and (finite != state.first_value).any():
+                            state.varied = True
+                    numeric_values[state] = values
+
+                if state.is_categorical:
+                    codes = np.full(step_rows, -1, dtype=np.int64)
+                    codes[:len(series)] = _encode_chunk(state, series, max_categories)
+                    category_codes[state] = codes
+
+        # 2. Pearson 누적 (결측은 0 가중치, 파일이 먼저 끝나면 해당 컬럼 전체 결측)
+        if numeric_index:
+            matrix = np.full((step_rows, len(numeric_index)), np.nan)
+            for j, i in enumerate(numeric_index):
+                state = columns[i]
+                if state in numeric_values:
+                    matrix[:, j] = numeric_values[state] - (state.shift or 0.0)
+            present = ~np.isnan(matrix)
+            weights = present.astype(float)
+            centered = np.where(present, matrix, 0.0)
+            pearson["n"] += weights.T @ weights
+            pearson["sx"] += centered.T @ weights
+            pearson["sxx"] += (centered * centered).T @ weights
+            pearson["sxy"] += centered.T @ centered
+
+        # 3. 범주형이 포함된 쌍 누적
+        for i in range(len(columns)):
+            for j in range(i + 1, len(columns)):
+                s1, s2 = columns[i], columns[j]
+                method = correlation_method(s1.is_numeric, s1.is_categorical, s2.is_numeric, s2.is_categorical)
+                if method == "Cramér's V":
+                    if s1.overflow or s2.overflow or s1 not in category_codes or s2 not in category_codes:
+                        continue
+                    contingency.setdefault((i, j), ContingencyCounter()).add(category_codes[s1], category_codes[s2])
+                elif method == "Eta Squared":
+                    num, cat = (s1, s2) if (s1.is_numeric and s2.is_categorical) else (s2, s1)
+                    if cat.overflow or num not in numeric_values or cat not in category_codes:
+                        continue
+                    moments.setdefault((i, j), GroupMoments()).add(
+                        numeric_values[num] - (num.shift or 0.0), category_codes[cat])
+
+        print(f"📥 [스트리밍] 청크 {step + 1} 처리 ({step_rows}행)")
+
+    if states is None:
+        return
+
+    valid = [s.is_valid() for s in columns]
+
+    def duplicate(s1, s2):
+        return s1.rows == s2.rows and s1.kind == s2.kind and s1.hash_sum == s2.hash_sum
+
+    # 4. 결과 생성 (기존 analyze_all_columns 와 같은 dict 형태)
+    if numeric_index:
+        corr = pearson_from_sums(pearson["n"], pearson["sx"], pearson["sxx"], pearson["sxy"])
+        for a in range(len(numeric_index)):
+            for b in range(a + 1, len(numeric_index)):
+                s1, s2 = columns[numeric_index[a]], columns[numeric_index[b]]
+                score = corr[a, b]
+                if not (valid[numeric_index[a]] and valid[numeric_index[b]]) or duplicate(s1, s2):
+                    continue
+                if abs(score) >= threshold:
+                    yield _result(s1, s2, score, "Pearson")
+
+    for (i, j), counter in contingency.items():
+        s1, s2 = columns[i], columns[j]
+        if not (valid[i] and valid[j]) or s1.overflow or s2.overflow or duplicate(s1, s2):
+            continue
+        score = counter.score()
+        if score is not None and abs(score) >= threshold:
+            yield _result(s1, s2, score, "Cramér's V")
+
+    for (i, j), moment in moments.items():
+        s1, s2 = columns[i], columns[j]
+        if not (valid[i] and valid[j]):
+            continue
+        num = s1 if (s1.is_numeric and s2.is_categorical) else s2
+        score = moment.score(num.rows)
+        if score is not None and abs(score) >= threshold:
+            yield _result(s1, s2, score, "Eta Squared")
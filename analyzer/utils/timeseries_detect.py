@@ -1,30 +1,92 @@
+import threading
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 from collections import defaultdict
+from .downsample import downsample_indices
+from .timeseries_rollup import ROLLUP_LEVELS, build_rollups, store_rollups, parse_time_bounds
+from .metrics import debug_logging, increment, stage
+
+# ✅ 후보 날짜 포맷 (입력은 ':' → 공백 정규화 후이므로 포맷도 같은 형태로 작성)
+DATETIME_FORMATS = [
+    "%Y-%m-%d %H", "%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d",
+    "%Y-%m-%d %H %M", "%Y/%m/%d %H %M", "%Y.%m.%d %H",
+    "%Y년 %m월 %d일", "%Y.%m.%d %p %I",
+]
+FALLBACK_FORMAT = "fallback"   # pandas 자체 추론(dateutil) 사용 표시
+
+# (파일 내용 해시, 컬럼명) → 감지된 포맷
+_format_cache = {}
+_format_lock = threading.Lock()
+
+
+def _format_sample(series, sample_size):
+    if len(series) <= sample_size:
+        return series
+    positions = np.linspace(0, len(series) - 1, sample_size).round().astype(np.int64)
+    return series.iloc[np.unique(positions)]
+
+
+# ✅ 표본에서 후보 포맷별 성공률 비교 → 가장 높은 포맷 (동률이면 목록 순서 우선, 0.7 이하면 None)
+def infer_datetime_format(normalized: pd.Series, sample_size: int = 256):
+    sample = _format_sample(normalized, sample_size)
+    best, best_rate = None, 0.7
+    for fmt in DATETIME_FORMATS:
+        rate = pd.to_datetime(sample, format=fmt, errors='coerce').notnull().mean()
+        if rate > best_rate:
+            best, best_rate = fmt, rate
+    return best
+
+
+# 작업자 프로세스에서 감지한 포맷을 부모 프로세스 캐시로 옮기기 위한 내보내기 / 등록
+def cached_formats(source):
+    with _format_lock:
+        return {key: fmt for key, fmt in _format_cache.items() if key[0] == source}
+
+
+def remember_formats(formats):
+    with _format_lock:
+        _format_cache.update(formats)
 
-def try_parse_datetime_column(series: pd.Series):
-    """다양한 날짜 포맷 시도하여 유효하면 반환, 실패 시 fallback으로 dateutil 사용"""
-    formats = [
-        "%Y-%m-%d %H", "%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d",
-        "%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y.%m.%d %H",
-        "%Y년 %m월 %d일", "%Y.%m.%d %p %I",
-    ]
+
+def try_parse_datetime_column(series: pd.Series, cache_key=None):
+    """
+    날짜 포맷을 표본으로 추론해 전체 컬럼은 한 번만 파싱, 실패 시 fallback으로 dateutil 사용
+    cache_key (파일 해시, 컬럼명) 가 주어지면 감지된 포맷을 재사용
+    """
+    # 이미 datetime 이면 다시 파싱하지 않음
+    if pd.api.types.is_datetime64_any_dtype(series):
+        increment("analyzer_datetime_parse_total", path="native")
+        return series
 
     # ✅ ':' → 공백, strip
     series = series.astype(str).str.replace(":", " ", regex=False).str.strip()
 
-    for fmt in formats:
-        try:
-            parsed = pd.to_datetime(series, format=fmt, errors='coerce')
-            print(f"⏱️ 시도 중: {fmt}, 성공률: {parsed.notnull().mean():.2f}")
-            if parsed.notnull().mean() > 0.7:
-                return parsed
-        except Exception as e:
-            print(f"❌ 포맷 실패: {fmt} → {e}")
-            continue
+    with _format_lock:
+        fmt = _format_cache.get(cache_key) if cache_key is not None else None
+    cached = fmt is not None
 
-    print("⚠️ 모든 포맷 실패 → dateutil fallback 적용")
-    return pd.to_datetime(series.astype(str), errors='coerce')
+    if fmt is None:
+        fmt = infer_datetime_format(series)
+
+    if fmt and fmt != FALLBACK_FORMAT:
+        parsed = pd.to_datetime(series, format=fmt, errors='coerce')
+        rate = parsed.notnull().mean()
+        if rate > 0.7:
+            increment("analyzer_datetime_parse_total", path="cached" if cached else "inferred")
+            if debug_logging():
+                print(f"⏱️ 날짜 포맷: {fmt} ({'캐시' if cached else '표본 추론'}), 성공률: {rate:.2f}")
+            if cache_key is not None and not cached:
+                with _format_lock:
+                    _format_cache[cache_key] = fmt
+            return parsed
+
+    print("⚠️ 후보 포맷 불일치 → dateutil fallback 적용")
+    increment("analyzer_datetime_parse_total", path="fallback")
+    if cache_key is not None:
+        with _format_lock:
+            _format_cache[cache_key] = FALLBACK_FORMAT
+    return pd.to_datetime(series, errors='coerce')
 
 def clean_column_names(df):
     df.columns = [col if not col.startswith("Unnamed") else f"열{idx}" for idx, col in enumerate(df.columns)]
@@ -34,9 +96,11 @@ from collections import defaultdict
 import pandas as pd
 from datetime import timedelta
 
-def analyze_timeseries(df: pd.DataFrame, time_column: str = ""):
+def prepare_timeseries(df: pd.DataFrame, time_column: str = "", source=None):
     """
-    📈 시계열 분석 로직 (자동 날짜 탐지 + 사용자 입력 + 단위행 제거 + 수치형 강제 변환 포함)
+    📈 시계열 전처리 (자동 날짜 탐지 + 사용자 입력 + 단위행 제거 + 수치형 강제 변환 포함)
+    성공 시 (df, 날짜 컬럼, 유효 수치형 컬럼 목록), 실패 시 {"error": ...} 반환
+    source: 파일 내용 해시 (주어지면 날짜 포맷 감지 결과를 파일·컬럼별로 캐시)
     """
     df = clean_column_names(df)
 
@@ -55,20 +119,23 @@ def analyze_timeseries(df: pd.DataFrame, time_column: str = ""):
         time_col = datetime_cols[0]
         print(f"🔍 자동 감지된 날짜 컬럼: {time_col}")
 
-    # ✅ 2. 디버깅 출력
-    print("\n🧪 [DEBUG] 날짜 컬럼 상태 점검")
-    print("📌 dtype:", df[time_col].dtype)
-    print("📌 null 비율:", df[time_col].isnull().mean())
-    print("📌 상위 5개 값:", df[time_col].head(5).tolist())
-    print("📌 타입 분포:", df[time_col].apply(lambda x: type(x)).value_counts())
+    # ✅ 2. 디버깅 출력 (타입 분포는 행 단위 순회 → debug_logging 설정 시에만)
+    if debug_logging():
+        print("\n🧪 [DEBUG] 날짜 컬럼 상태 점검")
+        print("📌 dtype:", df[time_col].dtype)
+        print("📌 null 비율:", df[time_col].isnull().mean())
+        print("📌 상위 5개 값:", df[time_col].head(5).tolist())
+        print("📌 타입 분포:", df[time_col].apply(lambda x: type(x)).value_counts())
 
     # ✅ 3. 날짜 파싱
     try:
         if pd.api.types.is_numeric_dtype(df[time_col]):
             print("📌 날짜 컬럼이 숫자 형식 → 엑셀 일련번호로 처리")
+            increment("analyzer_datetime_parse_total", path="serial")
             df[time_col] = pd.to_datetime("1899-12-30") + pd.to_timedelta(df[time_col], unit="D")
         else:
-            df[time_col] = try_parse_datetime_column(df[time_col])
+            cache_key = (source, time_col) if source else None
+            df[time_col] = try_parse_datetime_column(df[time_col], cache_key=cache_key)
 
         df = df.dropna(subset=[time_col])
 
@@ -98,55 +165,135 @@ def analyze_timeseries(df: pd.DataFrame, time_column: str = ""):
         print("❌ 유효한 수치형 컬럼 없음")
         return {"error": "시계열로 분석할 수치형 컬럼이 없습니다."}
 
-    y_col = sorted(valid_numeric_cols, key=lambda col: df[col].isnull().mean())[0]
+    return df, time_col, valid_numeric_cols
+
+
+def _default_y_column(df, valid_numeric_cols):
+    return sorted(valid_numeric_cols, key=lambda col: df[col].isnull().mean())[0]
+
+
+# ✅ 정렬된 시계열에서 점 예산만큼만 line_data 생성 (x 문자열 변환도 선택된 행에만)
+def build_line_data(times, values, time_col, y_col, max_points, method="lttb"):
+    positions = downsample_indices(times.to_numpy(dtype="datetime64[ns]").view("i8"), values.to_numpy(dtype=float),
+                                   max_points, method=method)
+    return {
+        "x": times.iloc[positions].astype(str).tolist(),
+        "y": values.to_numpy()[positions],   # 수치 배열 그대로 (응답 인코더가 JSON / 바이너리로 변환)
+        "xLabel": str(time_col),
+        "yLabel": str(y_col),
+        "total": len(times),
+        "downsampled": len(positions) < len(times)
+    }
+
+
+# ✅ 날짜 × 24시간 합계 / 개수 격자 1개에서 시간대별 → 일별 → 월별 평균을 모두 도출
+def calendar_aggregates(times, values, y_col):
+    stamps = times.to_numpy(dtype="datetime64[ns]")
+    values = values.to_numpy(dtype=float)
+
+    days = stamps.astype("datetime64[D]")
+    hours = ((stamps - days) // np.timedelta64(1, "h")).astype(np.int64)
+    unique_days, day_index = np.unique(days, return_inverse=True)
+
+    cells = day_index * 24 + hours
+    size = len(unique_days) * 24
+    sums = np.bincount(cells, weights=values, minlength=size).reshape(-1, 24)
+    counts = np.bincount(cells, minlength=size).reshape(-1, 24)
+
+    day_sums, day_counts = sums.sum(axis=1), counts.sum(axis=1)
+    unique_months, month_index = np.unique(unique_days.astype("datetime64[M]"), return_inverse=True)
+    month_sums = np.bincount(month_index, weights=day_sums)
+    month_counts = np.bincount(month_index, weights=day_counts)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hourly = sums / counts   # 값이 없는 시간대는 NaN → 응답에서 null
+    day_labels = np.datetime_as_string(unique_days, unit="D").tolist()
+
+    return {
+        "line_daily": {
+            "x": day_labels,
+            "y": day_sums / day_counts,
+            "xLabel": "날짜",
+            "yLabel": y_col
+        },
+        "line_monthly": {
+            "x": np.datetime_as_string(unique_months, unit="M").tolist(),
+            "y": month_sums / month_counts,
+            "xLabel": "월",
+            "yLabel": y_col
+        },
+        "line_hourly_by_date": dict(zip(day_labels, hourly))
+    }
+
+
+def analyze_timeseries(df: pd.DataFrame, time_column: str = "", max_points: int = 2000, rollup_key=None,
+                       source=None):
+    """
+    📈 시계열 분석 로직 (line_data 는 max_points 이하로 다운샘플링, 확대 구간은 timeseries_window 로 조회)
+    rollup_key 가 주어지면 모든 유효 수치형 컬럼의 시간/일/주/월 롤업을 한 번에 만들어 캐시에 저장
+    → 다른 컬럼 / 해상도 전환은 재파싱 없이 캐시 조회
+    """
+    with stage("timeseries_prepare"):
+        prepared = prepare_timeseries(df, time_column, source=source)
+    if isinstance(prepared, dict):
+        return prepared
+    df, time_col, valid_numeric_cols = prepared
+
+    if rollup_key is not None:
+        with stage("timeseries_rollup"):
+            store_rollups(rollup_key, build_rollups(df, time_col, valid_numeric_cols))
+
+    y_col = _default_y_column(df, valid_numeric_cols)
 
     # ✅ 6. 정렬 및 값 추출
     df = df[[time_col, y_col]].dropna().sort_values(by=time_col)
-    df["date"] = df[time_col].dt.date
-    df["hour"] = df[time_col].dt.hour
 
     # ✅ 결과 구조 초기화
     result = {
-        "line_data": {
-            "x": df[time_col].astype(str).tolist(),
-            "y": df[y_col].tolist(),
-            "xLabel": str(time_col),
-            "yLabel": str(y_col)
-        }
+        "line_data": build_line_data(df[time_col], df[y_col], time_col, y_col, max_points),
+        "columns": [str(c) for c in valid_numeric_cols],
+        "granularities": list(ROLLUP_LEVELS)
     }
 
-    # ✅ 일별 평균
-    g_daily = df.groupby("date")[y_col].mean().reset_index()
-    result["line_daily"] = {
-        "x": g_daily["date"].astype(str).tolist(),
-        "y": g_daily[y_col].tolist(),
-        "xLabel": "날짜",
-        "yLabel": y_col
-    }
+    # ✅ 일별 / 월별 평균 + 날짜별 시간대별 값 (0~23시) 을 한 번의 날짜 분해로 계산
+    with stage("timeseries_calendar"):
+        result.update(calendar_aggregates(df[time_col], df[y_col], y_col))
 
-    # ✅ 월별 평균
-    df["month"] = df[time_col].dt.to_period("M").astype(str)
-    g_month = df.groupby("month")[y_col].mean().reset_index()
-    result["line_monthly"] = {
-        "x": g_month["month"].tolist(),
-        "y": g_month[y_col].tolist(),
-        "xLabel": "월",
-        "yLabel": y_col
-    }
+    print(f"✅ 시계열 분석 성공: {len(df)}행, X={time_col}, Y={y_col}")
+    return result
 
-    # ✅ 날짜별 시간대별 값 (0~23시)
-    from collections import defaultdict
-    hourly_by_date = defaultdict(lambda: [None] * 24)
 
-    g = df.groupby(["date", "hour"])[y_col].mean().reset_index()
-    for _, row in g.iterrows():
-        date_str = str(row["date"])
-        hour = int(row["hour"])
-        value = float(row[y_col])
-        hourly_by_date[date_str][hour] = value
+# ✅ 확대 구간 조회: [start, end] 안의 행만 원본 해상도로 (max_points 를 넘을 때만 다운샘플링)
+def timeseries_window(df: pd.DataFrame, start=None, end=None, time_column: str = "", y_column: str = "",
+                      max_points: int = 2000, method: str = "lttb", source=None):
+    bounds = parse_time_bounds(start, end)
+    if isinstance(bounds, dict):
+        return bounds
+    start, end = bounds
 
-    result["line_hourly_by_date"] = dict(hourly_by_date)
+    prepared = prepare_timeseries(df, time_column, source=source)
+    if isinstance(prepared, dict):
+        return prepared
+    df, time_col, valid_numeric_cols = prepared
 
-    print(f"✅ 시계열 분석 성공: {len(df)}행, X={time_col}, Y={y_col}")
+    y_col = y_column if y_column in valid_numeric_cols else _default_y_column(df, valid_numeric_cols)
+    df = df[[time_col, y_col]].dropna().sort_values(by=time_col)
+
+    times = df[time_col].to_numpy(dtype="datetime64[ns]")
+    lo = np.searchsorted(times, start, side="left") if start is not None else 0
+    hi = np.searchsorted(times, end, side="right") if end is not None else len(times)
+    window = df.iloc[lo:hi]
+
+    result = build_line_data(window[time_col], window[y_col], time_col, y_col, max_points, method=method)
+    result["start"] = str(window[time_col].iloc[0]) if len(window) else None
+    result["end"] = str(window[time_col].iloc[-1]) if len(window) else None
     return result
 
+
+# ✅ 롤업 캐시 미스 시: 전처리 후 롤업만 생성 (line_data 등 응답 필드는 만들지 않음)
+def load_rollups(df: pd.DataFrame, time_column: str = "", source=None):
+    prepared = prepare_timeseries(df, time_column, source=source)
+    if isinstance(prepared, dict):
+        return prepared
+    df, time_col, valid_numeric_cols = prepared
+    return build_rollups(df, time_col, valid_numeric_cols)
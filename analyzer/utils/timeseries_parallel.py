@@ -0,0 +1,160 @@
+import os
+import time
+from collections import deque
+from multiprocessing import connection
+import numpy as np
+from .timeseries_detect import analyze_timeseries, cached_formats, remember_formats
+from .timeseries_rollup import ROLLUP_LABEL_UNITS, get_rollups, store_rollups
+from .executor_backend import process_context
+
+
+# ✅ 작업자 프로세스: 파일 1개 읽기 + 시계열 분석 (롤업 / 날짜 포맷은 부모 캐시로 옮기도록 함께 반환)
+# reader 는 작업자로 피클되어 넘어가므로 utils 의 모듈 수준 함수 / UploadReader 같은 객체여야 함
+def analyze_timeseries_file(path, reader, max_points, source, key):
+    df = reader(path)
+    result = analyze_timeseries(df, max_points=max_points, rollup_key=key, source=source)
+    rollups = get_rollups(key) if result and "error" not in result else None
+    return result, rollups, cached_formats(source)
+
+
+# 작업자 프로세스 진입점: 작업 1개 실행 → (상태, 값) 을 파이프로 부모에게 전달
+def _run_task(conn, fn, args):
+    try:
+        conn.send(("ok", fn(*args)))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+# 시간 초과 / 중단 시: 직접 띄운 작업자 프로세스를 종료하고 정리
+def _stop(conn, process):
+    process.terminate()
+    process.join()
+    conn.close()
+
+
+# ✅ 작업마다 별도 프로세스에서 격리 실행 (동시에 최대 max_workers 개) → 끝나는 순서대로 (키, 상태, 값) 반환
+def iter_isolated(tasks, max_workers=2, timeout=None):
+    """
+    tasks: (키, 함수, 인자 튜플) 목록
+    상태: "ok" (값 = 반환값) | "error" (값 = 메시지) | "timeout"
+    - 작업 1개의 예외는 해당 키의 "error" 로만 보고
+    - 작업자 프로세스가 결과 없이 종료되면(비정상 종료) 해당 키만 "error" → 다른 작업은 영향 없음
+    - timeout 초를 넘긴 작업은 그 프로세스만 종료하고 "timeout"
+    """
+    context = process_context()  # forkserver / spawn: 요청 스레드가 잡고 있던 잠금 상태를 작업자로 복제하지 않음
+    pending = deque((key, fn, args) for key, fn, args in tasks)
+    running = {}   # 결과 파이프(읽기 쪽) → (키, 프로세스, 시작 시각)
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                key, fn, args = pending.popleft()
+                reader, writer = context.Pipe(duplex=False)
+                process = context.Process(target=_run_task, args=(writer, fn, args), daemon=True)
+                process.start()
+                writer.close()  # 부모 쪽 쓰기 끝을 닫아야 작업자가 죽었을 때 읽기 쪽이 EOF 로 깨어남
+                running[reader] = (key, process, time.monotonic())
+
+            wait_for = None
+            if timeout is not None:
+                oldest = min(started for _, _, started in running.values())
+                wait_for = max(0.0, oldest + timeout - time.monotonic())
+
+            for reader in connection.wait(list(running), timeout=wait_for):
+                key, process, _ = running.pop(reader)
+                try:
+                    status, value = reader.recv()
+                except (EOFError, OSError):
+                    status, value = "error", "작업자 프로세스 비정상 종료"
+                reader.close()
+                process.join()
+                yield key, status, value
+
+            if timeout is not None:
+                now = time.monotonic()
+                expired = [r for r, (_, _, started) in running.items() if now - started >= timeout]
+                for reader in expired:
+                    key, process, _ = running.pop(reader)
+                    _stop(reader, process)
+                    yield key, "timeout", f"{timeout}초 초과"
+    finally:
+        for reader, (_, process, _) in running.items():
+            _stop(reader, process)
+
+
+# ✅ 파일별 결과 키 (파일명, 같은 이름의 서로 다른 업로드는 "이름 (2).csv" 처럼 구분 → 결과가 서로 덮어쓰지 않음)
+def display_names(paths):
+    names, used = {}, set()
+    for path in paths:
+        if path in names:
+            continue
+        stem, ext = os.path.splitext(os.path.basename(path))
+        name, n = stem + ext, 2
+        while name in used:
+            name, n = f"{stem} ({n}){ext}", n + 1
+        names[path] = name
+        used.add(name)
+    return names
+
+
+# ✅ 다중 파일 시계열 분석: 파일별 결과를 끝나는 순서대로 (display_names 의 이름, 결과) 반환
+def analyze_timeseries_files(paths, reader, max_points=2000, max_workers=None, timeout=None,
+                             sources=None, rollup_keys=None):
+    if max_workers is None:
+        max_workers = max(1, min(len(paths), os.cpu_count() or 1, 4))
+
+    tasks = []
+    for path in paths:
+        source = sources[path] if sources else None
+        key = rollup_keys[path] if rollup_keys else None
+        tasks.append((path, analyze_timeseries_file, (path, reader, max_points, source, key)))
+
+    names = display_names(paths)
+    for path, status, value in iter_isolated(tasks, max_workers=max_workers, timeout=timeout):
+        filename = names[path]
+        if status != "ok":
+            print(f"❌ [시계열] {filename} → {status}: {value}")
+            yield filename, {"error": f"분석 실패 ({value})" if status == "error" else "분석 시간 초과"}
+            continue
+
+        result, rollups, formats = value
+        remember_formats(formats)
+        if rollups is not None and rollup_keys:
+            store_rollups(rollup_keys[path], rollups)
+        if not result or "error" in result:
+            yield filename, {"error": (result or {}).get("error", "분석 실패")}
+            continue
+        result["file"] = path  # 확대 구간 / 롤업 조회용 (업로드 저장소 경로 = 이 내용 그대로, 같은 파일명의 다른 업로드와 섞이지 않음)
+        yield filename, result
+
+
+# ✅ 파일 간 정렬: 각 파일 롤업을 공통 시간축(구간 시작 합집합)에 한 번에 배치
+def align_rollups(named_rollups, level="day", stat="mean"):
+    """
+    named_rollups: (파일명, 컬럼, TimeseriesRollups) 목록
+    반환: {"x": 공통 구간 라벨, "series": [{"file", "column", "y"}], "granularity", "stat"}
+    """
+    series = []
+    for name, column, rollups in named_rollups:
+        data = rollups.levels[level]
+        j = rollups.columns.index(column)
+        present = data.count[:, j] > 0
+        series.append((name, column, data.starts[present], data.stat(stat, j)[present]))
+    if not series:
+        return {"x": [], "series": [], "granularity": level, "stat": stat}
+
+    axis = np.unique(np.concatenate([starts for _, _, starts, _ in series]))
+    matrix = np.full((len(series), len(axis)), np.nan)
+    rows = np.repeat(np.arange(len(series)), [len(starts) for _, _, starts, _ in series])
+    cols = np.searchsorted(axis, np.concatenate([starts for _, _, starts, _ in series]))
+    matrix[rows, cols] = np.concatenate([values for _, _, _, values in series])
+
+    # 구간이 없는 칸은 NaN → 응답에서 null
+    return {
+        "x": np.datetime_as_string(axis, unit=ROLLUP_LABEL_UNITS[level]).tolist(),
+        "series": [{"file": name, "column": str(column), "y": row}
+                   for (name, column, _, _), row in zip(series, matrix)],
+        "granularity": level,
+        "stat": stat
+    }
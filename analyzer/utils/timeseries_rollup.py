@@ -0,0 +1,159 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from .dataframe_cache import file_content_hash
+
+ROLLUP_LEVELS = ("hour", "day", "week", "month")
+ROLLUP_STATS = ("mean", "min", "max", "count")
+
+# ✅ 파일별 롤업 캐시 설정 (롤업 크기는 행 수가 아니라 구간 수에 비례 → 항목 수로만 제한)
+ROLLUP_CONFIG = {"max_entries": 64}
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # (내용 해시, 날짜 컬럼) → TimeseriesRollups, 가장 최근 사용이 뒤쪽
+_stats = {"hits": 0, "misses": 0}
+
+# 구간 라벨 문자열 형식 (datetime_as_string 단위)
+ROLLUP_LABEL_UNITS = {"hour": "h", "day": "D", "week": "D", "month": "M"}
+
+
+def configure_rollups(max_entries=None):
+    if max_entries is not None:
+        ROLLUP_CONFIG["max_entries"] = max_entries
+
+
+# ✅ 조회 구간 경계 (start / end 문자열) → (datetime64 또는 None, ...) / 해석할 수 없으면 {"error": ...}
+def parse_time_bounds(start=None, end=None):
+    bounds = []
+    for name, value in (("start", start), ("end", end)):
+        if not value:
+            bounds.append(None)
+            continue
+        stamp = pd.to_datetime(value, errors="coerce")
+        if pd.isna(stamp):
+            return {"error": f"잘못된 {name} 시각: {value}"}
+        bounds.append(stamp.to_datetime64())
+    return tuple(bounds)
+
+
+# ✅ 구간 1단계 집계 결과 (구간 시작 시각 + 컬럼별 개수 / 합 / 최소 / 최대 행렬)
+class RollupLevel:
+    __slots__ = ("starts", "count", "sum", "min", "max")
+
+    def __init__(self, starts, count, total, minimum, maximum):
+        self.starts = starts      # datetime64 구간 시작 (오름차순)
+        self.count = count        # (구간 수, 컬럼 수)
+        self.sum = total
+        self.min = minimum
+        self.max = maximum
+
+    # 정렬된 키 기준으로 연속 구간을 한 번에 재집계 (상위 단계는 하위 단계에서 도출)
+    def coarsen(self, keys):
+        bounds = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return RollupLevel(
+            keys[bounds],
+            np.add.reduceat(self.count, bounds, axis=0),
+            np.add.reduceat(self.sum, bounds, axis=0),
+            np.fmin.reduceat(self.min, bounds, axis=0),
+            np.fmax.reduceat(self.max, bounds, axis=0)
+        )
+
+    def stat(self, name, j):
+        if name == "count":
+            return self.count[:, j].astype(float)
+        if name == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return self.sum[:, j] / self.count[:, j]
+        return getattr(self, name)[:, j]
+
+
+# ✅ 다중 컬럼 × 다중 해상도 롤업 피라미드 (시간 → 일 → 주 / 월)
+class TimeseriesRollups:
+    __slots__ = ("time_col", "columns", "levels", "rows")
+
+    def __init__(self, time_col, columns, levels, rows):
+        self.time_col = time_col
+        self.columns = columns
+        self.levels = levels
+        self.rows = rows
+
+    # 컬럼 / 해상도 / 통계 조회 (start, end 는 parse_time_bounds 결과, 구간 시작 기준 포함 범위)
+    def series(self, column, level="day", stat="mean", start=None, end=None):
+        if column not in self.columns:
+            raise KeyError(f"롤업에 없는 컬럼: {column}")
+        if level not in self.levels or stat not in ROLLUP_STATS:
+            raise ValueError(f"지원하지 않는 롤업 조회: {level}/{stat}")
+
+        data = self.levels[level]
+        j = self.columns.index(column)
+        present = data.count[:, j] > 0
+        if start is not None:
+            present &= data.starts >= start
+        if end is not None:
+            present &= data.starts <= end
+
+        values = data.stat(stat, j)[present]
+        return {
+            "x": np.datetime_as_string(data.starts[present], unit=ROLLUP_LABEL_UNITS[level]).tolist(),
+            "y": values,
+            "xLabel": level,
+            "yLabel": str(column),
+            "granularity": level,
+            "stat": stat
+        }
+
+
+# ✅ 정렬된 DataFrame → 모든 유효 수치형 컬럼의 롤업 (원본 행은 시간 단계에서 한 번만 읽음)
+def build_rollups(df, time_col, columns):
+    df = df.sort_values(by=time_col)
+    stamps = df[time_col].to_numpy(dtype="datetime64[ns]")
+    values = np.column_stack([df[c].to_numpy(dtype=float, na_value=np.nan) for c in columns])
+    present = ~np.isnan(values)
+
+    hour_keys = stamps.astype("datetime64[h]")
+    bounds = np.flatnonzero(np.r_[True, hour_keys[1:] != hour_keys[:-1]])
+    hour = RollupLevel(
+        hour_keys[bounds],
+        np.add.reduceat(present.astype(np.int64), bounds, axis=0),
+        np.add.reduceat(np.where(present, values, 0.0), bounds, axis=0),
+        np.fmin.reduceat(values, bounds, axis=0),
+        np.fmax.reduceat(values, bounds, axis=0)
+    )
+
+    day = hour.coarsen(hour.starts.astype("datetime64[D]"))
+    # 주 시작 = 월요일 (1970-01-01 은 목요일 → +3 일 오프셋)
+    day_numbers = day.starts.astype(np.int64)
+    week = day.coarsen((day_numbers - (day_numbers + 3) % 7).astype("datetime64[D]"))
+    month = day.coarsen(day.starts.astype("datetime64[M]"))
+
+    levels = {"hour": hour, "day": day, "week": week, "month": month}
+    return TimeseriesRollups(time_col, list(columns), levels, len(df))
+
+
+def rollup_key(path, time_column=""):
+    return file_content_hash(path), time_column or ""
+
+
+def get_rollups(key):
+    with _lock:
+        rollups = _entries.get(key)
+        if rollups is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+        return rollups
+
+
+def store_rollups(key, rollups):
+    with _lock:
+        _entries[key] = rollups
+        _entries.move_to_end(key)
+        while len(_entries) > ROLLUP_CONFIG["max_entries"]:
+            _entries.popitem(last=False)
+
+
+def rollup_stats():
+    with _lock:
+        return dict(_stats, entries=len(_entries))
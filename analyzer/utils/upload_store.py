@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from .dataframe_cache import remember_content_hash
+from .metrics import increment
+
+# ✅ 내용 주소 업로드 저장소 설정 (app.py 에서 configure_uploads 로 지정)
+# <root>/.blobs/<내용 해시>/<원래 파일명>  → 같은 이름의 다른 내용은 서로 다른 디렉터리 (덮어쓰기 / 경쟁 없음)
+# <root>/.blobs/catalog.json                → 파일명 → 가장 최근 업로드의 내용 해시
+UPLOAD_CONFIG = {
+    "root": None,
+    "chunk_size": 1024 * 1024   # IncomingUpload 로 받지 않은 스트림을 이 크기씩 읽으며 기록 + 해시
+}
+
+_lock = threading.Lock()
+_catalog = {}   # 파일명 → {"hash", "size", "uploaded_at"}
+
+
+def _blob_root():
+    return os.path.join(UPLOAD_CONFIG["root"], ".blobs")
+
+
+def _catalog_path():
+    return os.path.join(_blob_root(), "catalog.json")
+
+
+def configure_uploads(root, chunk_size=None):
+    UPLOAD_CONFIG["root"] = root
+    if chunk_size is not None:
+        UPLOAD_CONFIG["chunk_size"] = chunk_size
+    os.makedirs(_blob_root(), exist_ok=True)
+
+    # 이전 실행에서 중단된 요청이 남긴 수신 중 파일 정리
+    for name in os.listdir(_blob_root()):
+        if name.startswith(".incoming-"):
+            try:
+                os.remove(os.path.join(_blob_root(), name))
+            except OSError:
+                pass
+
+    with _lock:
+        _catalog.clear()
+        if os.path.exists(_catalog_path()):
+            try:
+                with open(_catalog_path(), encoding="utf-8") as f:
+                    _catalog.update(json.load(f))
+            except Exception as e:
+                print(f"⚠️ 업로드 목록 읽기 실패 → 빈 목록으로 시작: {e}")
+
+
+# 목록 파일은 임시 파일에 쓰고 교체 (중간에 실패해도 이전 목록 유지)
+def _save_catalog():
+    tmp_path = f"{_catalog_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_catalog, f, ensure_ascii=False)
+    os.replace(tmp_path, _catalog_path())
+
+
+# ✅ 저장된 업로드 1건
+class StoredUpload:
+    __slots__ = ("filename", "digest", "path", "size", "reused")
+
+    def __init__(self, filename, digest, path, size, reused):
+        self.filename = filename
+        self.digest = digest      # 파싱 캐시 / 컬럼형 저장소와 같은 sha1 내용 해시
+        self.path = path          # 분석에 쓰는 불변 경로 (basename 은 원래 파일명)
+        self.size = size
+        self.reused = reused      # 같은 내용이 이미 저장되어 있었으면 True (기록 생략)
+
+    def __repr__(self):
+        return f"StoredUpload({self.filename!r}, {self.digest[:12]}, reused={self.reused})"
+
+
+def _blob_path(digest, filename):
+    return os.path.join(_blob_root(), digest, filename)
+
+
+# ✅ 요청 본문 수신 대상: multipart 파서가 파일 파트를 저장소 임시 파일에 바로 기록 + 해시 동시 갱신
+class IncomingUpload:
+    """
+    app 의 Request._get_file_stream 이 반환 → werkzeug 가 메모리 / 임시 파일로 한 번 받아 둔 뒤
+    다시 복사하는 과정 없이, 받은 바이트가 곧바로 .blobs/.incoming-* 에 한 번만 기록된다.
+    save_upload 가 finish() 로 넘겨받지 않고 닫히면(요청 실패 등) 파일을 지움
+    """
+    __slots__ = ("path", "file", "hasher", "size", "finished")
+
+    def __init__(self):
+        self.path = os.path.join(_blob_root(), f".incoming-{uuid.uuid4().hex}")
+        self.file = open(self.path, "w+b")
+        self.hasher = hashlib.sha1()
+        self.size = 0
+        self.finished = False
+
+    def write(self, data):
+        self.hasher.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    # FileStorage 가 쓰는 나머지 파일 메서드 (read / readline / seek / tell ...) 는 실제 파일로 위임
+    def __getattr__(self, name):
+        if name in IncomingUpload.__slots__:  # 생성 실패로 아직 없는 속성 → 무한 재귀 방지
+            raise AttributeError(name)
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    # 기록 완료 → (임시 파일 경로, 내용 해시, 크기), 이후 close 는 파일을 지우지 않음
+    def finish(self):
+        self.file.close()
+        self.finished = True
+        return self.path, self.hasher.hexdigest(), self.size
+
+    def close(self):
+        self.file.close()
+        if not self.finished and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# 다른 스트림(IncomingUpload 가 아닌 FileStorage)은 청크 단위로 임시 파일에 쓰면서 해시
+def _copy_incoming(stream):
+    incoming = os.path.join(_blob_root(), f".incoming-{uuid.uuid4().hex}")
+    hasher = hashlib.sha1()
+    size = 0
+    try:
+        with open(incoming, "wb") as f:
+            for block in iter(lambda: stream.read(UPLOAD_CONFIG["chunk_size"]), b""):
+                hasher.update(block)
+                f.write(block)
+                size += len(block)
+    except BaseException:
+        if os.path.exists(incoming):
+            os.remove(incoming)
+        raise
+    return incoming, hasher.hexdigest(), size
+
+
+# ✅ 업로드 저장: 수신한 임시 파일(내용 해시 계산 완료) → 내용 해시 경로로 이동 (이미 있으면 버림)
+def save_upload(storage):
+    """storage: werkzeug FileStorage → StoredUpload"""
+    filename = os.path.basename(storage.filename or "")
+    if not filename:
+        raise ValueError("파일명이 없습니다.")
+
+    if isinstance(storage.stream, IncomingUpload):
+        # 파싱하면서 이미 저장소 임시 파일에 기록 + 해시됨 → 이동만
+        incoming, digest, size = storage.stream.finish()
+    else:
+        incoming, digest, size = _copy_incoming(storage.stream)
+    try:
+        directory = os.path.join(_blob_root(), digest)
+        path = _blob_path(digest, filename)
+        os.makedirs(directory, exist_ok=True)
+        existing = [name for name in os.listdir(directory) if not name.startswith(".")]
+        reused = bool(existing)
+        if not existing:
+            os.replace(incoming, path)
+        elif filename not in existing:
+            # 같은 내용을 다른 이름으로 다시 올림 → 기존 파일에 이름만 하나 더 (디스크 추가 사용 없음)
+            try:
+                os.link(os.path.join(directory, existing[0]), path)
+            except FileExistsError:
+                pass
+            except OSError:
+                os.replace(incoming, path)  # 하드 링크를 지원하지 않는 파일 시스템 → 받은 사본 사용
+    finally:  # 이미 있는 내용이면 받은 사본은 버림
+        if os.path.exists(incoming):
+            os.remove(incoming)
+
+    remember_content_hash(path, digest)  # 파싱 캐시 조회 시 파일을 다시 읽어 해시하지 않도록
+    with _lock:
+        _catalog[filename] = {"hash": digest, "size": size, "uploaded_at": time.time()}
+        _save_catalog()
+
+    increment("analyzer_uploads_total", result="reused" if reused else "stored")
+    print(f"📥 [업로드] {filename} ({size} bytes, {digest[:12]}) → {'기존 내용 재사용' if reused else '저장'}")
+    return StoredUpload(filename, digest, path, size, reused)
+
+
+# ✅ 파일명 / 분석 결과의 경로 → 실제 경로 (없으면 None)
+def resolve_upload(name):
+    """
+    - 저장소 안의 경로(분석 결과의 file / file1 / file2)는 그 내용 그대로
+    - 파일명만 주어지면 목록에서 가장 최근 업로드
+    - 목록에 없으면 저장소 도입 전처럼 업로드 폴더 바로 아래 파일
+    """
+    if not name:
+        return None
+    root = os.path.realpath(_blob_root())
+    real = os.path.realpath(name)
+    if real.startswith(root + os.sep) and os.path.isfile(real):
+        return name
+
+    filename = os.path.basename(name)
+    with _lock:
+        entry = _catalog.get(filename)
+    if entry is not None:
+        path = _blob_path(entry["hash"], filename)
+        if os.path.exists(path):
+            return path
+
+    legacy = os.path.join(UPLOAD_CONFIG["root"], filename)
+    return legacy if filename and os.path.isfile(legacy) else None
+
+
+# ✅ 최근 업로드 n 개 경로 (목록 + 저장소 도입 전 파일을 업로드 시각 순으로)
+def recent_uploads(n, extensions=(".csv", ".xlsx")):
+    with _lock:
+        entries = [(entry["uploaded_at"], _blob_path(entry["hash"], filename))
+                   for filename, entry in _catalog.items() if filename.endswith(extensions)]
+        catalogued = set(_catalog)
+    root = UPLOAD_CONFIG["root"]
+    for filename in os.listdir(root):
+        path = os.path.join(root, filename)
+        if filename.endswith(extensions) and filename not in catalogued and os.path.isfile(path):
+            entries.append((os.path.getmtime(path), path))
+    entries.sort(key=lambda e: e[0], reverse=True)
+    return [path for _, path in entries if os.path.exists(path)][:n]
@@ -0,0 +1,68 @@
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+from .downsample import downsample_indices
+from .box_summary import box_plot_data
+
+
+# ✅ 시각화용 필드 자동 생성 (line, box, bubble, radar, pie 등) → result 에 직접 추가
+def enrich_response_with_visual_data(df, result: dict, max_points: int = 2000):
+    try:
+        if df.empty:
+            print("⚠️ [enrich] 비어 있는 DataFrame, 시각화 생략")
+            return
+
+        print("🔍 [enrich] 시각화 컬럼:", df.columns.tolist())
+        num_cols = df.select_dtypes(include='number').columns[:3]
+
+        # ✅ 선형 차트용 (시계열)
+        if 'Date' in df.columns and len(num_cols) > 0:
+            y_col = df[num_cols[0]]
+            if y_col.notnull().all():
+                # 점 예산 초과 시 행 순서 기준 LTTB → 선택된 행만 문자열 변환
+                positions = downsample_indices(np.arange(len(df)), y_col.to_numpy(dtype=float), max_points)
+                result["line_data"] = {
+                    "x": df['Date'].iloc[positions].astype(str).tolist(),
+                    "y": y_col.to_numpy()[positions],
+                    "xLabel": "Date",
+                    "yLabel": num_cols[0],
+                    "total": len(df),
+                    "downsampled": len(positions) < len(df)
+                }
+
+        # ✅ 박스플롯용 (원본 값 대신 분위수 / 수염 / 이상치 표본 요약만 전송)
+        if len(num_cols) >= 1:
+            result["box_data"] = box_plot_data(df, num_cols)
+
+        # ✅ 버블 / 레이더
+        if len(num_cols) >= 3:
+            raw_data = df[num_cols].dropna().to_numpy()
+            scaler = MinMaxScaler()
+            scaled = scaler.fit_transform(raw_data)
+            result["bubble_data"] = {
+                "x": np.ascontiguousarray(scaled[:, 0]),
+                "y": np.ascontiguousarray(scaled[:, 1]),
+                "size": scaled[:, 2] * 100,
+                "xLabel": num_cols[0],
+                "yLabel": num_cols[1]
+            }
+
+            radar_sample = scaled[:3]
+            indicators = [{"name": col, "max": 1} for col in num_cols]
+            result["radar_data"] = {
+                "indicators": indicators,
+                "valuesList": radar_sample.tolist(),
+                "names": [f"Sample {i+1}" for i in range(len(radar_sample))]
+            }
+
+        # ✅ 도넛차트용 (범주형)
+        cat_cols = df.select_dtypes(include='object').columns
+        if len(cat_cols) > 0:
+            top_cat = cat_cols[0]
+            freq = df[top_cat].value_counts()
+            result["pie_data"] = {
+                "labels": freq.index.tolist(),
+                "values": freq.to_numpy()
+            }
+
+    except Exception as e:
+        print("❌ [enrich] 시각화 데이터 생성 실패:", e)